@@ -0,0 +1,461 @@
+"""
+Headless rendering benchmarks.
+
+Runs the real front end (game.py up to its main loop, GameRenderer,
+SidebarManager, LeftSidebar, popup and victory screen) against SDL's dummy
+video driver and reports frames per second plus per-call timings as JSON.
+
+    python benchmarks/render_bench.py                      # all scenarios, JSON to stdout
+    python benchmarks/render_bench.py -s idle_board -s popup --frames 200
+    python benchmarks/render_bench.py --out after.json --compare before.json
+
+Frame and call times are wall-clock milliseconds. Call timings are
+inclusive (a call to redraw includes the draw_snake calls it makes).
+Frame pacing (scheduler.tick, clock.tick, time.delay) is disabled so the
+numbers measure drawing cost, not the frame cap.
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # stdout is the JSON report
+
+import argparse
+import json
+import math
+import platform
+import random
+import time
+from contextlib import contextmanager, redirect_stdout
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import pygame
+
+from modules.game_logger import log_to_stderr
+
+GAME_SCRIPT = os.path.join(BASE_DIR, "game.py")
+MAIN_LOOP_MARKER = "\nrunning = True\n"
+PLAYERS = ["Arthur", "Merlin", "Morgana"]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+    return {
+        "mean": round(sum(ordered) / len(ordered), 4),
+        "p50": round(pct(50), 4),
+        "p95": round(pct(95), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+class Recorder:
+    """Frame timestamps (one per flip/update) and per-call durations of wrapped functions"""
+
+    def __init__(self) -> None:
+        self.frames: List[float] = []
+        self.calls: Dict[str, List[float]] = {}
+        self.patches: List[Tuple[Any, str, Any]] = []
+
+    def patch(self, owner: Any, name: str, replacement: Any) -> None:
+        """Replace an attribute, or a key when owner is a module-globals dict (game.py)"""
+        if isinstance(owner, dict):
+            self.patches.append((owner, name, owner[name]))
+            owner[name] = replacement
+        else:
+            self.patches.append((owner, name, getattr(owner, name)))
+            setattr(owner, name, replacement)
+
+    def time_calls(self, owner: Any, name: str, label: Optional[str] = None) -> None:
+        func = owner[name] if isinstance(owner, dict) else getattr(owner, name)
+        durations = self.calls.setdefault(label or name, [])
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                durations.append((time.perf_counter() - start) * 1000)
+
+        self.patch(owner, name, timed)
+
+    def count_frames(self) -> None:
+        for name in ("flip", "update"):
+            present = getattr(pygame.display, name)
+
+            def counted(*args: Any, _present: Callable[..., Any] = present, **kwargs: Any) -> Any:
+                result = _present(*args, **kwargs)
+                self.frames.append(time.perf_counter())
+                return result
+
+            self.patch(pygame.display, name, counted)
+
+    def restore(self) -> None:
+        for owner, name, original in reversed(self.patches):
+            if isinstance(owner, dict):
+                owner[name] = original
+            else:
+                setattr(owner, name, original)
+        self.patches = []
+
+    def result(self, started: float) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - started
+        stamps = [started] + self.frames
+        frame_ms = [(b - a) * 1000 for a, b in zip(stamps, stamps[1:])]
+        return {
+            "frames": len(self.frames),
+            "seconds": round(elapsed, 4),
+            "fps": round(len(self.frames) / elapsed, 2) if elapsed else 0.0,
+            "frame_ms": summarize(frame_ms),
+            "calls": {
+                name: {"count": len(d), "total_ms": round(sum(d), 3), **summarize(d)}
+                for name, d in sorted(self.calls.items()) if d
+            },
+        }
+
+
+@contextmanager
+def no_pacing() -> Iterator[None]:
+    """Clock.tick and time.delay return immediately (benchmarks measure drawing, not the cap)"""
+    class FreeClock:
+        def tick(self, framerate: int = 0) -> int:
+            return 0
+
+        def get_fps(self) -> float:
+            return 0.0
+
+    saved = (pygame.time.Clock, pygame.time.delay, pygame.time.wait)
+    pygame.time.Clock = FreeClock
+    pygame.time.delay = pygame.time.wait = lambda ms: 0
+    try:
+        yield
+    finally:
+        pygame.time.Clock, pygame.time.delay, pygame.time.wait = saved
+
+
+def load_game(seed: int) -> Dict[str, Any]:
+    """Run game.py up to its main loop (menu answered with PLAYERS) and return its globals"""
+    import game_constants
+    import modules.menu_manager as menu_manager
+
+    menu_manager.show_main_menu = lambda screen, config: (list(PLAYERS), 1)
+    game_constants.REPLAY_DIR = None  # No replay files from benchmark runs
+    random.seed(seed)
+
+    with open(GAME_SCRIPT, encoding="utf-8") as f:
+        source = f.read()
+    source = source[:source.index(MAIN_LOOP_MARKER)]
+
+    game: Dict[str, Any] = {"__file__": GAME_SCRIPT, "__name__": "game_bench"}
+    with no_pacing():
+        exec(compile(source, GAME_SCRIPT, "exec"), game)
+    game["scheduler"].tick = lambda *args, **kwargs: 0
+    return game
+
+
+def popup_config(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Same popup config as the main loop in game.py"""
+    return {
+        "WIDTH": game["WIDTH"],
+        "HEIGHT": game["HEIGHT"],
+        "IMAGE_DIR": game["IMAGE_DIR"],
+        "big_font": game["big_font"],
+        "font": game["font"],
+        "small_font": game["small_font"],
+        "get_challenge_image": game["get_challenge_image"],
+        "get_timer_duration": game["get_timer_duration"],
+        "get_move_effect": game["get_move_effect"],
+        "clock": game["clock"],
+        "scroll_truth_img": game["SCROLL_TRUTH_IMG"],
+        "scroll_dare_img": game["SCROLL_DARE_IMG"],
+        "preloader": game["preloader"],
+        "popup_resources": game["popup_resources"],
+    }
+
+
+def instrument_renderer(rec: Recorder, renderer: Any) -> None:
+    for name in ("draw_board", "draw_board_layer", "draw_scrolls", "draw_ladder",
+                 "draw_snake", "draw_pion", "draw_panel", "draw_current_turn_header"):
+        rec.time_calls(renderer, name, f"GameRenderer.{name}")
+
+
+def instrument(rec: Recorder, game: Dict[str, Any]) -> None:
+    instrument_renderer(rec, game["renderer"])
+    rec.time_calls(game["sidebar_helper"], "draw_history_ui", "SidebarManager.draw_history_ui")
+    rec.time_calls(game["left_sidebar_visual"], "draw", "LeftSidebar.draw")
+    rec.time_calls(game["dirty_renderer"], "present", "DirtyRectRenderer.present")
+    for name in ("redraw", "redraw_dirty", "redraw_for_animation", "draw_background_effects"):
+        rec.time_calls(game, name, f"game.{name}")
+    rec.count_frames()
+
+
+def reset_board(game: Dict[str, Any]) -> None:
+    state = game["state"]
+    state.positions[:] = [1] * len(state.players)
+    state.turn = 0
+    state.shake_intensity = 0
+    game["dirty_renderer"].invalidate()
+
+
+# ----------------------------------------------------------------------
+# Scenarios: each gets the game globals and a Recorder, and drives frames
+# ----------------------------------------------------------------------
+def scenario_idle_board(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Main loop with nothing happening (dirty-rect path)"""
+    for _ in range(frames):
+        game["redraw"]()
+
+
+def scenario_idle_board_full(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Main loop frame forced through the full-redraw path"""
+    for _ in range(frames):
+        game["redraw"](full=True)
+
+
+def scenario_pawn_walk(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Pawn 0 walks 12 tiles as a timeline task, drawn by the main loop's draw_frame"""
+    state = game["state"]
+    timeline = game["timeline"]
+    state.positions[0] = 20
+    timeline.add(game["walk_task"](0, 32))
+    while timeline.busy:
+        timeline.update()
+        game["draw_frame"]()
+
+
+@contextmanager
+def marathon_board(game: Dict[str, Any], side: int) -> Iterator[None]:
+    """
+    Temporarily play on a side x side board: a renderer with that layout and
+    snakes, ladders and scrolls at the density of the classic 10x10 board
+    (3 snakes, 2 ladders and 40 scrolls per 100 tiles, each snake or ladder
+    one to three rows long), so only culling keeps the frame cost flat.
+    """
+    from modules.board_view import BoardLayout
+    from modules.game_renderer import GameRenderer
+
+    state = game["state"]
+    total = side * side
+    saved_globals = {name: game[name] for name in ("renderer", "COLS", "ROWS", "TOTAL")}
+    saved_state = (state.snakes, state.ladders, state.challenges, list(state.positions))
+
+    rng = random.Random(total)
+    scale = total // 100
+    renderer = GameRenderer(game["screen"], game["assets"], game["fonts_collection"],
+                            layout=BoardLayout(side, side, game["CELL"], total))
+    game.update(renderer=renderer, COLS=side, ROWS=side, TOTAL=total)
+    used = {1, total}
+    jumps: List[Dict[int, int]] = [{}, {}]
+    for kind, count in ((0, 3 * scale), (1, 2 * scale)):
+        while len(jumps[kind]) < count:
+            low = rng.randint(2, total - 3 * side - 1)
+            high = low + rng.randint(side, 3 * side)
+            if low not in used and high not in used:
+                used.update((low, high))
+                if kind == 0:
+                    jumps[0][high] = low
+                else:
+                    jumps[1][low] = high
+    state.snakes, state.ladders = jumps
+    cards = list(saved_state[2].values())
+    free = [t for t in range(2, total) if t not in state.snakes and t not in state.ladders]
+    state.challenges = {str(t): cards[i % len(cards)]
+                        for i, t in enumerate(sorted(rng.sample(free, 40 * scale)))}
+    state.positions[:] = [total // 2 + i * side for i in range(len(state.players))]
+    renderer.camera.recenter(renderer.layout.center(state.positions[state.turn]))
+    game["dirty_renderer"].invalidate()
+    try:
+        yield
+    finally:
+        game.update(saved_globals)
+        state.snakes, state.ladders, state.challenges, positions = saved_state
+        state.positions[:] = positions
+        game["dirty_renderer"].invalidate()
+
+
+def marathon_walk(game: Dict[str, Any], rec: Recorder, frames: int, side: int) -> None:
+    with marathon_board(game, side):
+        instrument_renderer(rec, game["renderer"])
+        state = game["state"]
+        timeline = game["timeline"]
+        start = len(rec.frames)
+        hop = 0
+        while len(rec.frames) - start < frames:
+            if not timeline.busy:
+                pos = state.positions[0]
+                timeline.add(game["walk_task"](0, pos + (12 if hop % 2 == 0 else -12)))
+                hop += 1
+            timeline.update()
+            game["draw_frame"]()
+        timeline.skip()
+        while timeline.busy:
+            timeline.update()
+
+
+def scenario_marathon_20(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Pawn walks back and forth on a 20x20 board, camera following"""
+    marathon_walk(game, rec, frames, 20)
+
+
+def scenario_marathon_50(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Same on a 50x50 board (25x the tiles, snakes, ladders and scrolls of 10x10)"""
+    marathon_walk(game, rec, frames, 50)
+
+
+def scenario_history_sidebar(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Full 1000-line history; every frame appends a line so the panel is rebuilt"""
+    log_manager = game["state"].log_manager
+    players = game["state"].players
+    turn = 0
+    while log_manager.line_count < log_manager.max_log:
+        log_manager.start_turn(players[turn % len(players)])
+        log_manager.log_turn(f"Dice: {turn % 6 + 1}")
+        log_manager.log_turn(": Climbed Ladder" if turn % 3 else ": Slid Down Snake")
+        log_manager.log_turn("Truth: Siapa orang yang paling kamu kagumi di ruangan ini?")
+        log_manager.end_turn()
+        turn += 1
+
+    game["redraw"]()
+    log_manager.start_turn(players[0])
+    for i in range(frames):
+        log_manager.log_turn(f"Dice: {i % 6 + 1}")
+        game["redraw"]()
+    log_manager.end_turn()
+
+
+def scenario_popup(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Open and close a truth, dare, ladder and snake popup, one frame each"""
+    import modules.popup_manager as popup_manager
+
+    rec.time_calls(popup_manager, "show_popup", "popup_manager.show_popup")
+    config = popup_config(game)
+    texts = [
+        "Truth: Siapa orang yang paling kamu kagumi di ruangan ini? Ceritakan alasannya",
+        "Dare: tirukan suara ayam lalu maju 2 langkah",
+        "Naik Tangga!",
+        "Ular! Turun ke bawah.",
+    ]
+    screen = game["screen"]
+    game["redraw"](full=True)
+    for i in range(max(1, frames // 4) * 4):
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r"))
+        popup_manager.show_popup(screen, texts[i % len(texts)], 5, config)
+
+
+def scenario_victory(game: Dict[str, Any], rec: Recorder, frames: int) -> None:
+    """Victory screen for `frames` frames, then a key press ends it"""
+    import modules.game_victory as game_victory
+
+    rec.time_calls(game_victory, "show_victory_screen", "game_victory.show_victory_screen")
+    start = len(rec.frames)
+    flip = pygame.display.flip
+
+    def flip_then_maybe_quit(*args: Any, **kwargs: Any) -> Any:
+        result = flip(*args, **kwargs)
+        if len(rec.frames) - start == frames - 1:
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" "))
+        return result
+
+    rec.patch(pygame.display, "flip", flip_then_maybe_quit)
+    pygame.event.clear()
+    game_victory.show_victory_screen(game["screen"], PLAYERS[0], game["colors"][0])
+
+
+SCENARIOS: Dict[str, Callable[[Dict[str, Any], Recorder, int], None]] = {
+    "idle_board": scenario_idle_board,
+    "idle_board_full": scenario_idle_board_full,
+    "pawn_walk_12": scenario_pawn_walk,
+    "marathon_walk_20x20": scenario_marathon_20,
+    "marathon_walk_50x50": scenario_marathon_50,
+    "history_sidebar_1000": scenario_history_sidebar,
+    "popup": scenario_popup,
+    "victory": scenario_victory,
+}
+
+
+def run(names: List[str], frames: int, seed: int) -> Dict[str, Any]:
+    game = load_game(seed)
+    results: Dict[str, Any] = {}
+    for name in names:
+        reset_board(game)
+        game["redraw"](full=True)  # warm caches outside the measurement
+
+        rec = Recorder()
+        instrument(rec, game)
+        random.seed(seed)
+        with no_pacing():
+            started = time.perf_counter()
+            try:
+                SCENARIOS[name](game, rec, frames)
+            finally:
+                rec.restore()
+        results[name] = rec.result(started)
+        print(f"{name:<22} {results[name]['fps']:>9.1f} fps  "
+              f"p95 {results[name]['frame_ms']['p95']:.2f} ms", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "video_driver": pygame.display.get_driver(),
+            "platform": platform.platform(),
+            "frames": frames,
+            "seed": seed,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "atlas": game["atlas"].stats() if "atlas" in game else None,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print fps and p95 frame time change per scenario against an earlier report"""
+    print(f"{'scenario':<22} {'fps before':>11} {'fps now':>9} {'change':>8}   p95 ms before -> now", file=sys.stderr)
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        change = (now["fps"] / before["fps"] - 1) * 100 if before["fps"] else math.nan
+        print(f"{name:<22} {before['fps']:>11.1f} {now['fps']:>9.1f} {change:>+7.1f}%   "
+              f"{before['frame_ms']['p95']:.2f} -> {now['frame_ms']['p95']:.2f}", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="frames per scenario (default 300)")
+    parser.add_argument("--seed", type=int, default=1234, help="board / particle seed")
+    parser.add_argument("--out", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    # The game logs and prints while it loads; keep all of that off stdout
+    log_to_stderr()
+    with redirect_stdout(sys.stderr):
+        report = run(args.scenario or list(SCENARIOS), args.frames, args.seed)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Loopback benchmark for the multi-table game server.
+
+Starts a GameServer in-process on a free local port, connects N clients
+over real sockets and lets every client play its own table to the end
+(or --turns turns). A watcher client joins one more table to check event
+fan-out. Another --abandon clients each drop the connection mid-game
+without "close". All of these tables must be gone from the server once
+their clients are ("tables_left"). Reports throughput, turn latency and
+memory per table as JSON.
+
+    python benchmarks/server_bench.py                     # 200 tables
+    python benchmarks/server_bench.py --tables 1000 --turns 50
+    python benchmarks/server_bench.py --check             # also replay each table locally and compare
+"""
+import os
+import sys
+import asyncio
+import argparse
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from modules.game_rng import SessionRandom
+from modules.game_engine import GameEngine
+from modules.game_server import GameServer, GameClient, PHASE_OVER
+from modules.game_logger import log_to_stderr
+
+PLAYERS = ["Arthur", "Merlin", "Morgana"]
+
+
+async def play_table(port: int, seed: int, level: int, max_turns: Optional[int],
+                     latencies: List[float]) -> Dict[str, Any]:
+    client = await GameClient.connect(port=port)
+    try:
+        created = await client.request("create", players=PLAYERS, level=level, seed=seed)
+        table = created["table"]
+        turns = 0
+        reply = created
+        while reply["state"]["phase"] != PHASE_OVER and (max_turns is None or turns < max_turns):
+            started = time.perf_counter()
+            # Ganti kartu sekali setiap giliran ketiga, supaya NEXT ikut teruji
+            reply = await client.play_turn(table, accept_after=1 if turns % 3 == 2 else 0)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not reply["ok"]:
+                raise RuntimeError(reply["error"])
+            turns += 1
+        return {"table": table, "seed": seed, "turns": turns, "state": reply["state"]}
+    finally:
+        await client.close()
+
+
+async def abandon_table(port: int, seed: int, level: int) -> None:
+    """Create a table, play two turns, then disconnect without sending close"""
+    client = await GameClient.connect(port=port)
+    created = await client.request("create", players=PLAYERS, level=level, seed=seed)
+    for _ in range(2):
+        await client.play_turn(created["table"])
+    await client.close()
+
+
+async def tables_left(server: GameServer, timeout: float = 5.0) -> int:
+    """Tables still open once the server has seen every disconnect (or after timeout)"""
+    deadline = time.perf_counter() + timeout
+    while server.tables and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    return len(server.tables)
+
+
+def local_positions(seed: int, level: int, server: GameServer, turns: int) -> List[int]:
+    """Same table played without the server: positions must match"""
+    engine = GameEngine.new_game(list(PLAYERS), level, streams=SessionRandom(seed), record_log=False,
+                                 deck_template=server.library.template(level))
+    for turn in range(turns):
+        engine.begin_turn()
+        engine.advance(engine.roll_dice())
+        engine.resolve_jump()
+        if turn % 3 == 2 and engine.pending_challenge() is not None:
+            engine.skip_challenge()
+        engine.accept_challenge()
+        engine.finish_turn()
+    return engine.state.positions
+
+
+def table_memory(level: int, count: int = 500) -> float:
+    """KB per fresh table (engine, board, forked deck), deck files already loaded"""
+    server = GameServer()
+    server.library.template(level)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for i in range(count):
+        server.create_table(list(PLAYERS), level, seed=i)
+    memory = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return memory / 1024 / count
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server = GameServer()
+    server.library.template(args.level)  # Muat deck di luar pengukuran
+    port = await server.start(port=0)
+
+    latencies: List[float] = []
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        play_table(port, args.seed + i, args.level, args.turns, latencies) for i in range(args.tables)
+    ))
+    elapsed = time.perf_counter() - started
+
+    # Satu klien mengikuti meja lain dan menerima event dari setiap giliran
+    watcher = await GameClient.connect(port=port)
+    player = await GameClient.connect(port=port)
+    created = await player.request("create", players=PLAYERS, level=args.level, seed=args.seed)
+    await watcher.request("join", table=created["table"])
+    for _ in range(10):
+        await player.play_turn(created["table"])
+    await watcher.request("state", table=created["table"])
+    events = len(watcher.events)
+    await watcher.close()
+    await player.close()
+
+    await asyncio.gather(*(abandon_table(port, args.seed + i, args.level) for i in range(args.abandon)))
+    left = await tables_left(server)
+
+    stats = server.stats()
+    await server.stop()
+
+    report: Dict[str, Any] = {
+        "tables": args.tables,
+        "turns": sum(r["turns"] for r in results),
+        "finished": sum(1 for r in results if r["state"]["phase"] == PHASE_OVER),
+        "seconds": round(elapsed, 3),
+        "turns_per_s": round(sum(r["turns"] for r in results) / elapsed, 1),
+        "requests": stats["requests"],
+        "turn_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p95": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 3) if latencies else 0.0,
+        },
+        "kb_per_table": round(table_memory(args.level), 1),
+        "watcher_events": events,
+        "abandoned": args.abandon,
+        "tables_left": left,
+    }
+    if args.check:
+        report["mismatches"] = sum(
+            1 for r in results
+            if local_positions(r["seed"], args.level, server, r["turns"]) != r["state"]["positions"]
+        )
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=None, help="turns per table (default: until someone wins)")
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--abandon", type=int, default=50, help="clients that disconnect mid-game without close")
+    parser.add_argument("--check", action="store_true", help="compare every table with a local engine")
+    args = parser.parse_args(argv)
+    log_to_stderr()  # stdout is the JSON report
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    return 1 if report.get("mismatches") or report["tables_left"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""
+Benchmark and loopback check for the snapshot + delta state sync protocol.
+
+Plays seeded games with the headless GameEngine and emits a delta after
+each half of a turn (dice/jump, then the card), like a second screen
+following the table. Reports bytes per turn against resending the full
+state as JSON, and encode/decode time per frame. The frames are then
+streamed over loopback TCP to several clients; one of them drops every
+--drop-every'th delta and has to resync from a snapshot. Every client's
+mirror must match the server state at the end.
+
+    python benchmarks/sync_bench.py
+    python benchmarks/sync_bench.py --games 50 --clients 8 --drop-every 7
+"""
+import os
+import sys
+import asyncio
+import argparse
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from modules.game_rng import SessionRandom
+from modules.game_engine import GameEngine
+from modules.game_logger import log_to_stderr
+from modules.game_state import GameState
+from modules.game_utils import load_level_challenges
+from modules.challenge_index import get_record
+from modules.state_sync import FRAME_SNAPSHOT, StateEncoder, StateMirror, read_frame
+
+PLAYERS = ["Arthur", "Merlin", "Morgana"]
+RESYNC_REQUEST = b"S"
+
+
+def full_state_json(state: GameState) -> bytes:
+    """What a naive sync sends after every turn"""
+    return json.dumps({
+        "players": state.players,
+        "positions": state.positions,
+        "turn": state.turn,
+        "snakes": state.snakes,
+        "ladders": state.ladders,
+        "challenges": {tile: get_record(card).text for tile, card in state.challenges.items()},
+        "history": state.log_manager.get_full_log(),
+    }, ensure_ascii=False).encode("utf-8")
+
+
+def comparable(state: GameState) -> Dict[str, Any]:
+    return {
+        "players": state.players,
+        "positions": list(state.positions),
+        "turn": state.turn,
+        "snakes": dict(state.snakes),
+        "ladders": dict(state.ladders),
+        "challenges": {tile: get_record(card).text for tile, card in state.challenges.items()},
+        "history": state.log_manager.history,
+        "current": state.log_manager.current_turn_log,
+    }
+
+
+def play_turn(engine: GameEngine, encoder: StateEncoder, turn: int, on_frame,
+              encode_ms: Optional[List[float]] = None) -> None:
+    """One turn, same steps as game.py; a delta after the dice/jump and after the card"""
+    def emit(dice: Optional[int] = None) -> None:
+        started = time.perf_counter()
+        frame = encoder.delta(dice)
+        if encode_ms is not None:
+            encode_ms.append((time.perf_counter() - started) * 1000)
+        if frame is not None:
+            on_frame(frame)
+
+    engine.begin_turn()
+    dice = engine.roll_dice()
+    engine.advance(dice)
+    engine.resolve_jump()
+    emit(dice)
+    if engine.pending_challenge() is not None:
+        if turn % 3 == 2:
+            engine.skip_challenge()
+        engine.accept_challenge()
+    engine.finish_turn()
+    emit()
+
+
+def new_engine(seed: int, data: Dict[str, Any]) -> GameEngine:
+    return GameEngine.new_game(list(PLAYERS), 1, data, streams=SessionRandom(seed))
+
+
+def measure(args: argparse.Namespace, data: Dict[str, Any]) -> Dict[str, Any]:
+    encode_ms: List[float] = []
+    decode_ms: List[float] = []
+    delta_bytes = json_bytes = snapshot_bytes = turns = 0
+    mismatches = 0
+
+    for game in range(args.games):
+        engine = new_engine(args.seed + game, data)
+        encoder = StateEncoder(engine.state)
+        mirror = StateMirror()
+        snapshot = encoder.snapshot()
+        snapshot_bytes += len(snapshot)
+        mirror.apply(snapshot)
+
+        def on_frame(frame: bytes) -> None:
+            nonlocal delta_bytes
+            delta_bytes += len(frame)
+            started = time.perf_counter()
+            mirror.apply(frame)
+            decode_ms.append((time.perf_counter() - started) * 1000)
+
+        played = 0
+        while engine.winner is None and played < args.max_turns:
+            play_turn(engine, encoder, played, on_frame, encode_ms)
+            played += 1
+            json_bytes += len(full_state_json(engine.state))
+        turns += played
+        if comparable(mirror.state) != comparable(engine.state):
+            mismatches += 1
+
+    def mean(values: List[float]) -> float:
+        return round(sum(values) / len(values), 4) if values else 0.0
+
+    return {
+        "games": args.games,
+        "turns": turns,
+        "bytes_per_turn": round(delta_bytes / turns, 1),
+        "json_full_state_bytes_per_turn": round(json_bytes / turns, 1),
+        "snapshot_bytes": round(snapshot_bytes / args.games, 1),
+        "encode_ms": mean(encode_ms),
+        "decode_ms": mean(decode_ms),
+        "mismatches": mismatches,
+    }
+
+
+async def loopback(args: argparse.Namespace, data: Dict[str, Any]) -> Dict[str, Any]:
+    engine = new_engine(args.seed, data)
+    encoder = StateEncoder(engine.state)
+    writers: List[asyncio.StreamWriter] = []
+    connected = asyncio.Event()
+
+    async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writers.append(writer)
+        writer.write(encoder.snapshot())
+        if len(writers) == args.clients:
+            connected.set()
+        # Satu-satunya permintaan klien: snapshot baru
+        try:
+            while await reader.read(1) == RESYNC_REQUEST:
+                writer.write(encoder.snapshot())
+        except ConnectionError:
+            pass
+
+    async def client(index: int) -> StateMirror:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        mirror = StateMirror()
+        waiting = False
+        received = 0
+        while True:
+            frame = await read_frame(reader)
+            if frame[0] != FRAME_SNAPSHOT:
+                received += 1
+                if index == 0 and received % args.drop_every == 0:
+                    continue  # Frame "hilang" di jalan
+            if mirror.apply(frame):
+                waiting = False
+            elif not waiting:
+                waiting = True
+                writer.write(RESYNC_REQUEST)
+            if mirror.seq == final_seq:
+                break
+        writer.close()
+        return mirror
+
+    server = await asyncio.start_server(on_connect, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    final_seq = -1
+    tasks = [asyncio.ensure_future(client(i)) for i in range(args.clients)]
+    await connected.wait()
+
+    def broadcast(frame: bytes) -> None:
+        for writer in writers:
+            writer.write(frame)
+
+    turns = 0
+    while engine.winner is None and turns < args.max_turns:
+        play_turn(engine, encoder, turns, broadcast)
+        turns += 1
+        await asyncio.sleep(0)
+    final_seq = encoder.seq
+    # Klien yang sedang menunggu snapshot di akhir game
+    broadcast(encoder.snapshot())
+
+    mirrors = await asyncio.wait_for(asyncio.gather(*tasks), 60)
+    server.close()
+    await server.wait_closed()
+    expected = comparable(engine.state)
+    return {
+        "clients": args.clients,
+        "turns": turns,
+        "frames": final_seq,
+        "resyncs": sum(m.resyncs for m in mirrors),
+        "in_sync": sum(1 for m in mirrors if comparable(m.state) == expected),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--max-turns", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--drop-every", type=int, default=5, help="client 0 loses every Nth delta")
+    parser.add_argument("--seed", type=int, default=1000)
+    args = parser.parse_args(argv)
+    log_to_stderr()  # stdout is the JSON report
+
+    data = load_level_challenges(BASE_DIR, 1)
+    report = measure(args, data)
+    report["loopback"] = asyncio.run(loopback(args, data))
+    print(json.dumps(report, indent=2))
+    ok = report["mismatches"] == 0 and report["loopback"]["in_sync"] == args.clients
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,36 +5,48 @@ import os
 import time
 import math
 import re
+import argparse
 from typing import Optional
 import sys
 from modules.dice_generator import generate_dice_sprites
 from modules.board_assets import get_challenge_image
 from modules.challenge_parser import get_move_effect
-from modules.board_generator import generate_random_objects
-from modules.visuals import draw_background_effects, draw_scroll
-from modules.sidebar_manager import SidebarManager
-from modules.menu_manager import show_main_menu, show_pause_menu
+from modules.visuals import (
+    draw_background_effects,
+    draw_background_layer,
+    draw_scroll,
+    step_background_particles,
+)
+from modules.sidebar_manager import SidebarManager, load_icons, atlas_icons
+from modules.sprite_atlas import SpriteAtlas
+from modules.menu_manager import show_main_menu, show_pause_menu, show_loading_screen
 from modules.left_sidebar import LeftSidebar
 import modules.popup_manager as popup_manager
+from modules.popup_resources import PopupResources
 from game_constants import *
 from modules.game_logger import logger
 from modules.asset_loader import AssetLoader
-from modules.game_state import GameState
-from modules.game_renderer import GameRenderer
-from modules.game_deck import ChallengeDeck
+from modules.asset_preloader import AssetPreloader
+from modules.asset_cache import AssetDiskCache
+from modules.game_renderer import GameRenderer, HEADER_AVATAR
 from modules.game_utils import (
-    resource_path,
     get_timer_duration,
     board_xy as board_xy_from_utils,
     lerp,
     overflow_reflect,
     play_sound,
-    fade_to_dark,
-    fade_from_dark,
-    distribute_random_challenges,
+    load_level_challenges,
 )
 from modules.game_victory import show_victory_screen
-from modules.game_state import GameState
+from modules.challenge_index import get_record
+from modules.dirty_rects import DirtyRectRenderer
+from modules.frame_scheduler import FrameScheduler
+from modules.frame_profiler import FrameProfiler
+from modules.text_cache import render_text
+from modules.timeline import Timeline, Tween, Wait, Script
+from modules.save_game import save_game, load_snapshot, decode_game, has_save, delete_save
+from modules.game_rng import SessionRandom
+from modules.replay import ReplayLog, ReplayRecorder, build_engine, make_header, CHOICE_NEXT
 
 def board_xy(n):
     """Wrapper untuk board_xy dengan konstanta lokal + OFFSET KIRI + CENTER"""
@@ -52,8 +64,73 @@ def board_xy(n):
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 IMAGE_DIR = os.path.join(BASE_DIR, "images")
 
+arg_parser = argparse.ArgumentParser(description="Snake & Ladders: Truth or Dare")
+arg_parser.add_argument("--seed", type=int, help="seed sesi: papan, kartu dan dadu bisa diulang")
+arg_parser.add_argument("--replay", help="putar ulang file replay (replays/*.jsonl) di layar game")
+# Di-exec oleh benchmark/tes: argumen mereka bukan untuk game
+args = arg_parser.parse_known_args()[0] if __name__ == "__main__" else arg_parser.parse_args([])
+
+replay_log = ReplayLog.load(args.replay) if args.replay else None
+
 pygame.init()
 
+# Urutan = prioritas decode: aset menu dulu, lalu aset papan game
+MENU_ASSETS = [
+    "images/bg_medieval.png",
+    "images/bg_ghibli.png",
+    "images/bg_cinta.png",
+    "sounds/hover.wav",
+    "sounds/click.wav",
+]
+GAME_ASSETS = [
+    "images/scroll_medieval.png",
+    "images/scroll_truth.png",
+    "images/scroll_dare.png",
+    "images/hero_1.png",
+    "images/hero_2.png",
+    "images/hero_3.png",
+    "images/hero_4.png",
+    "images/sidebar_right_bg.png",
+    "images/sidebar_bg.png",
+    "images/pindah.png",
+    "images/ular_icon.png",
+    "images/tangga_icon.png",
+    "images/scroll_icon.png",
+    "images/default_challenge.png",
+    "sounds/step.wav",
+    "sounds/dice_roll.wav",
+    "sounds/dice_end.wav",
+    "sounds/timer_end.wav",
+]
+
+# Ukuran target aset yang di-scale lewat AssetLoader (dan disimpan di cache disk)
+ASSET_SIZES = {
+    "images/scroll_medieval.png": (100, 100),
+    "images/scroll_truth.png": (100, 100),
+    "images/scroll_dare.png": (100, 100),
+    "images/hero_1.png": (64, 64),
+    "images/hero_2.png": (64, 64),
+    "images/hero_3.png": (64, 64),
+    "images/hero_4.png": (64, 64),
+    "images/sidebar_right_bg.png": (SIDEBAR_WIDTH, HEIGHT),
+    "images/sidebar_bg.png": (SIDEBAR_LEFT_WIDTH, HEIGHT),
+}
+OPAQUE_ASSETS = {"images/sidebar_right_bg.png", "images/sidebar_bg.png"}
+
+disk_cache = AssetDiskCache(os.path.join(BASE_DIR, ASSET_CACHE_DIR)) if ASSET_CACHE_DIR else None
+if disk_cache:
+    # Yang sudah ada di cache disk tidak perlu di-decode dari PNG lagi
+    GAME_ASSETS = [
+        p for p in GAME_ASSETS
+        if not disk_cache.has(os.path.join(BASE_DIR, p), ASSET_SIZES.get(p), p not in OPAQUE_ASSETS)
+    ]
+
+preloader = None
+if ASSET_PRELOAD:
+    preloader = AssetPreloader(BASE_DIR)
+    preloader.start(MENU_ASSETS + GAME_ASSETS)
+load_image = preloader.load if preloader else pygame.image.load
+
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.SCALED, vsync=1)
 pygame.display.set_caption("Snake & Ladder")
 
@@ -65,11 +142,7 @@ if os.path.exists(icon_path):
 from modules import visuals  # Pastikan sudah di-import
 
 logger.info("Initializing Game...")
-asset_loader = AssetLoader(BASE_DIR)
-
-SCROLL_IMG = asset_loader.load_image("images/scroll_medieval.png", (100, 100))
-SCROLL_TRUTH_IMG = asset_loader.load_image("images/scroll_truth.png", (100, 100))
-SCROLL_DARE_IMG = asset_loader.load_image("images/scroll_dare.png", (100, 100))
+asset_loader = AssetLoader(BASE_DIR, preloader, disk_cache)
 
 font = asset_loader.load_font(FONT_FILE, 24)
 big_font = asset_loader.load_font(FONT_FILE, 48)
@@ -77,32 +150,111 @@ log_bold_font = asset_loader.load_font(FONT_FILE, 20)
 tile_font = pygame.font.SysFont("arial", 20, bold=True)
 small_font = pygame.font.SysFont("arial", 14)
 
+clock = pygame.time.Clock()
+scheduler = FrameScheduler(clock)
+
+try:
+    with open(os.path.join(BASE_DIR, "challenges.json"), encoding="utf-8") as f:
+        challenges = json.load(f)
+except FileNotFoundError:
+    challenges = {}
+
+SAVE_PATH = os.path.join(BASE_DIR, SAVE_DIR, SAVE_FILE)
+
+p_config = {
+    "WIDTH": WIDTH,
+    "HEIGHT": HEIGHT,
+    "big_font": big_font,
+    "font": font,
+    "clock": clock,
+    "preloader": preloader,
+    "save_available": has_save(SAVE_PATH),
+}
+
+if replay_log:
+    players, game_level = replay_log.header["players"], replay_log.header["level"]
+else:
+    # Menu tampil selagi aset game masih di-decode di thread preloader
+    players, game_level = show_main_menu(screen, p_config)
+
+saved_snapshot = None
+if players is None:  # CONTINUE
+    saved_snapshot = load_snapshot(SAVE_PATH)
+    if saved_snapshot:
+        saved_game = decode_game(saved_snapshot)
+        players, game_level = saved_game.players, saved_game.level
+        logger.info(f"Melanjutkan game tersimpan: {saved_game}")
+    else:
+        players, game_level = ["Player 1", "Player 2"], 1
+show_loading_screen(screen, p_config, GAME_ASSETS)
+
+SCROLL_IMG = asset_loader.load_image("images/scroll_medieval.png", ASSET_SIZES["images/scroll_medieval.png"])
+SCROLL_TRUTH_IMG = asset_loader.load_image("images/scroll_truth.png", ASSET_SIZES["images/scroll_truth.png"])
+SCROLL_DARE_IMG = asset_loader.load_image("images/scroll_dare.png", ASSET_SIZES["images/scroll_dare.png"])
+
 dice_images = generate_dice_sprites(80)
 
 hero_avatars = []
 for i in range(1, 5):
-    img = asset_loader.load_image(f"images/hero_{i}.png", (64, 64))
+    img = asset_loader.load_image(f"images/hero_{i}.png", ASSET_SIZES[f"images/hero_{i}.png"])
     hero_avatars.append(img)
 
 RIGHT_SIDEBAR_BG = None
 try:
     path_bg = os.path.join(IMAGE_DIR, "sidebar_right_bg.png")
     if os.path.exists(path_bg):
-        raw = pygame.image.load(path_bg).convert()
-        RIGHT_SIDEBAR_BG = pygame.transform.smoothscale(raw, (SIDEBAR_WIDTH, HEIGHT))
+        RIGHT_SIDEBAR_BG = asset_loader.load_image(
+            "images/sidebar_right_bg.png", ASSET_SIZES["images/sidebar_right_bg.png"], alpha=False
+        )
         print("✅ Background Sidebar Kanan diload!")
     else:
         print("ℹ️ sidebar_right_bg.png tidak ditemukan (Pakai warna polos).")
 except Exception as e:
     print(f"⚠️ Error load sidebar kanan: {e}")
 
+popup_resources = PopupResources(
+    IMAGE_DIR, load_image=load_image, load_sound=preloader.sound if preloader else None
+)
+popup_resources.preload()
+
+# Ikon, scroll, dadu, avatar & gambar popup digabung ke beberapa halaman atlas
+sidebar_icons = load_icons(IMAGE_DIR, load_image)
+atlas = SpriteAtlas()
+atlas.add("scroll_default", SCROLL_IMG, trim=True)
+atlas.add("scroll_truth", SCROLL_TRUTH_IMG, trim=True)
+atlas.add("scroll_dare", SCROLL_DARE_IMG, trim=True)
+for n, img in dice_images.items():
+    atlas.add(f"dice_{n}", img)
+for idx, img in enumerate(hero_avatars):
+    atlas.add(f"hero_{idx}", img)
+    atlas.add(f"hero_{idx}@{HEADER_AVATAR}", pygame.transform.smoothscale(img, (HEADER_AVATAR, HEADER_AVATAR)))
+for name, img in atlas_icons(sidebar_icons, dice_images, hero_avatars):
+    atlas.add(name, img)
+for name, img in popup_resources.atlas_images():
+    atlas.add(name, img)
+atlas.build()
+logger.info(atlas.report())
+
+# Surface lama dilepas: kode gambar memakai subsurface halaman atlas.
+# SCROLL_*_IMG tetap ukuran penuh (cadangan popup); renderer memakai versi trim di atlas
+popup_resources.use_atlas(atlas)
+asset_loader.clear_cache()
+dice_images = {n: atlas.surface(f"dice_{n}") for n in dice_images}
+hero_avatars = [atlas.surface(f"hero_{idx}") for idx in range(len(hero_avatars))]
+
 sidebar_helper = SidebarManager(
-    IMAGE_DIR, dice_images, hero_avatars, font_path=FONT_FILE
+    IMAGE_DIR, dice_images, hero_avatars, font_path=FONT_FILE, load_image=load_image,
+    icons=sidebar_icons, atlas=atlas,
 )
+LEFT_SIDEBAR_BG = None
+if os.path.exists(os.path.join(IMAGE_DIR, "sidebar_bg.png")):
+    LEFT_SIDEBAR_BG = asset_loader.load_image(
+        "images/sidebar_bg.png", ASSET_SIZES["images/sidebar_bg.png"], alpha=False
+    )
 left_sidebar_visual = LeftSidebar(
-    SIDEBAR_LEFT_WIDTH, HEIGHT, IMAGE_DIR, font_path=FONT_FILE
+    SIDEBAR_LEFT_WIDTH, HEIGHT, IMAGE_DIR, font_path=FONT_FILE, load_image=load_image,
+    bg_image=LEFT_SIDEBAR_BG,
 )
-clock = pygame.time.Clock()
 
 assets = {
     "scroll_default": SCROLL_IMG,
@@ -110,6 +262,7 @@ assets = {
     "scroll_dare": SCROLL_DARE_IMG,
     "hero_avatars": hero_avatars,
     "right_sidebar_bg": RIGHT_SIDEBAR_BG,
+    "atlas": atlas,
 }
 fonts_collection = {
     "big": big_font,
@@ -118,101 +271,92 @@ fonts_collection = {
     "log": log_bold_font,
 }
 renderer = GameRenderer(screen, assets, fonts_collection)
+dirty_renderer = DirtyRectRenderer(screen)
+dirty_renderer.set_underlay(BG_COLOR, draw_background_layer)
+
+# Hook timing per tahap render (aktif hanya saat HUD F3 / rekaman F4 menyala)
+profiler = FrameProfiler()
+profiler.instrument(renderer, {
+    "draw_board": "board",
+    "draw_board_layer": "board",
+    "draw_scrolls": "board",
+    "draw_ladder": "ladders",
+    "draw_snake": "snakes",
+    "draw_pion": "pawns",
+    "draw_panel": "panel",
+})
+profiler.instrument(left_sidebar_visual, {"draw": "left_sidebar"})
+profiler.instrument(dirty_renderer, {"present": "flip"})
+draw_background_effects = profiler.wrap("background", draw_background_effects)
+
+step_sound = asset_loader.load_sound("sounds/step.wav")
+dice_roll = asset_loader.load_sound("sounds/dice_roll.wav")
+dice_end = asset_loader.load_sound("sounds/dice_end.wav")
+
+# Layar terakhir menu, dipakai transisi pembuka di loop utama
+menu_snapshot = screen.copy()
+dark_overlay = pygame.Surface((WIDTH, HEIGHT))
+dark_overlay.fill((15, 12, 10))
+
+def start_session(players, game_level, snapshot=None, replay=None, seed=None):
+    """
+    Sesi baru: papan, deck dan engine dari satu SessionRandom, plus perekam replay.
+    snapshot: bytes save (CONTINUE); replay: ReplayLog yang diputar ulang
+    """
+    global state, engine, CHALLENGE_DECK, session_rng, recorder, replay_log
+    global positions, colors, bounce_phase, pulse_scale, snakes, ladders, challenges
+    global log_manager, history, current_turn_log
+
+    raw_data = load_level_challenges(BASE_DIR, game_level)
+    replay_log = replay
+    if replay:
+        session_rng = SessionRandom(replay.seed)
+        engine = replay.build_engine(raw_data, session_rng)
+    else:
+        # Seed dari `random` global: acak biasa, tapi ikut random.seed() benchmark
+        session_rng = SessionRandom(seed if seed is not None else random.getrandbits(32))
+        engine = build_engine(players, game_level, raw_data, session_rng,
+                              BOARD_TARGET_TURNS, 40, snapshot)
+    state = engine.state
+    CHALLENGE_DECK = engine.deck
+    logger.info(f"Sesi {session_rng}: {len(state.challenges)} tantangan di papan.")
+
+    if recorder:
+        recorder.close()
+    recorder = None
+    if REPLAY_DIR and not replay:
+        recorder = ReplayRecorder(
+            os.path.join(BASE_DIR, REPLAY_DIR, time.strftime(f"replay_%Y%m%d_%H%M%S_{session_rng.seed}.jsonl")),
+            make_header(session_rng.seed, players, game_level, raw_data, BOARD_TARGET_TURNS, 40, snapshot),
+        )
 
-try:
-    step_sound = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "step.wav"))
-    dice_roll = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "dice_roll.wav"))
-    dice_end = pygame.mixer.Sound(os.path.join(BASE_DIR, "sounds", "dice_end.wav"))
-except Exception:
-    step_sound = None
-    dice_roll = None
-    dice_end = None
-
-try:
-    with open(os.path.join(BASE_DIR, "challenges.json"), encoding="utf-8") as f:
-        challenges = json.load(f)
-except FileNotFoundError:
-    challenges = {}
-
-from modules.board_generator import generate_random_objects
-
-p_config = {
-    "WIDTH": WIDTH,
-    "HEIGHT": HEIGHT,
-    "big_font": big_font,
-    "font": font,
-    "clock": clock,
-}
-
-players, game_level = show_main_menu(screen, p_config)
-dark_overlay = fade_to_dark(screen, WIDTH, HEIGHT)
-
-raw_challenges_data = {}
-try:
-    filename = f"challenges_lv{game_level}.json"
-    with open(os.path.join(BASE_DIR, filename), encoding="utf-8") as f:
-        raw_challenges_data = json.load(f)
-    logger.info(f"Berhasil memuat tantangan Level {game_level}")
-except FileNotFoundError:
-    logger.warning(f"File {filename} tidak ada, menggunakan default.")
-    try:
-        with open(os.path.join(BASE_DIR, "challenges.json"), encoding="utf-8") as f:
-            raw_challenges_data = json.load(f)
-    except:
-        raw_challenges_data = {}
-
-CHALLENGE_DECK = ChallengeDeck(raw_challenges_data)
-
-state = GameState(players, game_level)
-
-state.snakes, state.ladders = generate_random_objects(
-    TOTAL, num_snakes=3, num_ladders=2
-)
-
-if raw_challenges_data:
-    state.challenges = distribute_random_challenges(
-        CHALLENGE_DECK, state.snakes, state.ladders, amount=40
-    )
-    logger.info(f"Berhasil menyebar {len(state.challenges)} tantangan di papan.")
-
-positions = state.positions
-colors = state.colors
-bounce_phase = state.bounce_phase
-pulse_scale = state.pulse_scale
-snakes = state.snakes
-ladders = state.ladders
-challenges = state.challenges
+    positions = state.positions
+    colors = state.colors
+    bounce_phase = state.bounce_phase
+    pulse_scale = state.pulse_scale
+    snakes = state.snakes
+    ladders = state.ladders
+    challenges = state.challenges
+    log_manager = state.log_manager
+    history = log_manager.history
+    current_turn_log = log_manager.current_turn_log
+    renderer.camera.recenter(renderer.layout.center(state.positions[state.turn]))
+
+recorder = None
+start_session(players, game_level, snapshot=saved_snapshot, replay=replay_log, seed=args.seed)
 turn = state.turn
 
-log_manager = state.log_manager
-sidebar_snapshot = None  # Visual cache handled locally
-
-def start_turn(player):
-    log_manager.start_turn(player)
-
-def log_turn(text):
-    log_manager.log_turn(text)
-
-def end_turn():
-    log_manager.end_turn()
-    global sidebar_snapshot
-    sidebar_snapshot = log_manager.sidebar_snapshot
-
-history = log_manager.history
-current_turn_log = log_manager.current_turn_log
-
-def board_xy(n):
-    """Wrapper untuk board_xy dengan konstanta lokal + OFFSET KIRI"""
+def board_world_xy(n):
+    """Posisi pion berjalan di koordinat papan (world, tanpa kamera)"""
     idx = max(0, n - 1)
 
     base_x, base_y = board_xy_from_utils(idx, COLS, ROWS, CELL)
 
-    final_x = base_x + SIDEBAR_LEFT_WIDTH
+    return base_x + (CELL // 2), base_y + (CELL // 2)
 
-    center_x = final_x + (CELL // 2)
-    center_y = base_y + (CELL // 2)
-
-    return center_x, center_y
+def board_xy(n):
+    """Wrapper untuk board_xy dengan konstanta lokal + posisi kamera"""
+    return renderer.to_target(*board_world_xy(n))
 
 def draw_board():
     global SCROLL_IMG
@@ -321,13 +465,13 @@ def draw_board():
             cx, cy = x + CELL // 2, y + CELL // 2
             float_y = math.sin(pygame.time.get_ticks() * 0.005 + i) * 6
 
-            challenge_text = challenges[str(i)].lower()
+            kind = get_record(challenges[str(i)]).kind
             scroll_to_use = SCROLL_IMG  # Default scroll
 
-            if "truth" in challenge_text or "kebenaran" in challenge_text:
+            if kind == "truth":
                 if SCROLL_TRUTH_IMG:
                     scroll_to_use = SCROLL_TRUTH_IMG
-            elif "dare" in challenge_text or "tantangan" in challenge_text:
+            elif kind == "dare":
                 if SCROLL_DARE_IMG:
                     scroll_to_use = SCROLL_DARE_IMG
 
@@ -590,177 +734,185 @@ def draw_cinematic_overlay(target_pos_idx):
 
     screen.blit(overlay, (0, 0))
 
-sidebar_snapshot = None
-last_history_len = -1
+PANEL_RECT = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
+last_panel_key = None
 
-def draw_panel():
-    global sidebar_snapshot, last_history_len
-
-    full_log = log_manager.get_full_log()
-    sidebar_rect = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
-
-    current_len = len(full_log)
-    if current_len != last_history_len:
-        sidebar_snapshot = None
+def draw_board_frame():
+    board_rect = renderer.camera.view.inflate(10, 10)
+    pygame.draw.rect(screen, (80, 80, 90), board_rect, 6, border_radius=4)
+    pygame.draw.rect(screen, (40, 40, 50), board_rect, 2, border_radius=4)
 
-    if sidebar_snapshot is not None:
-        screen.blit(sidebar_snapshot, (WIDTH - SIDEBAR_WIDTH, 0))
-        draw_current_turn_header()
-        return
+def panel_key():
+    """Semua yang mempengaruhi tampilan sidebar kanan"""
+    return (
+        state.turn,
+        state.positions[state.turn],
+        state.log_manager.revision,
+    )
 
-    last_history_len = current_len
+def moving_pion_rect(moving_idx, anim_x, anim_y, jump_h):
+    """anim_x, anim_y: koordinat world (lihat walk_pose)"""
+    anim_x, anim_y = renderer.to_target(anim_x, anim_y)
+    render_x = anim_x + (moving_idx * 8) - 12
+    p_h = int(26 * (1.0 + (jump_h * 0.015)))
+    top = anim_y - jump_h - p_h - 16
+    return pygame.Rect(render_x - 16, top, 32, (anim_y + 32) - top)
+
+def draw_moving_pion(moving_idx, anim_x, anim_y, jump_h):
+    # Digambar di permukaan papan renderer (layar, atau layer zoom kamera)
+    target = renderer.screen
+    anim_x, anim_y = renderer.to_target(anim_x, anim_y)
+    stack_offset = (moving_idx * 8) - 12
 
-    if RIGHT_SIDEBAR_BG:
-        screen.blit(RIGHT_SIDEBAR_BG, (WIDTH - SIDEBAR_WIDTH, 0))
+    render_x = anim_x + stack_offset
+    render_y = anim_y
 
-        overlay = pygame.Surface((SIDEBAR_WIDTH, HEIGHT), pygame.SRCALPHA)
+    shadow_size = max(4, 12 - int(jump_h * 0.15))
+    pygame.draw.circle(
+        target, (0, 0, 0, 60), (int(render_x), int(anim_y + 18)), shadow_size
+    )
 
-        overlay.fill((20, 23, 30, 180))
+    stretch = 1.0 + (jump_h * 0.015)  # Sedikit lebih melar biar kartunis
+    p_w = int(26 / stretch)
+    p_h = int(26 * stretch)
 
-        screen.blit(overlay, (WIDTH - SIDEBAR_WIDTH, 0))
-    else:
-        pygame.draw.rect(screen, (25, 28, 35), sidebar_rect)
+    visual_y = render_y - jump_h - p_h - 15
 
-    pygame.draw.line(
-        screen,
-        (10, 10, 15),
-        (WIDTH - SIDEBAR_WIDTH, 0),
-        (WIDTH - SIDEBAR_WIDTH, HEIGHT),
-        4,
-    )
-    pygame.draw.line(
-        screen,
-        (60, 50, 40),
-        (WIDTH - SIDEBAR_WIDTH + 4, 0),
-        (WIDTH - SIDEBAR_WIDTH + 4, HEIGHT),
-        1,
-    )
+    rect = pygame.Rect(render_x - p_w // 2, visual_y, p_w, p_h)
 
-    draw_current_turn_header()
-
-    sidebar_helper.draw_history_ui(
-        screen,
-        full_log,
-        players,
-        colors,
-        challenges,
-        start_y=135,
-        sidebar_width=SIDEBAR_WIDTH,
-        width_total=WIDTH,
+    pygame.draw.ellipse(target, colors[moving_idx], rect)
+    pygame.draw.ellipse(
+        target,
+        (255, 255, 255),
+        (rect.x + p_w // 3, rect.y + p_h // 4, p_w // 3, p_h // 4),
+        0,
     )
 
-    sidebar_snapshot = screen.subsurface(sidebar_rect).copy()
-    log_manager.sidebar_snapshot = sidebar_snapshot
-
-def draw_current_turn_header():
+def redraw_dirty(active_snake=None, active_ladder=None, moving=None):
     """
-    Menggunakan Font Custom sepenuhnya.
+    Mode dirty-rect: bagian statis (sidebar, papan, tangga, panel) disimpan
+    sebagai backdrop, hanya area yang bergerak yang digambar ulang dan
+    dikirim ke layar. Saat kamera bergeser atau di-zoom, papan tidak masuk
+    backdrop: seluruh area papan digambar ulang, sidebar tidak.
+    Partikel background ada di bawah backdrop: digabung ke backdrop hanya
+    di tempat yang tembus pandang (lihat DirtyRectRenderer.draw_underlay).
+    moving: (idx, x, y, jump_h) untuk pion yang sedang dianimasikan
     """
-    curr_idx = state.turn
-    curr_name = players[curr_idx]
-    curr_col = colors[curr_idx]
-
-    card_margin_x = 12
-    card_w = SIDEBAR_WIDTH - (card_margin_x * 2)
-    card_h = 85  # Tinggi kartu yang compact tapi lega
-
-    card_x = WIDTH - SIDEBAR_WIDTH + card_margin_x
-    card_y = 20  # Jarak dari atas layar
-
-    card_rect = pygame.Rect(card_x, card_y, card_w, card_h)
-
-    shadow_rect = card_rect.move(0, 4)
-    pygame.draw.rect(screen, (0, 0, 0, 80), shadow_rect, border_radius=12)
-
-    pygame.draw.rect(screen, (30, 32, 40), card_rect, border_radius=12)
-
-    pygame.draw.rect(screen, curr_col, card_rect, 1, border_radius=12)
-
-    avatar_size = 56  # Ukuran avatar
-    av_padding = 10  # Jarak avatar dari pinggir kiri kartu
-
-    av_center_x = card_x + av_padding + (avatar_size // 2)
-    av_center_y = (
-        card_y + (card_h // 2) - 4
-    )  # Sedikit ke atas karena ada progress bar di bawah
-
-    pygame.draw.circle(
-        screen, (20, 20, 25), (av_center_x, av_center_y), (avatar_size // 2) + 2
-    )
-    pygame.draw.circle(
-        screen, curr_col, (av_center_x, av_center_y), (avatar_size // 2), 1
-    )  # Ring tipis warna player
-
-    if curr_idx < len(hero_avatars):
-        raw_img = hero_avatars[curr_idx]
-        av_img = pygame.transform.smoothscale(
-            raw_img, (avatar_size - 6, avatar_size - 6)
-        )
-        av_rect = av_img.get_rect(center=(av_center_x, av_center_y))
-        screen.blit(av_img, av_rect)
-
-    text_start_x = av_center_x + (avatar_size // 2) + 12
-    text_center_y = av_center_y
-
-    try:
-        lbl_font = pygame.font.Font(FONT_FILE, 10)
-        name_font = pygame.font.Font(FONT_FILE, 22)
-        info_font = pygame.font.Font(FONT_FILE, 12)
-    except:
-        lbl_font = pygame.font.SysFont("georgia", 9, bold=True)
-        name_font = pygame.font.SysFont("georgia", 20, bold=True)
-        info_font = pygame.font.SysFont("arial", 11)
-
-    lbl_surf = lbl_font.render("CURRENT TURN", True, (150, 160, 170))
-    screen.blit(lbl_surf, (text_start_x, text_center_y - 24))
-
-    lum = 0.299 * curr_col[0] + 0.587 * curr_col[1] + 0.114 * curr_col[2]
-    name_color = (255, 255, 255) if lum < 120 else (20, 20, 20)
-    if lum > 120:
-        name_color = (240, 240, 230)  # Putih tulang jika player gelap
-
-    name_shadow = name_font.render(curr_name, True, (0, 0, 0))
-    screen.blit(name_shadow, (text_start_x + 1, text_center_y - 8))
-
-    name_surf = name_font.render(
-        curr_name, True, curr_col
-    )  # Pakai warna player biar keren
-    screen.blit(name_surf, (text_start_x, text_center_y - 9))
-
-    pos_val = positions[curr_idx]
-    info_text = f"Tile: {pos_val} / {TOTAL}"
-    info_surf = info_font.render(info_text, True, (180, 180, 180))
-    screen.blit(info_surf, (text_start_x, text_center_y + 14))
-
-    bar_h = 4
-    bar_w = card_w - 20  # Padding kiri kanan 10
-    bar_x = card_x + 10
-    bar_y = card_y + card_h - 10  # 10px dari bawah kartu
-
-    pygame.draw.rect(
-        screen, (20, 20, 25), (bar_x, bar_y, bar_w, bar_h), border_radius=2
+    global last_panel_key
+
+    camera = renderer.camera
+    board_in_backdrop = camera.zoom == 1.0 and not camera.moving
+    board_key = (
+        tuple(state.snakes.items()),
+        tuple(state.ladders.items()),
+        active_ladder,
+        camera.state_key if board_in_backdrop else None,
     )
+    particle_rects = step_background_particles()
 
-    progress = pos_val / TOTAL
-    fill_w = int(bar_w * progress)
-    if fill_w > 0:
-        glow_surf = pygame.Surface((fill_w + 4, bar_h + 4), pygame.SRCALPHA)
-        pygame.draw.rect(
-            glow_surf, (*curr_col, 100), (0, 0, fill_w + 4, bar_h + 4), border_radius=4
-        )
-        screen.blit(glow_surf, (bar_x - 2, bar_y - 2))
-
-        pygame.draw.rect(
-            screen, curr_col, (bar_x, bar_y, fill_w, bar_h), border_radius=2
-        )
+    def draw_static_layers():
+        left_sidebar_visual.draw(screen)
+        if board_in_backdrop:
+            with renderer.board_pass():
+                renderer.draw_board_layer()
+                draw_board_frame()
+                for start, end in renderer.visible(state, "ladder"):
+                    renderer.draw_ladder(start, end, glow=start == active_ladder)
+        renderer.draw_panel(state, sidebar_helper)
+
+    if dirty_renderer.needs_backdrop(board_key):
+        # Dua kali: di atas warna uji lalu di atas BG_COLOR, untuk tahu di mana background tembus
+        screen.fill(dirty_renderer.probe_color)
+        draw_static_layers()
+        dirty_renderer.capture_probe()
+        screen.fill(BG_COLOR)
+        draw_static_layers()
+        dirty_renderer.capture_backdrop(board_key)
+        last_panel_key = panel_key()
+    elif panel_key() != last_panel_key:
+        renderer.draw_panel(state, sidebar_helper)
+        dirty_renderer.refresh_backdrop(PANEL_RECT)
+        last_panel_key = panel_key()
+
+    moving_idx = moving[0] if moving else None
+    visible_snakes = renderer.visible(state, "snake")
+    if board_in_backdrop:
+        pion_rects = [
+            renderer.pion_rect(state, i, (i * 8) - 12)
+            for i in range(len(state.players))
+            if i != moving_idx
+        ]
+        snake_rects = [renderer.snake_rect(s, e) for s, e in visible_snakes]
+        dynamic_rects = renderer.scroll_rects(state) + snake_rects + pion_rects
+        if moving:
+            dynamic_rects.append(moving_pion_rect(*moving))
+        board_clip = renderer.board_clip
+        if board_clip:
+            # Papan lebih besar dari layar: yang di luar bingkai tidak perlu dikirim
+            dynamic_rects = [r.clip(board_clip) for r in dynamic_rects if r.colliderect(board_clip)]
+    else:
+        dynamic_rects = [camera.view.inflate(10, 10)]
+    dynamic_rects += dirty_renderer.draw_underlay(particle_rects)
+    hud_rect = profiler.hud_rect()
+    if hud_rect:
+        dynamic_rects.append(hud_rect)
+    dirty_renderer.begin(dynamic_rects)
+
+    with renderer.board_pass():
+        if not board_in_backdrop:
+            renderer.draw_board_layer()
+            draw_board_frame()
+        renderer.draw_scrolls(state)
+
+        # Tangga ada di backdrop, tapi harus tetap di atas scroll yang melayang
+        for start, end in renderer.visible(state, "ladder"):
+            if not board_in_backdrop or renderer.ladder_rect(start, end).collidelist(dynamic_rects) != -1:
+                renderer.draw_ladder(start, end, glow=start == active_ladder)
+
+        for start, end in visible_snakes:
+            renderer.draw_snake(start, end, glow=start == active_snake)
+
+        for i in range(len(state.players)):
+            if i == moving_idx:
+                continue
+            renderer.draw_pion(state, i, offset=(i * 8) - 12)
+
+        if moving:
+            with profiler.stage("pawns"):
+                draw_moving_pion(*moving)
+
+    dirty_renderer.restore_on_top(PANEL_RECT)
+    hud_rect = profiler.draw_hud(screen, small_font)
+    if hud_rect:
+        dirty_renderer.mark(hud_rect)
+    dirty_renderer.present()
+    profiler.end_frame()
+
+def present_full():
+    """Kirim frame yang digambar penuh ke layar (dengan HUD profiler)"""
+    profiler.draw_hud(screen, small_font)
+    with profiler.stage("flip"):
+        pygame.display.flip()
+    profiler.end_frame()
+    dirty_renderer.invalidate()
+
+def redraw(
+    active_snake: Optional[int] = None,
+    active_ladder: Optional[int] = None,
+    full: bool = False,
+    present: bool = True,
+):
+    """present=False: gambar penuh tanpa flip, pemanggil menambah overlay lalu present_full()"""
+    if DIRTY_RECT_RENDERING and not full and present and state.shake_intensity <= 0.5:
+        redraw_dirty(active_snake, active_ladder)
+        return
 
-def redraw(active_snake: Optional[int] = None, active_ladder: Optional[int] = None):
     shake_x, shake_y = 0, 0
     if state.shake_intensity > 0.5:
-        shake_x = random.randint(
+        shake_x = session_rng.fx.randint(
             -int(state.shake_intensity), int(state.shake_intensity)
         )
-        shake_y = random.randint(
+        shake_y = session_rng.fx.randint(
             -int(state.shake_intensity), int(state.shake_intensity)
         )
         state.shake_intensity *= state.shake_decay
@@ -770,25 +922,21 @@ def redraw(active_snake: Optional[int] = None, active_ladder: Optional[int] = No
     if "left_sidebar_visual" in globals():
         left_sidebar_visual.draw(screen, shake_x, shake_y)
 
-    renderer.draw_board(state)
-
-    board_rect = pygame.Rect(
-        SIDEBAR_LEFT_WIDTH - 5, -5, (COLS * CELL) + 10, (ROWS * CELL) + 10
-    )
-    pygame.draw.rect(screen, (80, 80, 90), board_rect, 6, border_radius=4)
-    pygame.draw.rect(screen, (40, 40, 50), board_rect, 2, border_radius=4)
+    with renderer.board_pass():
+        renderer.draw_board(state)
+        draw_board_frame()
 
-    for start, end in state.ladders.items():
-        is_active = start == active_ladder
-        renderer.draw_ladder(start, end, glow=is_active)
+        for start, end in renderer.visible(state, "ladder"):
+            is_active = start == active_ladder
+            renderer.draw_ladder(start, end, glow=is_active)
 
-    for start, end in state.snakes.items():
-        is_active = start == active_snake
-        renderer.draw_snake(start, end, glow=is_active)
+        for start, end in renderer.visible(state, "snake"):
+            is_active = start == active_snake
+            renderer.draw_snake(start, end, glow=is_active)
 
-    for i in range(len(state.players)):
-        stack_offset = (i * 8) - 12
-        renderer.draw_pion(state, i, offset=stack_offset)
+        for i in range(len(state.players)):
+            stack_offset = (i * 8) - 12
+            renderer.draw_pion(state, i, offset=stack_offset)
 
     renderer.draw_panel(state, sidebar_helper)
 
@@ -797,302 +945,285 @@ def redraw(active_snake: Optional[int] = None, active_ladder: Optional[int] = No
         screen.fill((0, 0, 0))
         screen.blit(current_screen, (shake_x, shake_y))
 
-    pygame.display.flip()
+    if present:
+        present_full()
 
 def redraw_for_animation(moving_idx, anim_x, anim_y, jump_h=0):
+    """anim_x, anim_y: posisi world pion yang berjalan (walk_pose)"""
+    if DIRTY_RECT_RENDERING:
+        redraw_dirty(moving=(moving_idx, anim_x, anim_y, jump_h))
+        return
+
     screen.fill((180, 200, 220))
     draw_background_effects(screen)
     if "left_sidebar_visual" in globals():
         left_sidebar_visual.draw(screen)
 
-    renderer.draw_board(state)
-    board_rect = pygame.Rect(
-        SIDEBAR_LEFT_WIDTH - 5, -5, (COLS * CELL) + 10, (ROWS * CELL) + 10
-    )
-    pygame.draw.rect(screen, (80, 80, 90), board_rect, 6, border_radius=4)
-    pygame.draw.rect(screen, (40, 40, 50), board_rect, 2, border_radius=4)
-
-    for s, e in state.ladders.items():
-        renderer.draw_ladder(s, e)
-    for s, e in state.snakes.items():
-        renderer.draw_snake(s, e)
-
-    for i in range(len(state.players)):
-        if i == moving_idx:
-            continue
-        stack_offset = (i * 8) - 12
-        renderer.draw_pion(state, i, offset=stack_offset)
-
-    stack_offset = (moving_idx * 8) - 12
-
-    render_x = anim_x + stack_offset
-    render_y = anim_y
-
-    shadow_size = max(4, 12 - int(jump_h * 0.15))
-    pygame.draw.circle(
-        screen, (0, 0, 0, 60), (int(render_x), int(anim_y + 18)), shadow_size
-    )
-
-    stretch = 1.0 + (jump_h * 0.015)  # Sedikit lebih melar biar kartunis
-    p_w = int(26 / stretch)
-    p_h = int(26 * stretch)
-
-    visual_y = render_y - jump_h - p_h - 15
-
-    rect = pygame.Rect(render_x - p_w // 2, visual_y, p_w, p_h)
-
-    pygame.draw.ellipse(screen, colors[moving_idx], rect)
-    pygame.draw.ellipse(
-        screen,
-        (255, 255, 255),
-        (rect.x + p_w // 3, rect.y + p_h // 4, p_w // 3, p_h // 4),
-        0,
-    )
-
-    draw_panel()
-    pygame.display.flip()
-
-def animate_dice_roll() -> int:
-    start_ms = pygame.time.get_ticks()
-    last_frame = start_ms
-    face = 1
-    play_sound(dice_roll)
-
-    while True:
-        now = pygame.time.get_ticks()
-        elapsed = now - start_ms
-
-        if now - last_frame >= DICE_FRAME_DELAY:
-            face = random.randint(1, 6)
-            last_frame = now
+    with renderer.board_pass():
+        renderer.draw_board(state)
+        draw_board_frame()
 
-        redraw()
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-        overlay.fill((255, 255, 255, 190))
-        screen.blit(overlay, (0, 0))
+        for s, e in renderer.visible(state, "ladder"):
+            renderer.draw_ladder(s, e)
+        for s, e in renderer.visible(state, "snake"):
+            renderer.draw_snake(s, e)
 
-        dice_rect = dice_images[face].get_rect(center=(WIDTH // 2, HEIGHT // 2 - 20))
-        screen.blit(dice_images[face], dice_rect)
+        for i in range(len(state.players)):
+            if i == moving_idx:
+                continue
+            stack_offset = (i * 8) - 12
+            renderer.draw_pion(state, i, offset=stack_offset)
 
-        label = big_font.render(f"Mengocok...", True, (0, 0, 0))
-        screen.blit(label, label.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60)))
-
-        pygame.display.flip()
-        clock.tick(60)
-
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-
-        if elapsed >= DICE_ANIM_TIME:
-            break
-
-    redraw()
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((255, 255, 255, 100))  # Lebih terang sedikit saat freeze
-    screen.blit(overlay, (0, 0))
-    screen.blit(dice_images[face], dice_rect)
+        with profiler.stage("pawns"):
+            draw_moving_pion(moving_idx, anim_x, anim_y, jump_h)
 
-    final_label = big_font.render(f"Hasil: {face}", True, (0, 0, 0))
-    screen.blit(
-        final_label, final_label.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60))
-    )
-
-    pygame.display.flip()
-
-    pygame.time.delay(700)
-
-    play_sound(dice_end)
-    return face
-
-def animate_move_piece(idx: int, final_target: int):
+    renderer.draw_panel(state, sidebar_helper)
+    present_full()
+
+# ==================================================
+# ANIMASI (timeline dengan langkah simulasi tetap)
+# ==================================================
+# Semua animasi adalah task di `timeline` dan digambar oleh draw_frame()
+# dari loop utama; tidak ada loop animasi sendiri lagi.
+timeline = Timeline(speed=TURBO_SPEEDS[TURBO_MODE])
+anim = {"fade": None, "dice": None, "walk": None}
+turbo_mode = TURBO_MODE
+
+def toggle_turbo() -> str:
+    """Ganti mode turbo ke mode berikutnya di TURBO_SPEEDS; return nama mode baru"""
+    global turbo_mode
+    modes = list(TURBO_SPEEDS)
+    turbo_mode = modes[(modes.index(turbo_mode) + 1) % len(modes)]
+    timeline.speed = TURBO_SPEEDS[turbo_mode]
+    logger.info(f"Turbo mode: {turbo_mode}")
+    return turbo_mode
+
+dice_overlay_roll = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+dice_overlay_roll.fill((255, 255, 255, 190))
+dice_overlay_hold = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+dice_overlay_hold.fill((255, 255, 255, 100))  # Lebih terang sedikit saat freeze
+
+def fade_task(snapshot, alpha_from, alpha_to) -> Tween:
+    """Overlay gelap dari alpha_from ke alpha_to di atas snapshot (None = papan yang hidup)"""
+    tween = Tween(FADE_TIME)
+    anim["fade"] = {"tween": tween, "from": alpha_from, "to": alpha_to, "snapshot": snapshot}
+    return tween
+
+def intro_script(menu_snapshot):
+    """Transisi Menu -> Gelap -> Game Board"""
+    yield fade_task(menu_snapshot, 0, 255)
+    yield fade_task(None, 255, 0)
+    anim["fade"] = None
+
+def dice_task(result: int) -> Script:
+    """Animasi kocok dadu lalu tahan di `result`"""
+    dice = {"face": 1, "frame": 0, "label": "Mengocok...", "overlay": dice_overlay_roll}
+
+    def shuffle(progress):
+        frame = int(progress * DICE_ANIM_TIME) // DICE_FRAME_DELAY
+        if frame != dice["frame"]:
+            dice["frame"] = frame
+            dice["face"] = session_rng.fx.randint(1, 6)
+
+    def run():
+        play_sound(dice_roll)
+        anim["dice"] = dice
+        yield Tween(DICE_ANIM_TIME, shuffle)
+        dice.update(face=result, label=f"Hasil: {result}", overlay=dice_overlay_hold)
+        yield Wait(DICE_HOLD_TIME)
+        anim["dice"] = None
+        play_sound(dice_end)
+
+    return Script(run())
+
+def walk_task(idx: int, final_target: int, start: Optional[int] = None) -> Tween:
     """
-    Visual-only animation loop. Non-blocking.
-    Handles smooth token interpolation to target.
+    Pion berjalan petak demi petak, PAWN_STEP_TIME ms waktu simulasi per petak.
+    start: petak awal animasi jika engine sudah memindahkan pion
     """
     final_target = overflow_reflect(final_target)
-    start_pos = positions[idx]
-
-    total_steps = abs(final_target - start_pos)
+    start_pos = positions[idx] if start is None else start
+    steps = abs(final_target - start_pos)
     direction = 1 if final_target > start_pos else -1
+    walk = {"idx": idx, "start": start_pos, "dir": direction, "steps": steps, "hops": 0}
+
+    def on_step(progress):
+        hop = min(steps - 1, int(progress * steps))
+        if hop >= walk["hops"]:  # Lompatan baru dimulai
+            walk["hops"] = hop + 1
+            if step_sound:
+                step_sound.stop()
+                step_sound.play()
+        positions[idx] = start_pos + direction * int(progress * steps)
+
+    def on_done():
+        positions[idx] = final_target
+        state.pulse_scale[idx] = 1.6
+        anim["walk"] = None
+
+    walk["tween"] = Tween(steps * PAWN_STEP_TIME, on_step, on_done)
+    anim["walk"] = walk
+    return walk["tween"]
+
+def walk_pose(walk, alpha):
+    """(x, y world, tinggi lompatan) pion yang berjalan, diinterpolasi antar langkah simulasi"""
+    if walk["steps"] == 0:
+        x, y = board_world_xy(walk["start"])
+        return x, y, 0
+    p = walk["tween"].value(alpha) * walk["steps"]
+    hop = min(walk["steps"] - 1, int(p))
+    t = p - hop
+    prev_tile = walk["start"] + walk["dir"] * hop
+    start_x, start_y = board_world_xy(prev_tile)
+    end_x, end_y = board_world_xy(prev_tile + walk["dir"])
+    jump_height = math.sin(t * math.pi) * 55
+    return start_x + (end_x - start_x) * t, start_y + (end_y - start_y) * t, jump_height
+
+def update_camera():
+    """Kamera mengikuti pion yang sedang berjalan, atau pion yang mendapat giliran"""
+    walk = anim["walk"]
+    if walk:
+        x, y, _ = walk_pose(walk, timeline.alpha)
+        focus = (x, y)
+    else:
+        focus = renderer.layout.center(state.positions[state.turn])
+    renderer.update_camera(focus)
+
+def draw_frame():
+    """Satu frame loop utama sesuai animasi yang sedang berjalan"""
+    update_camera()
+    fade = anim["fade"]
+    if fade:
+        if fade["snapshot"] is not None:
+            screen.blit(fade["snapshot"], (0, 0))
+        else:
+            redraw(full=True, present=False)
+        t = fade["tween"].value(timeline.alpha)
+        dark_overlay.set_alpha(int(lerp(fade["from"], fade["to"], t)))
+        screen.blit(dark_overlay, (0, 0))
+        present_full()
+        return
 
-    STEP_DURATION = 130
-
-    for i in range(1, total_steps + 1):
-        next_tile = start_pos + (i * direction)
-
-        prev_tile = next_tile - direction
-        start_x, start_y = board_xy(prev_tile)
-        end_x, end_y = board_xy(next_tile)
-
-        if step_sound:
-            step_sound.stop()
-            step_sound.play()
-
-        anim_start = pygame.time.get_ticks()
-
-        while True:
-            now = pygame.time.get_ticks()
-            t = (now - anim_start) / STEP_DURATION
-
-            if t >= 1.0:
-                redraw_for_animation(idx, end_x, end_y, jump_h=0)
-                break
-
-            curr_x = start_x + (end_x - start_x) * t
-            curr_y = start_y + (end_y - start_y) * t
-
-            jump_height = math.sin(t * math.pi) * 55
-
-            redraw_for_animation(idx, curr_x, curr_y, jump_h=jump_height)
-            clock.tick(60)
-
-            for e in pygame.event.get():
-                if e.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
+    dice = anim["dice"]
+    if dice:
+        redraw(full=True, present=False)
+        screen.blit(dice["overlay"], (0, 0))
+        img = dice_images[dice["face"]]
+        screen.blit(img, img.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 20)))
+        label = render_text(big_font, dice["label"], True, (0, 0, 0))
+        screen.blit(label, label.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60)))
+        present_full()
+        return
 
-        positions[idx] = next_tile
+    walk = anim["walk"]
+    if walk:
+        x, y, jump_h = walk_pose(walk, timeline.alpha)
+        redraw_for_animation(walk["idx"], x, y, jump_h=jump_h)
+        return
 
-        pygame.display.flip()
+    redraw()
 
-    state.pulse_scale[idx] = 1.6
-    final_x, final_y = board_xy(final_target)
-    redraw_for_animation(idx, final_x, final_y, jump_h=0)
+def modal_done():
+    """Setelah popup/menu modal: gambar ulang penuh, waktu modal tidak dihitung animasi"""
+    dirty_renderer.invalidate()
+    timeline.resync()
 
-def show_victory_screen(screen, winner_name, winner_color):
+def play_turn(p_config):
     """
-    Theme: Ember Ascension (Particle System).
-    Renders dark background with floating ember particles.
+    Satu giliran: aturan di GameEngine, di sini urutan animasi & popup.
+    Saat replay, dadu dan pilihan kartu diambil dari replay_log (popup tidak tampil).
     """
-    try:
-        title_font = pygame.font.Font(FONT_FILE, 90)
-        sub_font = pygame.font.Font(FONT_FILE, 40)
-        hint_font = pygame.font.Font(FONT_FILE, 16)
-    except:
-        title_font = pygame.font.SysFont("georgia", 80, bold=True)
-        sub_font = pygame.font.SysFont("georgia", 30)
-        hint_font = pygame.font.SysFont("arial", 12)
-
-    embers = []
-    for _ in range(150):
-        embers.append(
-            {
-                "x": random.randint(0, WIDTH),
-                "y": random.randint(0, HEIGHT),
-                "speed": random.uniform(0.5, 2.0),
-                "size": random.randint(2, 4),
-                "alpha": random.randint(50, 255),
-                "drift": random.uniform(-0.5, 0.5),  # Gerakan kiri-kanan angin
-            }
-        )
-
-    clock = pygame.time.Clock()
-    running_victory = True
-
-    pulse_val = 0
-
-    while running_victory:
-        for e in pygame.event.get():
-            if e.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            if e.type == pygame.KEYDOWN or e.type == pygame.MOUSEBUTTONDOWN:
-                running_victory = False
-
-        screen.fill((10, 8, 8))  # Hampir hitam, sedikit merah gelap
-
-        for p in embers:
-            p["y"] -= p["speed"]  # Naik ke atas
-            p["x"] += p["drift"]
-
-            if p["y"] < -10:
-                p["y"] = HEIGHT + 10
-                p["x"] = random.randint(0, WIDTH)
-                p["alpha"] = 255
-
-            if p["alpha"] > 0:
-                p["alpha"] -= 0.5
-
-            s = pygame.Surface((p["size"] * 2, p["size"] * 2), pygame.SRCALPHA)
-
-            col_core = (255, 200, 100, int(p["alpha"]))
-            pygame.draw.circle(s, col_core, (p["size"], p["size"]), p["size"])
-            screen.blit(s, (p["x"], p["y"]))
-
-        center_x, center_y = WIDTH // 2, HEIGHT // 2 - 30
+    global running
+    # Sesi --replay tidak pernah menulis save, juga setelah log habis & giliran dimainkan langsung
+    replaying = replay_log is not None
+    replay = replay_log if replaying and not replay_log.finished else None
+
+    idx = engine.begin_turn()
+    renderer.camera.follow(renderer.layout.center(positions[idx]), force=True)
+    dice = engine.roll_dice(replay.next_dice() if replay else None)
+    if recorder:
+        recorder.record_dice(dice)
+    yield dice_task(dice)
+
+    start, landed = engine.advance(dice)
+    yield walk_task(idx, landed, start=start)
+
+    jump = engine.resolve_jump()
+    if jump:
+        kind, jump_from, jump_to = jump
+        if kind == "snake":
+            message = " Oh no! Snake!"
+        else:
+            message = " Climp Up!"
+        if not replay:
+            with scheduler.busy():
+                popup_manager.show_popup(screen, message, None, p_config)
+            modal_done()
+        yield walk_task(idx, jump_to, start=jump_from)
+
+    record = engine.pending_challenge()
+    if record:
+        while True:
+            if replay:
+                move_effect = "NEXT" if replay.next_choice() == CHOICE_NEXT else None
+            else:
+                with scheduler.busy():
+                    move_effect = popup_manager.show_popup(
+                        screen, record.text, positions[idx], p_config, record=record
+                    )
+                modal_done()
+            if recorder:
+                recorder.record_choice(move_effect == "NEXT")
 
-        pulse = (math.sin(pulse_val) + 1) * 0.5  # 0.0 - 1.0
-        pulse_r = 100 + (pulse * 20)
+            if move_effect == "NEXT":
+                record = engine.skip_challenge()
 
-        aura_surf = pygame.Surface((300, 300), pygame.SRCALPHA)
-        pygame.draw.circle(
-            aura_surf, (100, 10, 10, 50), (150, 150), pulse_r
-        )  # Merah darah transparan
-        screen.blit(aura_surf, (center_x - 150, center_y - 150))
+                try:
+                    shuffle_sound = pygame.mixer.Sound(
+                        os.path.join(BASE_DIR, "sounds", "shuffle.wav")
+                    )
+                    shuffle_sound.play()
+                except:
+                    pass
 
-        cx, cy = center_x, center_y
+                redraw()
+                continue
 
-        hero_base = tuple(min(c + 40, 255) for c in winner_color)
-        lum = (
-            0.299 * winner_color[0] + 0.587 * winner_color[1] + 0.114 * winner_color[2]
-        )
-        is_dark = lum < 90
-        outline_col = (180, 180, 180) if is_dark else (20, 20, 30)  # Silver kusam
-        visor_col = (200, 200, 200) if is_dark else (40, 40, 50)
-
-        pygame.draw.circle(screen, outline_col, (cx, cy + 40), 50)  # Bahu
-        pygame.draw.circle(screen, hero_base, (cx, cy + 40), 45)
-        pygame.draw.circle(screen, outline_col, (cx, cy - 20), 45)  # Kepala
-        pygame.draw.circle(screen, hero_base, (cx, cy - 20), 40)
-
-        pygame.draw.rect(
-            screen, visor_col, (cx - 20, cy - 20, 40, 10), border_radius=2
-        )  # Mata
-        pygame.draw.rect(
-            screen, visor_col, (cx - 6, cy - 20, 12, 35), border_radius=2
-        )  # Hidung
-
-        pulse_val += 0.05
-
-        title_col = (180, 170, 170)
-        title_surf = title_font.render("VICTORY", True, title_col)
-
-        shadow_surf = title_font.render("VICTORY", True, (10, 5, 5))
-        screen.blit(
-            shadow_surf, (center_x - title_surf.get_width() // 2 + 4, center_y + 84)
-        )
-        screen.blit(title_surf, (center_x - title_surf.get_width() // 2, center_y + 80))
+            else:
+                before = positions[idx]
+                _, _, final = engine.accept_challenge()
+                if final != before:
+                    yield walk_task(idx, final, start=before)
 
-        line_w = 200 + (pulse * 50)
-        pygame.draw.line(
-            screen,
-            (150, 50, 50),
-            (center_x - line_w / 2, center_y + 160),
-            (center_x + line_w / 2, center_y + 160),
-            3,
-        )
+                break
 
-        name_text = f"Lord {winner_name} has claimed the throne."
-        name_surf = sub_font.render(name_text, True, (200, 180, 100))  # Emas Kusam
-        screen.blit(name_surf, (center_x - name_surf.get_width() // 2, center_y + 180))
+    if replay:
+        replay.end_turn()
+    if recorder:
+        recorder.end_turn()
 
-        hint_surf = hint_font.render(
-            "[ PRESS ANY KEY TO END THE CHRONICLE ]", True, (80, 80, 80)
-        )
-        screen.blit(hint_surf, (center_x - hint_surf.get_width() // 2, HEIGHT - 40))
+    won = engine.finish_turn()
+    if replaying:
+        pass  # Replay tidak menyentuh save milik sesi yang sedang berjalan
+    elif won:
+        delete_save(SAVE_PATH)  # Game selesai, tidak ada yang dilanjutkan
+    else:
+        save_game(SAVE_PATH, state, engine.deck, engine.winner, engine.turns_played)
 
-        pygame.display.flip()
-        clock.tick(60)
+    if won:
+        show_victory_screen(screen, state.players[idx], colors[idx])
+        running = False
 
 running = True
-redraw()  # Gambar papan game dalam keadaan tertutup layar hitam (karena efek sebelumnya)
-fade_from_dark(screen, dark_overlay, WIDTH, HEIGHT)
+timeline.add(Script(intro_script(menu_snapshot)))
+dirty_renderer.invalidate()
 
 while running:
-    redraw()
-    clock.tick(60)
+    timeline.update()
+    if not running:
+        break
+    draw_frame()
+    scheduler.tick(animating=timeline.busy or state.shake_intensity > 0.5 or renderer.camera.moving)
 
     p_config = {
         "WIDTH": WIDTH,
@@ -1107,143 +1238,73 @@ while running:
         "clock": clock,
         "scroll_truth_img": SCROLL_TRUTH_IMG,  # ← TAMBAH INI
         "scroll_dare_img": SCROLL_DARE_IMG,  # ← TAMBAH INI
+        "preloader": preloader,
+        "popup_resources": popup_resources,
+        "turbo_mode": turbo_mode,
+        "toggle_turbo": toggle_turbo,
     }
 
     for e in pygame.event.get():
+        if e.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL):
+            scheduler.notify_activity()
+
         if e.type == pygame.QUIT:
             running = False
 
-        if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
-            action = show_pause_menu(screen, p_config)
-
-            if action == "RESUME":
-                pass
-            elif action == "MAIN_MENU":
-
-                players, game_level = show_main_menu(screen, p_config)
-
-                state.reset_for_new_game(players, game_level)
-
-                state.snakes, state.ladders = generate_random_objects(TOTAL, 3, 2)
-
-                try:
-                    fname = f"challenges_lv{game_level}.json"
-                    if "resource_path" in globals():
-                        target = resource_path(fname)
-                    else:
-                        target = os.path.join(BASE_DIR, fname)
-
-                    with open(target, encoding="utf-8") as f:
-                        raw_data = json.load(f)
-
-                    CHALLENGE_DECK = ChallengeDeck(raw_data)
-                    state.challenges = distribute_random_challenges(
-                        CHALLENGE_DECK, state.snakes, state.ladders, 40
-                    )
-                except:
-                    state.challenges = {}
-
-                positions = state.positions
-                colors = state.colors
-                bounce_phase = state.bounce_phase
-                pulse_scale = state.pulse_scale
-                snakes = state.snakes
-                ladders = state.ladders
-                challenges = state.challenges
-                log_manager = state.log_manager
-                history = log_manager.history
-                current_turn_log = log_manager.current_turn_log
-
-                redraw()
-
-        if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
-            start_turn(players[state.turn])
-            dice = animate_dice_roll()
-            log_turn(f"Dice: {dice}")
-
-            target = positions[state.turn] + dice
-            animate_move_piece(state.turn, target)
-
-            active_snake = None
-            active_ladder = None
-
-            if positions[state.turn] in snakes:
-                active_snake = positions[state.turn]
-                popup_manager.show_popup(screen, " Oh no! Snake!", None, p_config)
-                positions[state.turn] = snakes[positions[state.turn]]
-                log_turn(": Slid Down Snake")
-                animate_move_piece(state.turn, positions[state.turn])
-
-            elif positions[state.turn] in ladders:
-                active_ladder = positions[state.turn]
-                popup_manager.show_popup(screen, " Climp Up!", None, p_config)
-                positions[state.turn] = ladders[positions[state.turn]]
-                log_turn(": Climbed Ladder")
-                animate_move_piece(state.turn, positions[state.turn])
-
-            text = challenges.get(str(positions[state.turn]), "")
-            if text:
-                while True:
-                    move_effect = popup_manager.show_popup(
-                        screen, text, positions[state.turn], p_config
-                    )
-
-                    if move_effect == "NEXT":
-                        current_type = "truth"  # Default
-                        text_lower = text.lower()
-
-                        if "dare" in text_lower or "tantangan" in text_lower:
-                            current_type = "dare"
-                        elif "truth" in text_lower or "kebenaran" in text_lower:
-                            current_type = "truth"
-
-                        new_card = CHALLENGE_DECK.draw_card(current_type)
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+            profiler.toggle_hud()
 
-                        challenges[str(positions[state.turn])] = new_card
-                        text = new_card
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_F4:
+            profiler.toggle_export(os.path.join(
+                BASE_DIR, PROFILER_EXPORT_DIR, time.strftime("frame_profile_%Y%m%d_%H%M%S.jsonl")
+            ))
 
-                        try:
-                            shuffle_sound = pygame.mixer.Sound(
-                                os.path.join(BASE_DIR, "sounds", "shuffle.wav")
-                            )
-                            shuffle_sound.play()
-                        except:
-                            pass
+        # Kamera: panah = geser, +/- atau roda mouse = zoom, C = ikuti pion lagi
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN):
+            dx = (e.key == pygame.K_RIGHT) - (e.key == pygame.K_LEFT)
+            dy = (e.key == pygame.K_DOWN) - (e.key == pygame.K_UP)
+            renderer.camera.pan(dx * CAMERA_PAN_STEP, dy * CAMERA_PAN_STEP)
 
-                        redraw()
-                        continue
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            renderer.camera.zoom_by(CAMERA_ZOOM_STEP)
 
-                    else:
-                        log_turn(text)
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            renderer.camera.zoom_by(1 / CAMERA_ZOOM_STEP)
 
-                        current_type = "truth"
-                        text_lower = text.lower()
+        if e.type == pygame.MOUSEWHEEL and renderer.camera.view.collidepoint(pygame.mouse.get_pos()):
+            renderer.camera.zoom_by(CAMERA_ZOOM_STEP ** e.y, pygame.mouse.get_pos())
 
-                        if "dare" in text_lower or "tantangan" in text_lower:
-                            current_type = "dare"
-                        elif "truth" in text_lower or "kebenaran" in text_lower:
-                            current_type = "truth"
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_c:
+            renderer.camera.recenter(renderer.layout.center(state.positions[state.turn]))
 
-                        new_card = CHALLENGE_DECK.draw_card(current_type)
+        # Selama animasi berjalan, SPACE/ESC melewati animasi yang sedang tampil
+        if e.type == pygame.KEYDOWN and e.key in (pygame.K_SPACE, pygame.K_ESCAPE) and timeline.busy:
+            timeline.skip()
+            continue
 
-                        challenges[str(positions[state.turn])] = new_card
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_ESCAPE:
+            with scheduler.busy():
+                action = show_pause_menu(screen, p_config)
+            modal_done()
 
-                        if move_effect != 0:
-                            new_target = max(
-                                1, min(TOTAL, positions[state.turn] + move_effect)
-                            )
-                            animate_move_piece(state.turn, new_target)
-                            positions[state.turn] = new_target
+            if action == "RESUME":
+                pass
+            elif action == "MAIN_MENU":
 
-                        break
+                players, game_level = show_main_menu(screen, p_config)
+                start_session(players, game_level)
+                dirty_renderer.invalidate()
 
-            if positions[state.turn] == TOTAL:
-                show_victory_screen(screen, players[state.turn], colors[state.turn])
-                running = False
+                redraw()
 
-            end_turn()
-            state.turn = (state.turn + 1) % len(players)
+        if e.type == pygame.KEYDOWN and e.key == pygame.K_SPACE:
+            timeline.add(Script(play_turn(p_config)))
 
-            pygame.event.clear()  # 1. Clear event queue to prevent input buffering.
+    # Replay: giliran berikutnya dimulai sendiri setelah animasi sebelumnya selesai
+    if replay_log and not replay_log.finished and not timeline.busy and running:
+        timeline.add(Script(play_turn(p_config)))
 
+profiler.stop_export()
+if recorder:
+    recorder.close()
 pygame.quit()
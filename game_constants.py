@@ -13,13 +13,56 @@ CELL = 70
 SIDEBAR_LEFT_WIDTH = 270  # <--- Ruang untuk Gambar Naga/Tema (Kiri)
 SIDEBAR_WIDTH = 300       # Ruang untuk Log/History (Kanan)
 
+# [BARU] Area papan di layar (dalam kotak). Papan yang lebih besar (maraton, mis.
+# COLS = ROWS = 20, TOTAL = 400) dilihat lewat kamera yang mengikuti pion aktif
+VIEW_COLS = min(COLS, 10)
+VIEW_ROWS = min(ROWS, 10)
+
 # Lebar Total = Kiri + Papan + Kanan
-WIDTH = SIDEBAR_LEFT_WIDTH + (COLS * CELL) + SIDEBAR_WIDTH 
-HEIGHT = ROWS * CELL
+WIDTH = SIDEBAR_LEFT_WIDTH + (VIEW_COLS * CELL) + SIDEBAR_WIDTH 
+HEIGHT = VIEW_ROWS * CELL
+
+# [BARU] Kamera papan: batas zoom, waktu kejar pion aktif (ms), langkah pan (px)
+CAMERA_ZOOM_MIN = 0.5
+CAMERA_ZOOM_MAX = 2.0
+CAMERA_ZOOM_STEP = 1.25
+CAMERA_FOLLOW_MS = 180
+CAMERA_PAN_STEP = CELL
+
+# [BARU] Layer papan statis dipotong per BOARD_CHUNK_TILES x BOARD_CHUNK_TILES kotak, maks. BOARD_CHUNK_CACHE di memori
+BOARD_CHUNK_TILES = 5
+BOARD_CHUNK_CACHE = 64
+
+# [BARU] Target rata-rata giliran per pion (None = papan acak biasa)
+BOARD_TARGET_TURNS = None
+
+# [BARU] Hanya kirim area yang berubah ke layar (pygame.display.update(rects))
+DIRTY_RECT_RENDERING = True
+
+# [BARU] Frame rate: penuh saat ada animasi, rendah saat menunggu input
+ACTIVE_FPS = 60
+IDLE_FPS = 15
+IDLE_AFTER_MS = 3000
+
+# [BARU] Jumlah frame fase goyangan ular yang dihitung di awal (per putaran)
+SNAKE_PHASE_FRAMES = 128
+
+# [BARU] Batas jumlah surface teks yang disimpan di cache LRU
+TEXT_CACHE_SIZE = 512
 
 ANIM_STEP_DELAY = 120
 DICE_ANIM_TIME = 900
 DICE_FRAME_DELAY = 60
+DICE_HOLD_TIME = 700
+PAWN_STEP_TIME = 130
+FADE_TIME = 1500
+
+# [BARU] Langkah simulasi animasi tetap (ms), tidak tergantung frame rate render
+ANIMATION_STEP_MS = 1000 / 120
+
+# [BARU] Mode turbo animasi (dadu, jalan pion, fade): kelipatan kecepatan, None = langsung selesai
+TURBO_SPEEDS = {"OFF": 1.0, "FAST": 3.0, "SKIP": None}
+TURBO_MODE = "OFF"
 BOUNCE_SPEED = 0.6
 
 # ==================================================
@@ -58,3 +101,33 @@ TILE_ODD = {
     'crack': (160, 160, 165)
 }
 
+
+# [BARU] Decode gambar & suara di thread latar sejak start, menu tampil tanpa menunggu
+ASSET_PRELOAD = True
+
+# [BARU] Folder cache piksel gambar yang sudah di-scale (None = matikan)
+ASSET_CACHE_DIR = "cache"
+
+# [BARU] Atlas sprite (modules/sprite_atlas.py): ikon, scroll, dadu & avatar dalam beberapa halaman besar
+ATLAS_PAGE_SIZE = 1024   # Lebar/tinggi maksimal satu halaman (px)
+ATLAS_PADDING = 1        # Jarak antar sprite di halaman (px)
+
+# [BARU] Autosave setiap akhir giliran (format biner di modules/save_game.py)
+SAVE_DIR = "saves"
+SAVE_FILE = "autosave.sav"
+
+# [BARU] Rekam seed + dadu + pilihan kartu tiap sesi (modules/replay.py), None = tidak merekam
+REPLAY_DIR = "replays"
+
+# [BARU] Server multi-meja (modules/game_server.py): banyak sesi dalam satu proses
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+SERVER_MAX_TABLES = 10000
+SERVER_TABLE_IDLE = 1800  # Detik tanpa permintaan sebelum meja ditutup (juga game yang sudah selesai)
+
+# [BARU] Jumlah bara api di layar kemenangan
+VICTORY_EMBERS = 400
+
+# [BARU] Profiler frame: F3 = HUD, F4 = rekam ke logs/frame_profile_*.jsonl
+PROFILER_WINDOW = 240
+PROFILER_EXPORT_DIR = "logs"
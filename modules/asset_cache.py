@@ -0,0 +1,95 @@
+import os
+import sys
+import mmap
+import glob
+import struct
+import hashlib
+from typing import Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from modules.game_logger import logger
+
+MAGIC = b"SLC1"
+HEADER = struct.Struct("<4sII")  # magic, width, height
+BYTES_PER_PIXEL = 4
+
+
+def pixel_format(alpha: bool) -> str:
+    return "RGBA" if alpha else "RGBX"
+
+
+class AssetDiskCache:
+    """
+    Scaled image pixels stored on disk as raw RGBA/RGBX, one file per
+    (image, size, format).
+
+    File name = <hash of path, size, format>-<hash of mtime and file size>.rgba,
+    so editing an asset changes the second half and the old entry is a miss
+    (and is deleted when the new one is written). Hits are memory-mapped and
+    wrapped with pygame.image.frombuffer and converted to display format
+    straight from the mapping, which is closed right after.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+
+    def _names(self, source: str, size: Tuple[int, int], alpha: bool) -> Tuple[str, str]:
+        stat = os.stat(source)
+        key = f"{os.path.abspath(source)}|{tuple(size)}|{pixel_format(alpha)}"
+        entry = hashlib.sha1(key.encode()).hexdigest()[:16]
+        version = hashlib.sha1(f"{stat.st_mtime_ns}|{stat.st_size}".encode()).hexdigest()[:12]
+        return entry, os.path.join(self.cache_dir, f"{entry}-{version}.rgba")
+
+    def has(self, source: str, size: Optional[Tuple[int, int]], alpha: bool = True) -> bool:
+        if not size or not os.path.exists(source):
+            return False
+        return os.path.exists(self._names(source, size, alpha)[1])
+
+    def load(self, source: str, size: Tuple[int, int], alpha: bool = True) -> Optional[pygame.Surface]:
+        """Cached pixels as a display-format surface, or None on a miss"""
+        try:
+            _, path = self._names(source, size, alpha)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic, w, h = HEADER.unpack_from(mm)
+                if magic != MAGIC or (w, h) != tuple(size) or len(mm) != HEADER.size + w * h * BYTES_PER_PIXEL:
+                    raise ValueError("corrupt cache entry")
+                view = memoryview(mm)[HEADER.size:]
+                try:
+                    mapped = pygame.image.frombuffer(view, (w, h), pixel_format(alpha))
+                    surf = mapped.convert_alpha() if alpha else mapped.convert()
+                    del mapped
+                finally:
+                    view.release()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Asset cache entry for {source} unusable: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return surf
+
+    def store(self, source: str, size: Tuple[int, int], surface: pygame.Surface,
+              alpha: bool = True) -> None:
+        """Write the scaled surface; failures only cost the next startup a decode"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entry, path = self._names(source, size, alpha)
+            w, h = surface.get_size()
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(MAGIC, w, h))
+                f.write(pygame.image.tobytes(surface, pixel_format(alpha)))
+            os.replace(tmp, path)
+
+            for stale in glob.glob(os.path.join(self.cache_dir, f"{entry}-*.rgba")):
+                if stale != path:
+                    os.remove(stale)
+        except OSError as e:
+            logger.warning(f"Could not write asset cache for {source}: {e}")
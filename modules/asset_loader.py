@@ -11,15 +11,20 @@ from modules.game_logger import logger
 class AssetLoader:
     """Centralized asset handler with error logging and caching"""
     
-    def __init__(self, base_dir: str) -> None:
+    def __init__(self, base_dir: str, preloader: Optional[Any] = None,
+                 disk_cache: Optional[Any] = None) -> None:
         self.base_dir = Path(base_dir)
-        self._cache: Dict[Tuple[str, Optional[Tuple[int, int]]], pygame.Surface] = {}
+        self.preloader = preloader
+        self.disk_cache = disk_cache
+        self._cache: Dict[Tuple[str, Optional[Tuple[int, int]], bool], pygame.Surface] = {}
         
-    def load_image(self, path: str, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
+    def load_image(self, path: str, size: Optional[Tuple[int, int]] = None,
+                   alpha: bool = True) -> pygame.Surface:
         """
         Load an image safely by relative path. Returns placeholder if fails.
+        alpha=False converts to the opaque display format (backgrounds).
         """
-        key = (path, size)
+        key = (path, size, alpha)
         if key in self._cache:
             return self._cache[key]
             
@@ -28,10 +33,20 @@ class AssetLoader:
             if not full_path.exists():
                 raise FileNotFoundError(f"File not found: {full_path}")
                 
-            img = pygame.image.load(str(full_path)).convert_alpha()
-            if size:
-                img = pygame.transform.smoothscale(img, size)
-                
+            img = None
+            if size and self.disk_cache:
+                img = self.disk_cache.load(str(full_path), size, alpha)
+
+            if img is None:
+                # Decode-nya bisa sudah dikerjakan AssetPreloader di thread lain
+                load = self.preloader.load if self.preloader else pygame.image.load
+                raw = load(str(full_path))
+                img = raw.convert_alpha() if alpha else raw.convert()
+                if size:
+                    img = pygame.transform.smoothscale(img, size)
+                    if self.disk_cache:
+                        self.disk_cache.store(str(full_path), size, img, alpha)
+
             self._cache[key] = img
             logger.info(f"Loaded asset: {path}")
             return img
@@ -40,6 +55,10 @@ class AssetLoader:
             logger.error(f"Failed to load image {path}: {e}")
             return self._create_placeholder(size if size else (64, 64))
 
+    def clear_cache(self) -> None:
+        """Forget loaded images (e.g. once they have been copied into a sprite atlas)"""
+        self._cache.clear()
+
     def _create_placeholder(self, size: Tuple[int, int]) -> pygame.Surface:
         surf = pygame.Surface(size, pygame.SRCALPHA)
         surf.fill((255, 0, 255, 128)) # Magenta transparent for visibility
@@ -59,7 +78,9 @@ class AssetLoader:
     def load_sound(self, path: str) -> Optional[pygame.mixer.Sound]:
         full_path = self.base_dir / path
         try:
-             s = pygame.mixer.Sound(str(full_path))
+             s = self.preloader.sound(str(full_path)) if self.preloader else pygame.mixer.Sound(str(full_path))
+             if s is None:
+                 raise FileNotFoundError(f"File not found: {full_path}")
              logger.info(f"Loaded sound: {path}")
              return s
         except Exception as e:
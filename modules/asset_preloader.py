@@ -0,0 +1,141 @@
+import os
+import sys
+import threading
+from io import BytesIO
+from typing import Dict, Iterable, List, Optional, Tuple, Any
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from modules.game_logger import logger
+
+SOUND_EXTENSIONS = (".wav", ".ogg")
+
+
+class AssetPreloader:
+    """
+    Decodes image files and reads sound files on a background thread.
+
+    Call start() right after pygame.init(), before the window and the menu.
+    Worker results are raw surfaces (no display format) and sound bytes;
+    convert/convert_alpha, smoothscale and mixer.Sound creation happen on
+    the main thread when the asset is asked for. Asking for something the
+    worker has not reached yet waits for it; unknown paths load inline.
+    """
+
+    def __init__(self, base_dir: str) -> None:
+        self.base_dir = base_dir
+        self.queue: List[str] = []
+        self.raw: Dict[str, Any] = {}
+        self.errors: Dict[str, Exception] = {}
+        self.done_events: Dict[str, threading.Event] = {}
+        self.surfaces: Dict[Tuple[str, Optional[Tuple[int, int]], bool], pygame.Surface] = {}
+        self.sounds: Dict[str, Optional[pygame.mixer.Sound]] = {}
+        self.lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+        self.next_index = 0
+        self.completed = 0
+
+    def _abs(self, path: str) -> str:
+        return os.path.normpath(os.path.join(self.base_dir, path))
+
+    def start(self, paths: Iterable[str]) -> None:
+        """Queue files (relative to base_dir or absolute) in priority order and start the worker"""
+        with self.lock:
+            for path in paths:
+                full = self._abs(path)
+                if full in self.done_events or not os.path.exists(full):
+                    continue
+                self.done_events[full] = threading.Event()
+                self.queue.append(full)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name="asset-preloader", daemon=True)
+                self.thread.start()
+
+    def _worker(self) -> None:
+        while True:
+            with self.lock:
+                if self.next_index >= len(self.queue):
+                    self.thread = None
+                    return
+                full = self.queue[self.next_index]
+                self.next_index += 1
+
+            try:
+                if full.lower().endswith(SOUND_EXTENSIONS):
+                    with open(full, "rb") as f:
+                        self.raw[full] = f.read()
+                else:
+                    # image.load releases the GIL while decoding
+                    self.raw[full] = pygame.image.load(full)
+            except Exception as e:
+                self.errors[full] = e
+            self.completed += 1
+            self.done_events[full].set()
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+    def progress(self, paths: Optional[Iterable[str]] = None) -> Tuple[int, int]:
+        """(done, total) for the given paths, or for everything queued"""
+        if paths is None:
+            return self.completed, len(self.done_events)
+        events = [self.done_events.get(self._abs(p)) for p in paths]
+        events = [e for e in events if e is not None]
+        return sum(1 for e in events if e.is_set()), len(events)
+
+    def ready(self, path: str) -> bool:
+        event = self.done_events.get(self._abs(path))
+        return event is None or event.is_set()
+
+    # ------------------------------------------------------------------
+    # Main-thread accessors
+    # ------------------------------------------------------------------
+    def load(self, path: str) -> pygame.Surface:
+        """Drop-in for pygame.image.load: raw decoded surface, waiting for the worker if needed"""
+        full = self._abs(path)
+        event = self.done_events.get(full)
+        if event is None:
+            return pygame.image.load(full)
+        event.wait()
+        if full in self.errors:
+            raise self.errors[full]
+        return self.raw[full]
+
+    def surface(self, path: str, size: Optional[Tuple[int, int]] = None,
+                alpha: bool = True) -> Optional[pygame.Surface]:
+        """Display-format (and optionally scaled) surface, cached; None if the file can't be loaded"""
+        key = (self._abs(path), size, alpha)
+        if key in self.surfaces:
+            return self.surfaces[key]
+        try:
+            raw = self.load(path)
+        except Exception as e:
+            logger.error(f"Failed to load image {path}: {e}")
+            return None
+        surf = raw.convert_alpha() if alpha else raw.convert()
+        if size:
+            surf = pygame.transform.smoothscale(surf, size)
+        self.surfaces[key] = surf
+        return surf
+
+    def sound(self, path: str) -> Optional[pygame.mixer.Sound]:
+        """mixer.Sound built from the preloaded bytes; None if missing or the mixer is off"""
+        full = self._abs(path)
+        if full in self.sounds:
+            return self.sounds[full]
+        snd = None
+        try:
+            event = self.done_events.get(full)
+            if event is None:
+                snd = pygame.mixer.Sound(full)
+            else:
+                event.wait()
+                if full in self.errors:
+                    raise self.errors[full]
+                snd = pygame.mixer.Sound(file=BytesIO(self.raw[full]))
+        except Exception as e:
+            logger.warning(f"Failed to load sound {path}: {e}")
+        self.sounds[full] = snd
+        return snd
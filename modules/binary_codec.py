@@ -0,0 +1,70 @@
+"""
+Kodek Biner - Bilangan bulat panjang-variabel untuk save_game & state_sync
+
+Setiap bilangan >= 0 ditulis sebagai varint (LEB128 tanpa tanda): 7 bit
+per byte, bit tertinggi = masih ada byte berikutnya. Kotak papan dan ID
+kartu kecil cukup 1-2 byte, tetapi tidak ada batas 65535 seperti uint16.
+
+Kartu yang boleh kosong (kotak tanpa kartu, kartu dihapus dari papan)
+ditulis sebagai ID + 1; 0 berarti NO_CARD. Sentinel ini di luar rentang
+ID, jadi tidak ada ID sah yang terpakai untuknya.
+"""
+from typing import Iterable, List, Optional, Tuple
+
+NO_CARD = -1  # Tidak ada kartu (ditulis sebagai 0)
+
+
+def pack_varint(value: int) -> bytes:
+    if value < 0:
+        raise ValueError(f"varint cannot hold negative value {value}")
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def unpack_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """(nilai, offset sesudahnya); ValueError jika data habis di tengah bilangan"""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("varint runs past the end of the data")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+        if shift > 63:
+            raise ValueError("varint is too long")
+
+
+def pack_uints(values: Iterable[int]) -> bytes:
+    """Jumlah + setiap nilai, semuanya varint"""
+    values = list(values)
+    return pack_varint(len(values)) + b"".join(pack_varint(v) for v in values)
+
+
+def unpack_uints(data: bytes, offset: int) -> Tuple[List[int], int]:
+    count, offset = unpack_varint(data, offset)
+    if count > len(data) - offset:
+        raise ValueError("list is longer than the data left")
+    values = []
+    for _ in range(count):
+        value, offset = unpack_varint(data, offset)
+        values.append(value)
+    return values, offset
+
+
+def pack_cards(values: Iterable[Optional[int]]) -> bytes:
+    """Seperti pack_uints untuk ID kartu yang boleh NO_CARD (atau None)"""
+    return pack_uints(0 if v is None or v == NO_CARD else v + 1 for v in values)
+
+
+def unpack_cards(data: bytes, offset: int) -> Tuple[List[int], int]:
+    """Kebalikan pack_cards; kartu kosong kembali sebagai NO_CARD"""
+    values, offset = unpack_uints(data, offset)
+    return [v - 1 if v else NO_CARD for v in values], offset
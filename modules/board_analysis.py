@@ -0,0 +1,204 @@
+"""
+Analisis Papan - Solver Markov-chain eksak untuk panjang game dan peluang menang
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from typing import Dict, List, Optional, Any
+import numpy as np
+
+from game_constants import TOTAL
+from modules.challenge_index import get_record
+from modules.game_utils import overflow_reflect
+
+DICE_SIDES = 6
+MAX_TURNS = 10000
+TAIL_TOLERANCE = 1e-12
+
+
+def challenge_effects(challenges: Optional[Dict[str, Any]]) -> Dict[int, int]:
+    """Map tile -> maju/mundur steps for every challenge tile that moves the pawn"""
+    effects = {}
+    for tile, value in (challenges or {}).items():
+        record = get_record(value)
+        if record and record.effect:
+            effects[int(tile)] = record.effect
+    return effects
+
+
+def resolve_landing(tile: int, snakes: Dict[int, int], ladders: Dict[int, int],
+                    effects: Dict[int, int], total: int = TOTAL) -> int:
+    """
+    Apply the board after the pawn has landed on `tile`.
+
+    Same order as the SPACE handler in game.py: snake or ladder jump first,
+    then the move effect of the challenge on the tile the pawn ends up on.
+    """
+    if tile in snakes:
+        tile = snakes[tile]
+    elif tile in ladders:
+        tile = ladders[tile]
+
+    steps = effects.get(tile, 0)
+    if steps:
+        tile = max(1, min(total, tile + steps))
+    return tile
+
+
+def transition_table(snakes: Dict[int, int], ladders: Dict[int, int],
+                     challenges: Optional[Dict[str, Any]] = None,
+                     total: int = TOTAL, dice_sides: int = DICE_SIDES) -> np.ndarray:
+    """
+    Build the tile-indexed destination table of one turn.
+
+    Returns an int array of shape (total + 1, dice_sides) where
+    `table[tile, face - 1]` is the tile the pawn ends the turn on.
+    Row 0 is unused and the finish tile is absorbing.
+    """
+    effects = challenge_effects(challenges)
+    table = np.zeros((total + 1, dice_sides), dtype=np.int32)
+
+    for tile in range(1, total):
+        for face in range(1, dice_sides + 1):
+            landed = overflow_reflect(tile + face, total)
+            table[tile, face - 1] = resolve_landing(landed, snakes, ladders, effects, total)
+
+    table[total, :] = total
+    return table
+
+
+def transition_matrix(table: np.ndarray) -> np.ndarray:
+    """Dense row-stochastic matrix (tile-indexed, row 0 unused) from a transition table"""
+    size, dice_sides = table.shape
+    matrix = np.zeros((size, size))
+    rows = np.repeat(np.arange(size), dice_sides)
+    np.add.at(matrix, (rows, table.ravel()), 1.0 / dice_sides)
+    matrix[0, :] = 0.0
+    return matrix
+
+
+def expected_turns_from(table: np.ndarray) -> np.ndarray:
+    """
+    Expected number of turns to reach the finish from every tile.
+
+    Solves (I - Q) x = 1 over the transient tiles. Tiles that can never
+    reach the finish get `inf`.
+    """
+    total = table.shape[0] - 1
+    matrix = transition_matrix(table)
+    transient = slice(1, total)
+    q = matrix[transient, transient]
+
+    result = np.zeros(total + 1)
+    try:
+        result[transient] = np.linalg.solve(np.eye(total - 1) - q, np.ones(total - 1))
+    except np.linalg.LinAlgError:
+        result[transient] = np.inf
+    result[0] = np.nan
+    return result
+
+
+def finish_distribution(table: np.ndarray, start: int = 1,
+                        max_turns: int = MAX_TURNS, tol: float = TAIL_TOLERANCE) -> np.ndarray:
+    """
+    Exact distribution of the turn on which a single pawn reaches the finish.
+
+    `pmf[t]` is the probability of finishing on exactly turn t (pmf[0] == 0).
+    Propagation stops once the unfinished mass drops below `tol`.
+    """
+    size, dice_sides = table.shape
+    total = size - 1
+    flat_dest = table.ravel()
+
+    dist = np.zeros(size)
+    dist[start] = 1.0
+    pmf = [0.0]
+
+    for _ in range(max_turns):
+        moving = dist.copy()
+        moving[total] = 0.0
+        step = np.bincount(flat_dest, weights=np.repeat(moving, dice_sides) / dice_sides,
+                           minlength=size)
+        pmf.append(step[total])
+        step[total] = 0.0
+        dist = step
+        if dist.sum() < tol:
+            break
+
+    return np.array(pmf)
+
+
+def seat_win_distribution(pmf: np.ndarray, num_players: int) -> List[np.ndarray]:
+    """
+    Per-seat distribution of winning on each round.
+
+    Pawns move independently and take turns in seat order, so seat k wins on
+    round t if it finishes on its t-th turn while every earlier seat needs
+    more than t turns and every later seat more than t - 1.
+    """
+    survival = np.clip(1.0 - np.cumsum(pmf), 0.0, 1.0)
+    survival_prev = np.concatenate(([1.0], survival[:-1]))
+    return [
+        pmf * survival ** seat * survival_prev ** (num_players - 1 - seat)
+        for seat in range(num_players)
+    ]
+
+
+def win_probabilities(pmf: np.ndarray, num_players: int) -> List[float]:
+    """Per-seat probability of winning the game"""
+    return [float(p.sum()) for p in seat_win_distribution(pmf, num_players)]
+
+
+def game_length_distribution(pmf: np.ndarray, num_players: int) -> np.ndarray:
+    """Distribution of the number of rounds until the first pawn finishes"""
+    survival = np.clip(1.0 - np.cumsum(pmf), 0.0, 1.0)
+    survival_prev = np.concatenate(([1.0], survival[:-1]))
+    return survival_prev ** num_players - survival ** num_players
+
+
+def analyze_board(snakes: Dict[int, int], ladders: Dict[int, int],
+                  challenges: Optional[Dict[str, Any]] = None,
+                  num_players: int = 2, total: int = TOTAL,
+                  dice_sides: int = DICE_SIDES) -> Dict[str, Any]:
+    """
+    Headless summary of how a board plays.
+
+    Args:
+        snakes: Head -> tail mapping (`state.snakes`)
+        ladders: Base -> top mapping (`state.ladders`)
+        challenges: Tile -> challenge record ID (`state.challenges`) or
+            text; the card currently on each tile decides its maju/mundur effect
+        num_players: Number of seats taking turns
+        total: Finish tile
+
+    Returns:
+        Dict with the single-pawn turn distribution, expected turns,
+        per-seat win probabilities and the expected game length.
+    """
+    table = transition_table(snakes, ladders, challenges, total, dice_sides)
+    expected = expected_turns_from(table)
+    pmf = finish_distribution(table)
+    rounds = game_length_distribution(pmf, num_players)
+    seat_wins = seat_win_distribution(pmf, num_players)
+
+    turns = np.arange(len(pmf))
+    cdf = np.cumsum(pmf)
+
+    # Total player-turns played when seat k wins on round t: (t - 1) * n + k + 1
+    expected_moves = sum(
+        float((p * ((turns - 1) * num_players + seat + 1)).sum())
+        for seat, p in enumerate(seat_wins)
+    )
+
+    return {
+        "turn_distribution": pmf,
+        "expected_turns": float(expected[1]),
+        "median_turns": int(np.searchsorted(cdf, 0.5) if cdf[-1] >= 0.5 else len(pmf)),
+        "unfinished_mass": float(max(0.0, 1.0 - cdf[-1])),
+        "win_probabilities": [float(p.sum()) for p in seat_wins],
+        "round_distribution": rounds,
+        "expected_rounds": float((rounds * turns).sum()),
+        "expected_total_turns": expected_moves,
+    }
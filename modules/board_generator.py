@@ -1,14 +1,23 @@
 import random
+import os
+import sys
+import time
+import numpy as np
 
-def generate_random_objects(total_cells, num_snakes=6, num_ladders=6):
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from modules.game_utils import overflow_reflect
+from modules.game_logger import logger
+
+def generate_random_objects(total_cells, num_snakes=6, num_ladders=6, rng=None):
+    rng = rng or random
     snakes = {}
     ladders = {}
     used_cells = {1, total_cells} # Jangan ada objek di start (1) dan finish (70)
 
     def get_valid_pos(is_snake):
         for _ in range(100):
-            start = random.randint(5, total_cells - 5)
-            end = random.randint(5, total_cells - 5)
+            start = rng.randint(5, total_cells - 5)
+            end = rng.randint(5, total_cells - 5)
             
             if abs(start - end) < 10: continue
             
@@ -32,4 +41,231 @@ def generate_random_objects(total_cells, num_snakes=6, num_ladders=6):
             snakes[s] = e
             used_cells.update([s, e])
 
-    return snakes, ladders
\ No newline at end of file
+    return snakes, ladders
+
+
+class _ExpectedTurnsModel:
+    """
+    Expected turns from tile 1 while the board's jump destinations change.
+
+    Keeps M = (I - Q)^-1 over the transient tiles. Changing where one landing
+    tile sends the pawn is a rank-1 change of I - Q, so a proposal of one or
+    two such changes is scored from a few entries of M (Woodbury identity)
+    and only accepted proposals pay the O(n^2) update of M.
+    """
+
+    REFRESH_EVERY = 64
+
+    def __init__(self, total_cells, dest, dice_sides=6):
+        self.total = total_cells
+        self.dest = dest
+
+        # landing[a] = (transient rows, weights) of the rolls that land on a
+        rows = {}
+        for tile in range(1, total_cells):
+            for face in range(1, dice_sides + 1):
+                landed = overflow_reflect(tile + face, total_cells)
+                row = rows.setdefault(landed, {})
+                row[tile - 1] = row.get(tile - 1, 0.0) + 1.0 / dice_sides
+        self.landing = {
+            a: (np.array(list(r.keys())), np.array(list(r.values())))
+            for a, r in rows.items()
+        }
+        self.refresh()
+
+    def refresh(self):
+        """Recompute M from scratch (also clears accumulated rounding)"""
+        a = np.eye(self.total - 1)
+        for landed, (idx, w) in self.landing.items():
+            final = self.dest[landed]
+            if final != self.total:
+                a[idx, final - 1] -= w
+        self.inv = np.linalg.inv(a)
+        self.expected = self.inv.sum(axis=1)
+        self.updates = 0
+
+    @property
+    def value(self):
+        return float(self.expected[0])
+
+    def _selectors(self, changes):
+        """Row indices (old final, new final) of each change; the finish tile has no row"""
+        sels = []
+        for landed, new_final in changes:
+            old_final = self.dest[landed]
+            sels.append((old_final - 1 if old_final != self.total else None,
+                         new_final - 1 if new_final != self.total else None))
+        return sels
+
+    def _v_rows(self, sel, matrix):
+        old, new = sel
+        out = 0.0
+        if old is not None:
+            out = out + matrix[old]
+        if new is not None:
+            out = out - matrix[new]
+        return out
+
+    def _capacitance(self, changes, sels):
+        k = len(changes)
+        cap = np.eye(k)
+        for j, (landed, _) in enumerate(changes):
+            idx, w = self.landing[landed]
+            for i, sel in enumerate(sels):
+                cap[i, j] += float(self._v_rows(sel, self.inv[:, idx]) @ w) if sel != (None, None) else 0.0
+        return cap
+
+    def score(self, changes):
+        """Expected turns from tile 1 if `changes` [(landing tile, new final)] were applied"""
+        sels = self._selectors(changes)
+        cap = self._capacitance(changes, sels)
+        vt_e = np.array([self._v_rows(sel, self.expected) for sel in sels], dtype=float)
+        mu_start = np.array([float(self.inv[0, self.landing[a][0]] @ self.landing[a][1])
+                             for a, _ in changes])
+        try:
+            return self.value - float(mu_start @ np.linalg.solve(cap, vt_e))
+        except np.linalg.LinAlgError:
+            return float("inf")
+
+    def apply(self, changes):
+        sels = self._selectors(changes)
+        cap = self._capacitance(changes, sels)
+
+        m = self.total - 1
+        mu = np.empty((m, len(changes)))
+        for j, (landed, _) in enumerate(changes):
+            idx, w = self.landing[landed]
+            mu[:, j] = self.inv[:, idx] @ w
+        vt_m = np.array([np.broadcast_to(self._v_rows(sel, self.inv), (m,)) for sel in sels])
+
+        self.inv -= mu @ np.linalg.solve(cap, vt_m)
+        for landed, new_final in changes:
+            self.dest[landed] = new_final
+
+        self.updates += 1
+        if self.updates >= self.REFRESH_EVERY:
+            self.refresh()
+        else:
+            self.expected = self.inv.sum(axis=1)
+
+
+def generate_constrained_objects(total_cells, target_turns, num_snakes=6, num_ladders=6,
+                                 tolerance=0.5, max_snake_drop=None, max_ladder_climb=None,
+                                 min_ladder_spacing=0, min_length=10, seed=None, time_budget=0.5):
+    """
+    Susun ular & tangga yang memenuhi batasan dan menargetkan panjang game.
+
+    Args:
+        total_cells: Jumlah kotak (TOTAL)
+        target_turns: Target rata-rata giliran satu pion dari kotak 1 ke finish
+        tolerance: Selisih maksimal dari target yang masih diterima
+        max_snake_drop: Jarak turun maksimal satu ular (None = bebas)
+        max_ladder_climb: Jarak naik maksimal satu tangga (None = bebas)
+        min_ladder_spacing: Jarak minimal antar kaki tangga
+        min_length: Panjang minimal ular/tangga (sama dengan generate_random_objects)
+        seed: Seed untuk hasil yang bisa diulang
+        time_budget: Batas waktu pencarian (detik)
+
+    Returns:
+        (snakes, ladders) dengan format yang sama seperti generate_random_objects.
+        Jika target tidak tercapai dalam batas waktu, papan terdekat yang
+        dikembalikan dan sebuah warning dicatat.
+
+    Raises:
+        ValueError: Jika batasan membuat jumlah objek tidak muat di papan.
+    """
+    rng = random.Random(seed)
+    lo, hi = 5, total_cells - 5
+    started = time.perf_counter()
+
+    def ladder_spacing_ok(base, ladders, ignore=None):
+        return all(abs(base - other) >= min_ladder_spacing
+                   for other in ladders if other != ignore)
+
+    def propose(is_snake, used, ladders, ignore=None):
+        """Pilih pasangan (start, end) acak yang valid dari kotak kosong"""
+        free = [c for c in range(lo, hi + 1) if c not in used]
+        if len(free) < 2:
+            return None
+        for _ in range(50):
+            start = rng.choice(free)
+            if is_snake:
+                far = start - max_snake_drop if max_snake_drop else lo
+                ends = [c for c in free if max(lo, far) <= c <= start - min_length]
+            else:
+                if not ladder_spacing_ok(start, ladders, ignore):
+                    continue
+                far = start + max_ladder_climb if max_ladder_climb else hi
+                ends = [c for c in free if start + min_length <= c <= min(hi, far)]
+            if ends:
+                return start, rng.choice(ends)
+        return None
+
+    snakes, ladders = {}, {}
+    used = {1, total_cells}
+    for is_snake, count in ((False, num_ladders), (True, num_snakes)):
+        target = snakes if is_snake else ladders
+        for _ in range(count):
+            pair = propose(is_snake, used, ladders)
+            if pair is None:
+                raise ValueError(
+                    f"Tidak bisa menempatkan {num_snakes} ular dan {num_ladders} tangga "
+                    f"di {total_cells} kotak dengan batasan ini"
+                )
+            target[pair[0]] = pair[1]
+            used.update(pair)
+
+    dest = list(range(total_cells + 1))
+    for start, end in list(ladders.items()) + list(snakes.items()):
+        dest[start] = end
+    model = _ExpectedTurnsModel(total_cells, dest)
+
+    best_gap = abs(model.value - target_turns)
+    best = (dict(snakes), dict(ladders))
+    steps = 0
+
+    while best_gap > tolerance and time.perf_counter() - started < time_budget:
+        steps += 1
+        is_snake = rng.random() < num_snakes / max(1, num_snakes + num_ladders)
+        group = snakes if is_snake else ladders
+        if not group:
+            continue
+        old_start = rng.choice(list(group))
+        old_end = group[old_start]
+
+        used.difference_update((old_start, old_end))
+        pair = propose(is_snake, used, ladders, ignore=None if is_snake else old_start)
+        used.update((old_start, old_end))
+        if pair is None:
+            continue
+        new_start, new_end = pair
+
+        if new_start == old_start:
+            changes = [(old_start, new_end)]
+        else:
+            changes = [(old_start, old_start), (new_start, new_end)]
+
+        gap = abs(model.score(changes) - target_turns)
+        # Greedy, with a small chance of taking a worse layout to escape plateaus
+        if gap < abs(model.value - target_turns) or rng.random() < 0.02:
+            model.apply(changes)
+            del group[old_start]
+            group[new_start] = new_end
+            used.difference_update((old_start, old_end))
+            used.update(pair)
+
+            gap = abs(model.value - target_turns)
+            if gap < best_gap:
+                best_gap = gap
+                best = (dict(snakes), dict(ladders))
+
+    elapsed = time.perf_counter() - started
+    if best_gap > tolerance:
+        logger.warning(
+            f"Papan target {target_turns} giliran tidak tercapai: selisih {best_gap:.2f} "
+            f"setelah {steps} langkah ({elapsed:.2f}s)"
+        )
+    else:
+        logger.info(f"Papan target {target_turns} giliran ditemukan dalam {steps} langkah ({elapsed:.3f}s)")
+
+    return best
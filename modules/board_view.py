@@ -0,0 +1,304 @@
+import math
+import os
+import sys
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from game_constants import (
+    COLS, ROWS, CELL, TOTAL, BOARD_CHUNK_TILES, BOARD_CHUNK_CACHE,
+    CAMERA_ZOOM_MIN, CAMERA_ZOOM_MAX, CAMERA_FOLLOW_MS,
+)
+
+Point = Tuple[float, float]
+
+
+class BoardLayout:
+    """
+    Where every tile of the zigzag board lies in world pixels.
+
+    World (0, 0) is the top-left corner of the whole board, so the layout
+    does not change when the camera moves. Tile rects and centres are
+    computed once; tiles_in() goes from a world rect to the tiles under it
+    with grid arithmetic, so its cost depends on the rect, not on `total`.
+    """
+
+    def __init__(self, cols: int = COLS, rows: int = ROWS, cell: int = CELL, total: int = TOTAL) -> None:
+        self.cols = cols
+        self.rows = rows
+        self.cell = cell
+        self.total = total
+        self.width = cols * cell
+        self.height = rows * cell
+        self.rects: List[Optional[pygame.Rect]] = [None]
+        self.centers: List[Tuple[int, int]] = [(0, 0)]
+        for n in range(1, total + 1):
+            col, row = self.grid_pos(n)
+            self.rects.append(pygame.Rect(col * cell, row * cell, cell, cell))
+            self.centers.append((col * cell + cell // 2, row * cell + cell // 2))
+
+    @property
+    def rect(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, self.width, self.height)
+
+    def grid_pos(self, n: int) -> Tuple[int, int]:
+        """Tile number (1-based) -> (column, row), row 0 at the top"""
+        row_idx, col_idx = divmod(int(n) - 1, self.cols)
+        col = col_idx if row_idx % 2 == 0 else self.cols - 1 - col_idx
+        return col, self.rows - 1 - row_idx
+
+    def tile_at(self, col: int, row: int) -> Optional[int]:
+        """Inverse of grid_pos; None outside the board or past `total`"""
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return None
+        row_idx = self.rows - 1 - row
+        col_idx = col if row_idx % 2 == 0 else self.cols - 1 - col
+        n = row_idx * self.cols + col_idx + 1
+        return n if n <= self.total else None
+
+    def center(self, n: int) -> Tuple[int, int]:
+        return self.centers[max(1, min(self.total, int(n)))]
+
+    def grid_range(self, rect: pygame.Rect) -> Tuple[int, int, int, int]:
+        """Columns and rows (first, last + 1) of the cells a world rect touches"""
+        c = self.cell
+        return (max(0, rect.left // c), min(self.cols, -(-rect.right // c)),
+                max(0, rect.top // c), min(self.rows, -(-rect.bottom // c)))
+
+    def tiles_in(self, rect: pygame.Rect) -> List[int]:
+        """Tile numbers whose cell intersects the world rect"""
+        c0, c1, r0, r1 = self.grid_range(rect)
+        tiles = []
+        for row in range(r0, r1):
+            for col in range(c0, c1):
+                n = self.tile_at(col, row)
+                if n is not None:
+                    tiles.append(n)
+        return tiles
+
+
+class SpatialGrid:
+    """
+    Bucket index of world rects (snakes, ladders, scrolls).
+
+    Each item is stored in every bucket its rect touches; query() only
+    looks at the buckets under the asked rect.
+    """
+
+    def __init__(self, bucket: int) -> None:
+        self.bucket = bucket
+        self.buckets: Dict[Tuple[int, int], List[Hashable]] = {}
+        self.rects: Dict[Hashable, pygame.Rect] = {}
+
+    def _cells(self, rect: pygame.Rect) -> Iterable[Tuple[int, int]]:
+        b = self.bucket
+        for by in range(rect.top // b, (rect.bottom - 1) // b + 1):
+            for bx in range(rect.left // b, (rect.right - 1) // b + 1):
+                yield bx, by
+
+    def insert(self, key: Hashable, rect: pygame.Rect) -> None:
+        self.rects[key] = rect
+        for cell in self._cells(rect):
+            self.buckets.setdefault(cell, []).append(key)
+
+    def query(self, rect: pygame.Rect) -> List[Hashable]:
+        """Keys whose rect intersects `rect`, in insertion order"""
+        found = set()
+        for cell in self._cells(rect):
+            for key in self.buckets.get(cell, ()):
+                if key not in found and self.rects[key].colliderect(rect):
+                    found.add(key)
+        return [key for key in self.rects if key in found] if found else []
+
+
+class BoardChunks:
+    """
+    The static board layer cut into square chunks of BOARD_CHUNK_TILES tiles.
+
+    Chunks are painted on first use and kept in an LRU cache, so a frame
+    only blits (and the first visit only paints) the chunks in view.
+    paint_tile(surface, n, x, y) draws tile n with its top-left at (x, y).
+    """
+
+    def __init__(self, layout: BoardLayout, paint_tile: Callable[[pygame.Surface, int, int, int], None],
+                 chunk_tiles: int = BOARD_CHUNK_TILES, capacity: int = BOARD_CHUNK_CACHE) -> None:
+        self.layout = layout
+        self.paint_tile = paint_tile
+        self.size = chunk_tiles * layout.cell
+        self.capacity = capacity
+        self.chunks: "OrderedDict[Tuple[int, int], pygame.Surface]" = OrderedDict()
+        self.built = 0
+
+    def _build(self, cx: int, cy: int) -> pygame.Surface:
+        layout = self.layout
+        size = self.size
+        left, top = cx * size, cy * size
+        cell = layout.cell
+        # Marble lines may run into the next tile: paint the tiles of a
+        # one-tile ring in board order on a larger canvas, so no line that
+        # reaches the chunk is clipped (clipping moves its pixels) and the
+        # chunk matches a layer painted in one piece
+        ring = pygame.Rect(left, top, size, size).inflate(cell * 2, cell * 2).clip(layout.rect)
+        canvas = pygame.Surface(ring.size).convert()
+        canvas.fill((0, 0, 0))
+        for n in sorted(layout.tiles_in(ring)):
+            rect = layout.rects[n]
+            self.paint_tile(canvas, n, rect.x - ring.x, rect.y - ring.y)
+        area = pygame.Rect(left - ring.x, top - ring.y,
+                           min(size, layout.width - left), min(size, layout.height - top))
+        self.built += 1
+        return canvas.subsurface(area).copy()
+
+    def chunk(self, cx: int, cy: int) -> pygame.Surface:
+        key = (cx, cy)
+        surface = self.chunks.get(key)
+        if surface is None:
+            surface = self._build(cx, cy)
+            self.chunks[key] = surface
+            if len(self.chunks) > self.capacity:
+                self.chunks.popitem(last=False)
+        else:
+            self.chunks.move_to_end(key)
+        return surface
+
+    def visible(self, rect: pygame.Rect) -> List[Tuple[int, int]]:
+        """Chunk keys under a world rect"""
+        size = self.size
+        x0, x1 = max(0, rect.left // size), min(-(-self.layout.width // size), -(-rect.right // size))
+        y0, y1 = max(0, rect.top // size), min(-(-self.layout.height // size), -(-rect.bottom // size))
+        return [(cx, cy) for cy in range(y0, y1) for cx in range(x0, x1)]
+
+    def draw(self, target: pygame.Surface, view: pygame.Rect, origin: Point) -> int:
+        """Blit the chunks under `view` (world rect); origin = target position of world (0, 0)"""
+        ox, oy = int(origin[0]), int(origin[1])
+        blits = [(self.chunk(cx, cy), (cx * self.size + ox, cy * self.size + oy))
+                 for cx, cy in self.visible(view)]
+        target.blits(blits, doreturn=False)
+        return len(blits)
+
+    def clear(self) -> None:
+        self.chunks.clear()
+
+
+class Camera:
+    """
+    Pan and zoom over the board for boards larger than the screen area.
+
+    (x, y) is the world point at the top-left of `view` (screen rect of
+    the board area) and `zoom` the screen pixels per world pixel. The
+    camera eases towards the point given to follow() with a time
+    constant of CAMERA_FOLLOW_MS; pan() stops following until the next
+    follow(..., force=True) or recenter(). Zoom never goes below the level
+    where the board fills the view, so no empty space is ever shown.
+    """
+
+    def __init__(self, layout: BoardLayout, view: pygame.Rect,
+                 zoom_min: float = CAMERA_ZOOM_MIN, zoom_max: float = CAMERA_ZOOM_MAX,
+                 follow_ms: float = CAMERA_FOLLOW_MS) -> None:
+        self.layout = layout
+        self.view = pygame.Rect(view)
+        self.zoom_min = max(zoom_min, view.width / layout.width, view.height / layout.height)
+        self.zoom_max = max(self.zoom_min, zoom_max)
+        self.follow_ms = follow_ms
+        self.zoom = 1.0 if self.zoom_min <= 1.0 else self.zoom_min
+        self.x = 0.0
+        self.y = float(max(0, layout.height - view.height / self.zoom))  # Start di baris bawah (kotak 1)
+        self.target: Optional[Point] = None
+        self.following = True
+        self.moving = False
+        self.last_time: Optional[int] = None
+        self.clamp()
+
+    @property
+    def static(self) -> bool:
+        """Board fits the view unzoomed: the camera never moves and nothing needs clipping"""
+        return (self.zoom == 1.0 and self.layout.width <= self.view.width
+                and self.layout.height <= self.view.height)
+
+    @property
+    def world_view(self) -> pygame.Rect:
+        """World rect shown in the view"""
+        return pygame.Rect(int(self.x), int(self.y),
+                           math.ceil(self.view.width / self.zoom) + 1,
+                           math.ceil(self.view.height / self.zoom) + 1)
+
+    @property
+    def state_key(self) -> Tuple[int, int, float]:
+        return int(self.x), int(self.y), self.zoom
+
+    def _clamped(self, x: float, y: float) -> Point:
+        max_x = max(0.0, self.layout.width - self.view.width / self.zoom)
+        max_y = max(0.0, self.layout.height - self.view.height / self.zoom)
+        return min(max(0.0, x), max_x), min(max(0.0, y), max_y)
+
+    def clamp(self) -> None:
+        self.x, self.y = self._clamped(self.x, self.y)
+
+    def _centered(self, point: Point) -> Point:
+        return (point[0] - self.view.width / self.zoom / 2,
+                point[1] - self.view.height / self.zoom / 2)
+
+    def follow(self, point: Point, force: bool = False) -> None:
+        """Ease towards `point` (world) unless the player panned away"""
+        if force:
+            self.following = True
+        if self.following:
+            self.target = point
+
+    def recenter(self, point: Point) -> None:
+        """Jump to `point` at once and follow again"""
+        self.following = True
+        self.target = point
+        self.x, self.y = self._centered(point)
+        self.clamp()
+
+    def pan(self, dx: float, dy: float) -> None:
+        """Move by screen pixels; stops following"""
+        self.following = False
+        self.target = None
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_by(self, factor: float, anchor: Optional[Point] = None) -> None:
+        """Zoom keeping the world point under `anchor` (screen, default view centre) in place"""
+        zoom = min(self.zoom_max, max(self.zoom_min, self.zoom * factor))
+        if abs(zoom - 1.0) < 1e-3:
+            zoom = 1.0
+        ax, ay = anchor if anchor is not None else self.view.center
+        wx, wy = self.to_world(ax, ay)
+        self.zoom = zoom
+        self.x = wx - (ax - self.view.x) / zoom
+        self.y = wy - (ay - self.view.y) / zoom
+        self.clamp()
+
+    def update(self, now: int) -> bool:
+        """Advance the follow easing to `now` (ms); True if the view moved"""
+        dt = 0 if self.last_time is None else min(250, now - self.last_time)
+        self.last_time = now
+        before = self.state_key
+        if self.target is not None and self.following:
+            tx, ty = self._clamped(*self._centered(self.target))
+            k = 1.0 - math.exp(-dt / self.follow_ms) if self.follow_ms > 0 else 1.0
+            self.x += (tx - self.x) * k
+            self.y += (ty - self.y) * k
+            if abs(tx - self.x) < 0.5 and abs(ty - self.y) < 0.5:
+                self.x, self.y = tx, ty
+                self.target = None  # Sampai: kamera diam sampai follow() berikutnya
+        self.moving = self.state_key != before
+        return self.moving
+
+    def origin(self) -> Point:
+        """Screen position of world (0, 0) at zoom 1"""
+        return self.view.x - int(self.x), self.view.y - int(self.y)
+
+    def to_screen(self, wx: float, wy: float) -> Point:
+        return (self.view.x + (wx - int(self.x)) * self.zoom,
+                self.view.y + (wy - int(self.y)) * self.zoom)
+
+    def to_world(self, sx: float, sy: float) -> Point:
+        return (int(self.x) + (sx - self.view.x) / self.zoom,
+                int(self.y) + (sy - self.view.y) / self.zoom)
@@ -0,0 +1,90 @@
+"""
+Indeks Tantangan - Setiap teks tantangan diklasifikasi sekali saat deck dimuat
+
+Papan (state.challenges) menyimpan ID record, bukan teks mentah, jadi
+renderer, popup dan engine tidak perlu mencari "truth"/"dare" atau
+menjalankan regex lagi setiap frame.
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from typing import Any, Dict, List, Optional, Union
+
+from modules.challenge_parser import get_move_effect
+from modules.game_utils import get_timer_duration
+
+ZONK_TEXT = "Zonk! Tidak ada tantangan."
+WIN_KEYWORDS = ["MENANG", "WINNER", "JUARA", "WIN"]
+TIMER_KEYWORDS = ["tantangan", "detik", "menit", "timer"]
+
+
+class ChallengeRecord:
+    """Hasil parse satu teks tantangan (read-only setelah dibuat)"""
+
+    __slots__ = ("id", "text", "clean_text", "kind", "replace_kind", "is_truth", "is_dare",
+                 "is_win", "is_challenge", "timer", "effect")
+
+    def __init__(self, record_id: int, text: str) -> None:
+        self.id = record_id
+        self.text = text
+        self.clean_text = text.replace("🎯", "").replace("📜", "").strip()
+
+        lower = self.clean_text.lower()
+        self.is_truth = "truth" in lower or "kebenaran" in lower
+        self.is_dare = "dare" in lower or "tantangan" in lower
+        self.is_win = any(k in self.clean_text.upper() for k in WIN_KEYWORDS)
+        self.is_challenge = any(k in lower for k in TIMER_KEYWORDS)
+
+        # Tumpukan deck & gambar scroll: truth dicek dulu
+        self.kind = "truth" if self.is_truth else ("dare" if self.is_dare else None)
+        # Kartu pengganti setelah NEXT/terima: dare dicek dulu, default truth
+        self.replace_kind = "dare" if self.is_dare else "truth"
+
+        self.timer = get_timer_duration(self.clean_text) if self.is_challenge else 0
+        self.effect = get_move_effect(self.clean_text)
+
+    def __repr__(self) -> str:
+        return f"ChallengeRecord({self.id}, {self.kind}, effect={self.effect}, {self.text[:30]!r})"
+
+
+class ChallengeIndex:
+    """Semua record tantangan yang pernah dimuat; teks yang sama berbagi satu ID"""
+
+    def __init__(self) -> None:
+        self.records: List[ChallengeRecord] = []
+        self.by_text: Dict[str, int] = {}
+        self.zonk_id = self.add(ZONK_TEXT).id
+
+    def add(self, text: str) -> ChallengeRecord:
+        record_id = self.by_text.get(text)
+        if record_id is not None:
+            return self.records[record_id]
+        record = ChallengeRecord(len(self.records), text)
+        self.records.append(record)
+        self.by_text[text] = record.id
+        return record
+
+    def get(self, record_id: int) -> ChallengeRecord:
+        return self.records[record_id]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+challenge_index = ChallengeIndex()
+
+
+def get_record(value: Union[int, str, None]) -> Optional[ChallengeRecord]:
+    """Record untuk nilai di state.challenges (ID, atau teks dari kode lama)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return challenge_index.add(value)
+    return challenge_index.records[value]
+
+
+def challenge_text(value: Any) -> str:
+    record = get_record(value)
+    return record.text if record else ""
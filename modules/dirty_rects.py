@@ -0,0 +1,188 @@
+import numpy as np
+import pygame
+from typing import Callable, List, Optional, Any, Iterable, Tuple
+
+
+class DirtyRectRenderer:
+    """
+    Dirty-rectangle presenter for the game screen.
+
+    Everything that does not move between frames (background, left sidebar,
+    board layer, ladders, right panel) is kept in a backdrop surface. Each
+    frame only the regions covered by moving things, this frame or the last
+    one, are restored from the backdrop, redrawn and pushed with
+    pygame.display.update(rects) instead of a full flip.
+
+    Things that move *under* the static layers (background particles) are
+    handled as an underlay. The static layers are drawn twice, over the
+    real background color and over a contrasting probe color; the
+    difference tells, per pixel, how much of the background shows through
+    (coverage). Underlay changes are then composited into the backdrop as
+    layers + coverage * (underlay - background), without redrawing the
+    layers, and only where coverage is nonzero.
+    """
+
+    def __init__(self, screen: pygame.Surface) -> None:
+        self.screen = screen
+        self.backdrop: Optional[pygame.Surface] = None
+        self.backdrop_key: Any = None
+        self.prev_rects: List[pygame.Rect] = []
+        self.rects: List[pygame.Rect] = []
+        self.full_present = True
+        self.frames_full = 0
+        self.frames_partial = 0
+
+        self.background: Optional[Tuple[int, int, int]] = None
+        self.draw_background: Optional[Callable[[pygame.Surface], None]] = None
+        self.probe: Optional[pygame.Surface] = None
+        self.probe_ready = False
+        self.base: Optional[pygame.Surface] = None
+        self.scratch: Optional[pygame.Surface] = None
+        self.coverage: Optional[np.ndarray] = None
+        self.exposed = pygame.Rect(0, 0, 0, 0)
+
+    def set_underlay(self, background: Tuple[int, ...],
+                     draw: Callable[[pygame.Surface], None]) -> None:
+        """draw(surface) paints the whole background, flat color plus moving things, without advancing them"""
+        self.background = tuple(background[:3])
+        self.draw_background = draw
+
+    @property
+    def probe_color(self) -> Tuple[int, int, int]:
+        """Flat color as far from the background as possible in every channel"""
+        return tuple(0 if c > 127 else 255 for c in (self.background or (0, 0, 0)))
+
+    def capture_probe(self) -> None:
+        """Screen holds the static layers drawn over probe_color: keep it for capture_backdrop"""
+        self.probe = self._copy_screen(self.probe)
+        self.probe_ready = True
+
+    def _copy_screen(self, surface: Optional[pygame.Surface]) -> pygame.Surface:
+        if surface is None or surface.get_size() != self.screen.get_size():
+            return self.screen.copy()
+        surface.blit(self.screen, (0, 0))
+        return surface
+
+    def invalidate(self) -> None:
+        """Screen was drawn by someone else (popup, menu, overlay): rebuild next frame"""
+        self.backdrop_key = None
+        self.full_present = True
+
+    def needs_backdrop(self, key: Any) -> bool:
+        return self.backdrop is None or key != self.backdrop_key
+
+    def capture_backdrop(self, key: Any) -> None:
+        """
+        Take the current screen as the static backdrop and present fully this
+        frame. With an underlay and a probe taken this frame, the screen must
+        hold the same layers drawn over the flat background color; the
+        current underlay is composited in.
+        """
+        self.backdrop = self._copy_screen(self.backdrop)
+        self.backdrop_key = key
+        self.full_present = True
+        self.coverage = None
+        if self.probe_ready and self.draw_background is not None:
+            self._split_underlay()
+        self.probe_ready = False
+
+    def _split_underlay(self) -> None:
+        shown = np.array(self.background, np.int32)
+        probe = np.array(self.probe_color, np.int32)
+        # Channel where the two background colors differ most gives the finest coverage
+        channel = int(np.argmax(np.abs(shown - probe)))
+        on_background = pygame.surfarray.pixels3d(self.screen)[:, :, channel].astype(np.int32)
+        on_probe = pygame.surfarray.pixels3d(self.probe)[:, :, channel].astype(np.int32)
+        coverage = np.rint((on_background - on_probe) * 255.0 / (shown[channel] - probe[channel]))
+        coverage = np.clip(coverage, 0, 255).astype(np.int32)
+        del on_background, on_probe
+
+        xs = np.flatnonzero(coverage.any(axis=1))
+        if not len(xs):
+            return
+        ys = np.flatnonzero(coverage.any(axis=0))
+        self.coverage = coverage
+        self.exposed = pygame.Rect(int(xs[0]), int(ys[0]),
+                                   int(xs[-1] - xs[0]) + 1, int(ys[-1] - ys[0]) + 1)
+        self.base = self._copy_screen(self.base)
+        if self.scratch is None or self.scratch.get_size() != self.screen.get_size():
+            self.scratch = pygame.Surface(self.screen.get_size())
+        self.draw_background(self.scratch)
+        self._composite(self.exposed)
+        self.screen.blit(self.backdrop, self.exposed, self.exposed)
+
+    def _composite(self, rect: pygame.Rect) -> None:
+        """backdrop = layers + coverage * (underlay - background) inside rect"""
+        area = (slice(rect.left, rect.right), slice(rect.top, rect.bottom))
+        coverage = self.coverage[area][:, :, None]
+        base = pygame.surfarray.pixels3d(self.base)[area].astype(np.int32)
+        under = pygame.surfarray.pixels3d(self.scratch)[area].astype(np.int32) - self.background
+        target = pygame.surfarray.pixels3d(self.backdrop)
+        target[area] = np.clip(base + (coverage * under * 2 + 255) // 510, 0, 255)
+        del target
+
+    def draw_underlay(self, rects: Iterable[Any]) -> List[pygame.Rect]:
+        """
+        The underlay changed inside rects (old and new positions of what
+        moved): composite it into the backdrop where it shows through and
+        return those regions, to be passed to begin() with the moving rects.
+        """
+        if self.coverage is None or self.full_present:
+            return []
+        shown = []
+        for rect in rects:
+            clip = self.exposed.clip(rect)
+            if clip.width and clip.height and self.coverage[clip.left:clip.right,
+                                                            clip.top:clip.bottom].any():
+                shown.append(clip)
+        if shown:
+            self.draw_background(self.scratch)
+            for rect in shown:
+                self._composite(rect)
+        return shown
+
+    def refresh_backdrop(self, rect: pygame.Rect) -> None:
+        """Copy a freshly redrawn static region of the screen into the backdrop (taken as opaque)"""
+        if self.backdrop is not None:
+            self.backdrop.blit(self.screen, rect, rect)
+        if self.coverage is not None:
+            self.base.blit(self.screen, rect, rect)
+            clip = pygame.Rect(rect).clip(self.screen.get_rect())
+            self.coverage[clip.left:clip.right, clip.top:clip.bottom] = 0
+        self.mark(rect)
+
+    def mark(self, rect: Any) -> None:
+        self.rects.append(pygame.Rect(rect))
+
+    def begin(self, dynamic_rects: Iterable[Any]) -> None:
+        """Restore the backdrop under this frame's and last frame's moving regions"""
+        for rect in dynamic_rects:
+            self.mark(rect)
+        if self.full_present or self.backdrop is None:
+            return
+        for rect in self.prev_rects + self.rects:
+            self.screen.blit(self.backdrop, rect, rect)
+
+    def restore_on_top(self, rect: pygame.Rect) -> None:
+        """Re-blit a backdrop region that must stay above moving things (right panel)"""
+        if self.backdrop is None:
+            return
+        targets = [self.screen.get_rect()] if self.full_present else self.prev_rects + self.rects
+        for dirty in targets:
+            clip = dirty.clip(rect)
+            if clip.width and clip.height:
+                self.screen.blit(self.backdrop, clip, clip)
+
+    def present(self) -> None:
+        screen_rect = self.screen.get_rect()
+        if self.full_present:
+            pygame.display.flip()
+            self.frames_full += 1
+        else:
+            update = [r.clip(screen_rect) for r in self.prev_rects + self.rects]
+            pygame.display.update([r for r in update if r.width and r.height])
+            self.frames_partial += 1
+
+        self.prev_rects = self.rects
+        self.rects = []
+        self.full_present = False
@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TextIO
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from game_constants import PROFILER_WINDOW
+from modules.game_logger import logger
+
+HUD_REFRESH_MS = 250
+HUD_POS = (8, 8)
+HUD_LINE_HEIGHT = 15
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class FrameProfiler:
+    """
+    Per-frame timing of the render stages, with an on-screen HUD and JSONL export.
+
+    Stages are timed by wrapping methods (`instrument`) or with `stage(name)`.
+    Nested stages count as self time: a stage running inside another one is
+    subtracted from its parent, so the stage times of a frame add up to at
+    most the frame's render time. Nothing is measured while the profiler is
+    disabled; the wrappers then cost one attribute check per call.
+
+    Call `end_frame()` once per presented frame.
+    """
+
+    def __init__(self, window: int = PROFILER_WINDOW) -> None:
+        self.enabled = False
+        self.hud_visible = False
+        self.frame_times: Deque[float] = deque(maxlen=window)
+        self.render_times: Deque[float] = deque(maxlen=window)
+        self.stage_history: Deque[Dict[str, float]] = deque(maxlen=window)
+        self.stages: Dict[str, float] = {}
+        self.stack: List[List[Any]] = []
+        self.frame_index = 0
+        self.last_frame_end: Optional[float] = None
+        self.export_file: Optional[TextIO] = None
+        self.export_path: Optional[str] = None
+        self.hud_surface: Optional[pygame.Surface] = None
+        self.hud_built_at = 0
+
+    # ------------------------------------------------------------------
+    # Switching
+    # ------------------------------------------------------------------
+    def _update_enabled(self) -> None:
+        enabled = self.hud_visible or self.export_file is not None
+        if enabled and not self.enabled:
+            self.stages = {}
+            self.stack = []
+            self.last_frame_end = None
+        self.enabled = enabled
+
+    def toggle_hud(self) -> bool:
+        self.hud_visible = not self.hud_visible
+        self.hud_surface = None
+        self._update_enabled()
+        return self.hud_visible
+
+    def start_export(self, path: str) -> bool:
+        """Append one JSON object per frame to `path` until stop_export(); False if it can't be opened"""
+        self.stop_export()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.export_file = open(path, "a", encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Frame profile export to {path} failed: {e}")
+            return False
+        self.export_path = path
+        logger.info(f"Frame profile export started: {path}")
+        self._update_enabled()
+        return True
+
+    def stop_export(self) -> None:
+        if self.export_file is not None:
+            try:
+                self.export_file.close()
+            except OSError as e:
+                logger.warning(f"Frame profile export to {self.export_path} failed: {e}")
+            logger.info(f"Frame profile export stopped: {self.export_path}")
+        self.export_file = None
+        self._update_enabled()
+
+    def toggle_export(self, path: str) -> bool:
+        if self.export_file is not None:
+            self.stop_export()
+            return False
+        return self.start_export(path)
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        entry = [name, time.perf_counter(), 0.0]  # name, start, time spent in child stages
+        self.stack.append(entry)
+        try:
+            yield
+        finally:
+            self._close(entry)
+
+    def _close(self, entry: List[Any]) -> None:
+        elapsed = time.perf_counter() - entry[1]
+        self.stack.pop()
+        self.stages[entry[0]] = self.stages.get(entry[0], 0.0) + elapsed - entry[2]
+        if self.stack:
+            self.stack[-1][2] += elapsed
+
+    def wrap(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """`func` timed as stage `name`"""
+        @wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            if not self.enabled:
+                return func(*args, **kwargs)
+            entry = [name, time.perf_counter(), 0.0]
+            self.stack.append(entry)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._close(entry)
+        return timed
+
+    def instrument(self, obj: Any, methods: Dict[str, str]) -> None:
+        """Replace obj.<method> with a timed wrapper, for each {method: stage}"""
+        for method, stage_name in methods.items():
+            setattr(obj, method, self.wrap(stage_name, getattr(obj, method)))
+
+    # ------------------------------------------------------------------
+    # Frames
+    # ------------------------------------------------------------------
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        stages = {name: secs * 1000 for name, secs in self.stages.items()}
+        render_ms = sum(stages.values())
+        frame_ms = (now - self.last_frame_end) * 1000 if self.last_frame_end is not None else None
+        self.last_frame_end = now
+        self.stages = {}
+        self.frame_index += 1
+
+        self.render_times.append(render_ms)
+        self.stage_history.append(stages)
+        if frame_ms is not None:
+            self.frame_times.append(frame_ms)
+
+        if self.export_file is not None:
+            record = {
+                "frame": self.frame_index,
+                "t": round(time.time(), 4),
+                "frame_ms": round(frame_ms, 4) if frame_ms is not None else None,
+                "render_ms": round(render_ms, 4),
+                "stages": {name: round(ms, 4) for name, ms in stages.items()},
+            }
+            try:
+                self.export_file.write(json.dumps(record) + "\n")
+            except OSError as e:
+                # Disk penuh / dilepas di tengah rekaman: berhenti merekam, game jalan terus
+                logger.warning(f"Frame profile export to {self.export_path} failed: {e}")
+                self.stop_export()
+
+    def summary(self) -> Dict[str, Any]:
+        """Rolling percentiles of frame/render time and mean ms per stage"""
+        frames = sorted(self.frame_times)
+        renders = sorted(self.render_times)
+        stage_totals: Dict[str, float] = {}
+        for stages in self.stage_history:
+            for name, ms in stages.items():
+                stage_totals[name] = stage_totals.get(name, 0.0) + ms
+        n = max(1, len(self.stage_history))
+        mean_frame = sum(frames) / len(frames) if frames else 0.0
+        return {
+            "frames": len(frames),
+            "fps": 1000 / mean_frame if mean_frame else 0.0,
+            "frame_p50": percentile(frames, 50),
+            "frame_p95": percentile(frames, 95),
+            "frame_p99": percentile(frames, 99),
+            "frame_max": frames[-1] if frames else 0.0,
+            "render_p50": percentile(renders, 50),
+            "render_p95": percentile(renders, 95),
+            "stages": {name: total / n for name, total in stage_totals.items()},
+        }
+
+    # ------------------------------------------------------------------
+    # HUD
+    # ------------------------------------------------------------------
+    def hud_rect(self) -> Optional[pygame.Rect]:
+        if not self.hud_visible or self.hud_surface is None:
+            return None
+        return self.hud_surface.get_rect(topleft=HUD_POS)
+
+    def draw_hud(self, surface: pygame.Surface, font: pygame.font.Font) -> Optional[pygame.Rect]:
+        """Blit the HUD (rebuilt every HUD_REFRESH_MS) and return its rect"""
+        if not self.hud_visible:
+            return None
+        now = pygame.time.get_ticks()
+        if self.hud_surface is None or now - self.hud_built_at >= HUD_REFRESH_MS:
+            self.hud_surface = self._build_hud(font)
+            self.hud_built_at = now
+        surface.blit(self.hud_surface, HUD_POS)
+        return self.hud_rect()
+
+    def _build_hud(self, font: pygame.font.Font) -> pygame.Surface:
+        s = self.summary()
+        lines = [
+            f"FPS {s['fps']:.0f}   frame p50 {s['frame_p50']:.1f}  p95 {s['frame_p95']:.1f}  p99 {s['frame_p99']:.1f}",
+            f"render p50 {s['render_p50']:.2f}  p95 {s['render_p95']:.2f}  max frame {s['frame_max']:.1f} ms",
+        ]
+        for name, ms in sorted(s["stages"].items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {name:<13} {ms:6.2f} ms")
+        if self.export_file is not None:
+            lines.append(f"REC {os.path.basename(self.export_path)}")
+
+        # Angka berubah tiap frame: font.render langsung, bukan text_cache
+        rendered = [font.render(line, True, (230, 235, 240)) for line in lines]
+        width = max(r.get_width() for r in rendered) + 12
+        hud = pygame.Surface((width, len(lines) * HUD_LINE_HEIGHT + 8), pygame.SRCALPHA)
+        hud.fill((0, 0, 0, 170))
+        for i, r in enumerate(rendered):
+            hud.blit(r, (6, 4 + i * HUD_LINE_HEIGHT))
+        return hud
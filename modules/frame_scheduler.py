@@ -0,0 +1,117 @@
+import os
+import sys
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from game_constants import ACTIVE_FPS, IDLE_FPS, IDLE_AFTER_MS
+from modules.game_logger import logger
+
+MODE_ACTIVE = "active"
+MODE_IDLE = "idle"
+
+WAKE_EVENTS = (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEWHEEL, pygame.QUIT)
+
+
+class FrameScheduler:
+    """
+    Frame pacing for the game loops.
+
+    Runs at ACTIVE_FPS while something animates (dice roll, pawn move,
+    popup, screen shake) or the player did something recently. After
+    IDLE_AFTER_MS without input it drops to IDLE_FPS and sleeps in
+    pygame.event.wait, so a key press still wakes the loop immediately.
+    Events taken by the wait are posted back for the caller's event.get().
+
+    `tick()` is a drop-in for `clock.tick(fps)`.
+    """
+
+    def __init__(self, clock: pygame.time.Clock, active_fps: int = ACTIVE_FPS,
+                 idle_fps: int = IDLE_FPS, idle_after_ms: int = IDLE_AFTER_MS) -> None:
+        self.clock = clock
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after_ms = idle_after_ms
+        self.busy_depth = 0
+        self.last_activity = pygame.time.get_ticks()
+        self.last_frame = self.last_activity
+        self._mode = MODE_ACTIVE
+        self.idle_frames = 0
+        self.active_frames = 0
+
+    @property
+    def mode(self) -> str:
+        """Current pacing mode: "active" or "idle" """
+        return self._mode
+
+    def notify_activity(self) -> None:
+        """Input or game event: stay at full rate for another idle_after_ms"""
+        self.last_activity = pygame.time.get_ticks()
+
+    @contextmanager
+    def busy(self) -> Iterator[None]:
+        """Keep full rate for the duration of an animation or popup"""
+        self.busy_depth += 1
+        self._set_mode(MODE_ACTIVE)
+        try:
+            yield
+        finally:
+            self.busy_depth -= 1
+            self.notify_activity()
+
+    def _set_mode(self, mode: str) -> None:
+        if mode != self._mode:
+            logger.info(f"Frame scheduler: {self._mode} -> {mode}")
+            self._mode = mode
+
+    def _wants_active(self, animating: bool) -> bool:
+        if self.busy_depth > 0 or animating:
+            return True
+        return pygame.time.get_ticks() - self.last_activity < self.idle_after_ms
+
+    def tick(self, fps: Optional[int] = None, animating: bool = False) -> int:
+        """
+        Wait for the next frame and return the milliseconds since the last one.
+
+        Args:
+            fps: Frame rate to use when active (defaults to active_fps)
+            animating: Caller has something moving this frame (e.g. shake)
+        """
+        if self._wants_active(animating):
+            self._set_mode(MODE_ACTIVE)
+            self.active_frames += 1
+            self.clock.tick(fps or self.active_fps)
+        else:
+            self._set_mode(MODE_IDLE)
+            self.idle_frames += 1
+            self._idle_wait()
+            self.clock.tick()
+
+        now = pygame.time.get_ticks()
+        dt = now - self.last_frame
+        self.last_frame = now
+        return dt
+
+    def _idle_wait(self) -> None:
+        """Sleep until the next idle frame or the first event, whichever comes first"""
+        deadline = self.last_frame + 1000 // self.idle_fps
+        held = []
+        while True:
+            timeout = deadline - pygame.time.get_ticks()
+            if timeout <= 0:
+                break
+            event = pygame.event.wait(timeout)
+            if event.type == pygame.NOEVENT:
+                break
+            held.append(event)
+            if event.type in WAKE_EVENTS:
+                self.notify_activity()
+                self._set_mode(MODE_ACTIVE)
+                break
+
+        # Window/motion events don't end the nap but still belong to the game loop
+        for event in held:
+            pygame.event.post(event)
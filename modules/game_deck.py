@@ -1,42 +1,71 @@
 """
 Sistem Deck Challenge - Mengelola kartu Truth dan Dare
 """
+import os
+import sys
 import random
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from modules.challenge_index import challenge_index
+
 class ChallengeDeck:
-    """Mengelola deck kartu Truth dan Dare"""
+    """
+    Mengelola deck kartu Truth dan Dare.
+    Kartu disimpan sebagai ID record di challenge_index (diparse sekali saat load).
+    """
     
-    def __init__(self, source_dict):
+    def __init__(self, source_dict, rng=None, verbose=True, index=None):
+        self.rng = rng or random
+        self.verbose = verbose
+        self.index = index or challenge_index
         self.truth_master = []
         self.dare_master = []
         
         for v in source_dict.values():
             if v and str(v).strip():
-                text_lower = str(v).lower()
-                if "truth" in text_lower or "kebenaran" in text_lower:
-                    self.truth_master.append(v)
-                elif "dare" in text_lower or "tantangan" in text_lower:
-                    self.dare_master.append(v)
+                record = self.index.add(str(v))
+                if record.kind == "truth":
+                    self.truth_master.append(record.id)
+                elif record.kind == "dare":
+                    self.dare_master.append(record.id)
         
         self.truth_pool = []
         self.dare_pool = []
         
         self.shuffle_pool()
         
-        print(f"🔵 Truth Cards: {len(self.truth_master)}")
-        print(f"🔴 Dare Cards: {len(self.dare_master)}")
+        if self.verbose:
+            print(f"🔵 Truth Cards: {len(self.truth_master)}")
+            print(f"🔴 Dare Cards: {len(self.dare_master)}")
+
+    def fork(self, rng=None):
+        """
+        Deck baru untuk satu meja: daftar master dipakai bersama (read-only),
+        hanya tumpukan kocok (urutan ID) yang milik deck baru
+        """
+        deck = ChallengeDeck.__new__(ChallengeDeck)
+        deck.rng = rng or random
+        deck.verbose = False
+        deck.index = self.index
+        deck.truth_master = self.truth_master
+        deck.dare_master = self.dare_master
+        deck.truth_pool = []
+        deck.dare_pool = []
+        deck.shuffle_pool()
+        return deck
 
     def shuffle_pool(self):
         """Isi ulang kedua tumpukan kartu"""
         self.truth_pool = list(self.truth_master)
         self.dare_pool = list(self.dare_master)
-        random.shuffle(self.truth_pool)
-        random.shuffle(self.dare_pool)
-        print(f"🔄 Deck Dikocok! Truth: {len(self.truth_pool)}, Dare: {len(self.dare_pool)}")
+        self.rng.shuffle(self.truth_pool)
+        self.rng.shuffle(self.dare_pool)
+        if self.verbose:
+            print(f"🔄 Deck Dikocok! Truth: {len(self.truth_pool)}, Dare: {len(self.dare_pool)}")
 
     def draw_card(self, card_type="any"):
         """
-        Ambil kartu berdasarkan tipe
+        Ambil ID kartu berdasarkan tipe
         card_type: "truth", "dare", atau "any" (random)
         """
         if card_type == "truth":
@@ -52,7 +81,7 @@ class ChallengeDeck:
                 return self.dare_pool.pop()
         
         else:  # "any" - random antara truth atau dare
-            choice = random.choice(["truth", "dare"])
+            choice = self.rng.choice(["truth", "dare"])
             return self.draw_card(choice)
         
-        return "Zonk! Tidak ada tantangan."
+        return self.index.zonk_id
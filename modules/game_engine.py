@@ -0,0 +1,235 @@
+"""
+Mesin Game Headless - Aturan giliran tanpa layar dan suara
+
+Tidak memanggil pygame sama sekali (tanpa init, window atau mixer).
+Front end pygame memanggil langkah-langkahnya (roll_dice, advance,
+resolve_jump, accept_challenge, finish_turn) di antara animasi; simulasi,
+test dan server cukup memanggil play_turn().
+"""
+import os
+import sys
+import random
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from game_constants import TOTAL
+from modules.game_state import GameState
+from modules.game_deck import ChallengeDeck
+from modules.challenge_index import ChallengeRecord, get_record
+from modules.game_utils import overflow_reflect, distribute_random_challenges
+from modules.board_generator import generate_random_objects, generate_constrained_objects
+from modules.game_rng import SessionRandom
+
+DICE_SIDES = 6
+
+
+class TurnResult:
+    """Ringkasan satu giliran yang sudah diselesaikan"""
+
+    __slots__ = ("player", "dice", "start", "landed", "jump", "after_jump",
+                 "challenge", "effect", "final", "won")
+
+    def __init__(self, player: int, dice: int, start: int, landed: int,
+                 jump: Optional[str], after_jump: int, challenge: Optional[ChallengeRecord],
+                 effect: int, final: int, won: bool) -> None:
+        self.player = player
+        self.dice = dice
+        self.start = start
+        self.landed = landed
+        self.jump = jump
+        self.after_jump = after_jump
+        self.challenge = challenge
+        self.effect = effect
+        self.final = final
+        self.won = won
+
+    def __repr__(self) -> str:
+        return (f"TurnResult(player={self.player}, dice={self.dice}, {self.start}->{self.landed}"
+                f", jump={self.jump}, final={self.final}, won={self.won})")
+
+
+class GameEngine:
+    """
+    Aturan Ular Tangga Truth or Dare di atas GameState, tanpa pygame.
+
+    Urutan satu giliran sama dengan game: lempar dadu, pantul di finish,
+    ular (dicek dulu) atau tangga, lalu efek maju/mundur kartu di kotak
+    akhir tanpa lompatan lagi. Kartu yang dipakai atau dilewati (NEXT)
+    diganti kartu baru bertipe sama. Semua acakan lewat satu random.Random.
+    """
+
+    def __init__(self, state: GameState, deck: Optional[ChallengeDeck] = None,
+                 seed: Optional[int] = None, rng: Optional[random.Random] = None,
+                 total: int = TOTAL, record_log: bool = True) -> None:
+        self.state = state
+        self.deck = deck
+        self.rng = rng or random.Random(seed)
+        self.total = total
+        self.record_log = record_log
+        self.winner: Optional[int] = None
+        self.turns_played = 0
+
+    @classmethod
+    def new_game(cls, players: List[str], game_level: int = 1,
+                 challenge_data: Optional[Dict[str, str]] = None,
+                 seed: Optional[int] = None, num_snakes: int = 3, num_ladders: int = 2,
+                 num_challenges: int = 40, total: int = TOTAL,
+                 record_log: bool = True, streams: Optional[SessionRandom] = None,
+                 target_turns: Optional[float] = None,
+                 deck_template: Optional[ChallengeDeck] = None) -> "GameEngine":
+        """
+        Papan, deck dan kartu baru dari satu seed.
+        streams: papan, deck dan dadu masing-masing dari stream SessionRandom-nya
+        target_turns: papan lewat generate_constrained_objects (BOARD_TARGET_TURNS)
+        deck_template: deck yang sudah dimuat; dipakai lewat fork() alih-alih challenge_data
+        """
+        if streams is None:
+            board_rng = deck_rng = dice_rng = random.Random(seed)
+        else:
+            board_rng, deck_rng, dice_rng = streams.board, streams.deck, streams.dice
+
+        state = GameState(players, game_level)
+        if target_turns:
+            state.snakes, state.ladders = generate_constrained_objects(
+                total, target_turns, num_snakes, num_ladders, seed=board_rng.randrange(2 ** 32)
+            )
+        else:
+            state.snakes, state.ladders = generate_random_objects(total, num_snakes, num_ladders, rng=board_rng)
+
+        deck = None
+        if deck_template is not None:
+            deck = deck_template.fork(deck_rng)
+        elif challenge_data:
+            deck = ChallengeDeck(challenge_data, rng=deck_rng, verbose=False)
+        if deck is not None:
+            state.challenges = distribute_random_challenges(
+                deck, state.snakes, state.ladders, num_challenges, rng=board_rng
+            )
+        return cls(state, deck, rng=dice_rng, total=total, record_log=record_log)
+
+    # ------------------------------------------------------------------
+    # Langkah-langkah giliran (dipakai front end di sela animasi)
+    # ------------------------------------------------------------------
+    @property
+    def current_player(self) -> int:
+        return self.state.turn
+
+    @property
+    def position(self) -> int:
+        return self.state.positions[self.state.turn]
+
+    def _log(self, text: str) -> None:
+        if self.record_log:
+            self.state.log_manager.log_turn(text)
+
+    def begin_turn(self) -> int:
+        if self.record_log:
+            self.state.log_manager.start_turn(self.state.players[self.state.turn])
+        return self.state.turn
+
+    def roll_dice(self, value: Optional[int] = None) -> int:
+        """Lempar dadu; value = hasil yang sudah diketahui (replay), rng tidak dipakai"""
+        dice = self.rng.randint(1, DICE_SIDES) if value is None else value
+        self._log(f"Dice: {dice}")
+        return dice
+
+    def advance(self, dice: int) -> Tuple[int, int]:
+        """Jalankan pion sesuai dadu -> (kotak awal, kotak mendarat)"""
+        positions = self.state.positions
+        start = positions[self.state.turn]
+        landed = overflow_reflect(start + dice, self.total)
+        positions[self.state.turn] = landed
+        return start, landed
+
+    def resolve_jump(self) -> Optional[Tuple[str, int, int]]:
+        """Ular atau tangga di kotak sekarang -> ("snake"/"ladder", dari, ke), atau None"""
+        positions = self.state.positions
+        tile = positions[self.state.turn]
+        if tile in self.state.snakes:
+            dest = self.state.snakes[tile]
+            positions[self.state.turn] = dest
+            self._log(": Slid Down Snake")
+            return "snake", tile, dest
+        if tile in self.state.ladders:
+            dest = self.state.ladders[tile]
+            positions[self.state.turn] = dest
+            self._log(": Climbed Ladder")
+            return "ladder", tile, dest
+        return None
+
+    def pending_challenge(self) -> Optional[ChallengeRecord]:
+        """Record kartu di kotak pion sekarang (None jika tidak ada)"""
+        return get_record(self.state.challenges.get(str(self.position)))
+
+    def _replace_card(self, tile_key: str, record: ChallengeRecord) -> ChallengeRecord:
+        if self.deck is None:
+            return record
+        new_id = self.deck.draw_card(record.replace_kind)
+        self.state.challenges[tile_key] = new_id
+        return get_record(new_id)
+
+    def skip_challenge(self) -> Optional[ChallengeRecord]:
+        """Tombol NEXT: ganti kartu di kotak ini dan kembalikan record barunya"""
+        record = self.pending_challenge()
+        if record is None:
+            return None
+        return self._replace_card(str(self.position), record)
+
+    def accept_challenge(self) -> Tuple[Optional[ChallengeRecord], int, int]:
+        """Jalankan kartu di kotak ini -> (record, efek langkah, kotak akhir)"""
+        record = self.pending_challenge()
+        if record is None:
+            return None, 0, self.position
+
+        self._log(record.text)
+        self._replace_card(str(self.position), record)
+
+        effect = record.effect
+        if effect:
+            final = max(1, min(self.total, self.position + effect))
+            self.state.positions[self.state.turn] = final
+        return record, effect, self.position
+
+    def finish_turn(self) -> bool:
+        """Tutup log giliran, cek menang, lanjut ke pemain berikutnya"""
+        won = self.position == self.total
+        if won and self.winner is None:
+            self.winner = self.state.turn
+        if self.record_log:
+            self.state.log_manager.end_turn()
+        self.turns_played += 1
+        self.state.turn = (self.state.turn + 1) % len(self.state.players)
+        return won
+
+    # ------------------------------------------------------------------
+    # Giliran penuh tanpa interaksi
+    # ------------------------------------------------------------------
+    def play_turn(self) -> TurnResult:
+        """Satu giliran lengkap; kartu di kotak akhir selalu diterima"""
+        player = self.begin_turn()
+        dice = self.roll_dice()
+        start, landed = self.advance(dice)
+        jump = self.resolve_jump()
+        after_jump = self.position
+        record, effect, final = self.accept_challenge()
+        won = self.finish_turn()
+        return TurnResult(player, dice, start, landed, jump[0] if jump else None,
+                          after_jump, record, effect, final, won)
+
+    def play_until_win(self, max_turns: int = 100_000) -> Optional[int]:
+        """Main terus sampai ada pemenang (atau max_turns habis) -> index pemenang"""
+        for _ in range(max_turns):
+            if self.play_turn().won:
+                break
+        return self.winner
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Keadaan papan yang cukup untuk membandingkan dua jalannya game"""
+        return {
+            "turn": self.state.turn,
+            "positions": list(self.state.positions),
+            "challenges": dict(self.state.challenges),
+            "winner": self.winner,
+        }
@@ -1,37 +1,105 @@
 """
 Sistem Log Game - Mengelola history dan current turn log
 """
+from collections import deque
+
 MAX_LOG = 1000
 
 class LogManager:
     """Mengelola log history dan current turn log"""
-    
+
     def __init__(self):
-        self.history = []
+        # Ring buffer per giliran: (block_id, [baris...]), yang tertua di kiri.
+        # block_id tidak pernah berubah, jadi layout sidebar bisa di-cache per blok.
+        self.blocks = deque()
+        self.line_count = 0
+        # Jumlah baris yang pernah ditulis (tidak berkurang saat baris lama dibuang)
+        self.total_lines = 0
         self.current_turn_log = []
+        self.current_block_id = 0
+        self.next_block_id = 1
+        self.revision = 0
         self.sidebar_snapshot = None
         self.max_log = MAX_LOG
-    
+
+    @property
+    def history(self):
+        """Semua baris yang sudah selesai (urutan lama -> baru)"""
+        return [line for _, lines in self.blocks for line in lines]
+
     def start_turn(self, player):
         """Mulai giliran baru untuk player"""
+        self.current_block_id = self.next_block_id
+        self.next_block_id += 1
         self.current_turn_log = [f"▶ {player}"]
-    
+        self.total_lines += 1
+        self.revision += 1
+
     def log_turn(self, text):
         """Tambahkan log ke current turn"""
         self.current_turn_log.append("  " + text)
-    
+        self.total_lines += 1
+        self.revision += 1
+
+    def append_lines(self, lines, closed):
+        """
+        Tambahkan baris yang sudah jadi (dari LogManager lain, lihat state_sync).
+        Baris "▶ ..." membuka blok giliran baru; closed = giliran terakhir sudah selesai
+        """
+        for line in lines:
+            if line.startswith("▶"):
+                if self.current_turn_log:
+                    self.end_turn()
+                self.current_block_id = self.next_block_id
+                self.next_block_id += 1
+                self.current_turn_log = [line]
+            else:
+                self.current_turn_log.append(line)
+            self.total_lines += 1
+        if closed and self.current_turn_log:
+            self.end_turn()
+        self.revision += 1
+
+    def lines_since(self, total):
+        """Baris yang ditulis setelah total_lines == total (yang sudah terbuang tidak ikut)"""
+        need = self.total_lines - total
+        chunks = []
+        for _, lines in self.iter_recent_blocks():
+            if need <= 0:
+                break
+            chunk = lines[max(0, len(lines) - need):]
+            chunks.append(chunk)
+            need -= len(chunk)
+        return [line for chunk in reversed(chunks) for line in chunk]
+
     def end_turn(self):
         """Akhiri giliran, pindahkan log ke history"""
-        for line in self.current_turn_log:
-            self.history.append(line)
+        if self.current_turn_log:
+            self.blocks.append((self.current_block_id, list(self.current_turn_log)))
+            self.line_count += len(self.current_turn_log)
 
-        while len(self.history) > self.max_log:
-            self.history.pop(0)
+        # Buang baris tertua saja, tanpa menggeser seluruh list
+        while self.line_count > self.max_log:
+            _, oldest = self.blocks[0]
+            drop = min(len(oldest), self.line_count - self.max_log)
+            del oldest[:drop]
+            self.line_count -= drop
+            if not oldest:
+                self.blocks.popleft()
 
         self.current_turn_log = []
+        self.current_block_id = self.next_block_id
+        self.next_block_id += 1
+        self.revision += 1
 
         self.sidebar_snapshot = None
-    
+
     def get_full_log(self):
         """Dapatkan gabungan history + current turn log untuk real-time display"""
         return self.history + self.current_turn_log
+
+    def iter_recent_blocks(self):
+        """Blok giliran dari yang terbaru (termasuk giliran berjalan) sebagai (block_id, lines)"""
+        if self.current_turn_log:
+            yield self.current_block_id, self.current_turn_log
+        yield from reversed(self.blocks)
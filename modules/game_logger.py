@@ -32,3 +32,12 @@ def setup_logger(name: str = "SnakeLadder") -> logging.Logger:
     return logger
 
 logger = setup_logger()
+
+def log_to_stderr(logger: logging.Logger = logger) -> None:
+    """
+    Pindahkan pesan konsol ke stderr, untuk skrip yang menulis hasilnya
+    (mis. laporan JSON benchmark) ke stdout.
+    """
+    for handler in logger.handlers:
+        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+            handler.setStream(sys.stderr)
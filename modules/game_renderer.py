@@ -3,13 +3,21 @@ import math
 import random
 import os
 import sys
+from contextlib import contextmanager
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from game_constants import *
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, Iterator, List, Tuple, Any, Optional
 from modules.visuals import draw_scroll, draw_background_effects
-from modules.game_utils import board_xy, lerp
+from modules.game_utils import lerp
 from modules.game_state import GameState
+from modules.snake_geometry import SnakeGeometry
+from modules.text_cache import render_text
+from modules.challenge_index import get_record
+from modules.board_view import BoardLayout, BoardChunks, Camera, SpatialGrid
+from modules.sprite_atlas import Sprite
+
+HEADER_AVATAR = 50  # Ukuran avatar di kartu giliran (atlas: "hero_<i>@50")
 
 class GameRenderer:
     screen: pygame.Surface
@@ -17,120 +25,330 @@ class GameRenderer:
     fonts: Dict[str, pygame.font.Font]
     sidebar_snapshot: Optional[pygame.Surface]
     last_history_len: int
-
-    def __init__(self, screen: pygame.Surface, assets: Dict[str, Any], fonts: Dict[str, pygame.font.Font]) -> None:
+    layout: BoardLayout
+    camera: Camera
+    origin: Tuple[int, int]
+    board_chunks: Optional[BoardChunks]
+    board_chunks_key: Optional[Tuple[Any, ...]]
+    board_index: Optional[SpatialGrid]
+    board_index_key: Optional[Tuple[Any, ...]]
+    snake_geometry: Dict[Tuple[int, int], SnakeGeometry]
+    header_fonts: Optional[Tuple[pygame.font.Font, pygame.font.Font, pygame.font.Font]]
+    sprites: Dict[Any, Sprite]
+
+    def __init__(self, screen: pygame.Surface, assets: Dict[str, Any], fonts: Dict[str, pygame.font.Font],
+                 layout: Optional[BoardLayout] = None) -> None:
         self.screen = screen
         self.assets = assets
         self.fonts = fonts
         self.sidebar_snapshot = None
         self.last_history_len = -1
+        self.layout = layout or BoardLayout()
+        self.camera = Camera(self.layout, pygame.Rect(SIDEBAR_LEFT_WIDTH, 0, VIEW_COLS * CELL, VIEW_ROWS * CELL))
+        self.origin = self.camera.origin()
+        self.board_chunks = None
+        self.board_chunks_key = None
+        self.board_index = None
+        self.board_index_key = None
+        self.zoom_surface = None
+        self.snake_geometry = {}
+        self.header_fonts = None
+        self.sprites = {}
         
-    def draw_board(self, state: GameState) -> None:
-        """Draw the game board with marble tiles and scrolls"""
-        local_rng = random.Random()
-        
-        for i in range(1, TOTAL + 1):
-            n = i - 1
-            row_idx = n // COLS
-            col_idx = n % COLS
-            row = ROWS - 1 - row_idx
-            col = col_idx if (row_idx % 2) == 0 else COLS - 1 - col_idx
-            
-            x = (col * CELL) + SIDEBAR_LEFT_WIDTH
-            y = row * CELL
-            
-            rect = pygame.Rect(x, y, CELL, CELL)
-            
-            theme = TILE_EVEN if i % 2 == 0 else TILE_ODD
-            
-            base_col  = theme['base']
-            highlight = theme['highlight']
-            shadow    = theme['shadow']
-            crack_col = theme['crack']
-                
-            pygame.draw.rect(self.screen, base_col, rect)
+    def _board_cache_key(self) -> Tuple[Any, ...]:
+        """Everything the static board layer depends on"""
+        return (
+            self.layout.cols, self.layout.rows, self.layout.cell, self.layout.total,
+            tuple(TILE_EVEN.items()),
+            tuple(TILE_ODD.items()),
+            id(self.fonts['small']),
+        )
 
-            local_rng.seed(i)
+    def invalidate_board_cache(self) -> None:
+        """Force the static board layer to be rebuilt on the next draw"""
+        self.board_chunks = None
+        self.board_chunks_key = None
+        self.board_index = None
+        self.board_index_key = None
+        self.snake_geometry = {}
+
+    # ------------------------------------------------------------------
+    # Camera: world = board pixels, target = the surface being drawn on
+    # ------------------------------------------------------------------
+    def update_camera(self, focus: Optional[Tuple[float, float]], now: Optional[int] = None) -> bool:
+        """Follow `focus` (world point) and advance the camera; True if the view moved"""
+        if focus is not None:
+            self.camera.follow(focus)
+        moved = self.camera.update(pygame.time.get_ticks() if now is None else now)
+        self.origin = self.camera.origin()
+        return moved
+
+    def to_target(self, wx: float, wy: float) -> Tuple[float, float]:
+        """World point -> position on the surface the board is being drawn on"""
+        return wx + self.origin[0], wy + self.origin[1]
+
+    @property
+    def board_clip(self) -> Optional[pygame.Rect]:
+        """Screen area board drawing is limited to (inside the board frame); None = classic fixed board"""
+        return None if self.camera.static else self.camera.view.inflate(10, 10)
+
+    @contextmanager
+    def board_pass(self) -> Iterator[None]:
+        """
+        Draw board things (layer, ladders, snakes, scrolls, pawns) inside this block.
+
+        Zoom 1: straight onto the screen, clipped to the board area when the
+        camera can move. Other zoom levels: onto an offscreen surface of the
+        visible world area, scaled into the board area at the end, so the
+        drawing code is the same at every zoom.
+        """
+        camera = self.camera
+        if camera.zoom == 1.0:
+            self.origin = camera.origin()
+            clip = self.board_clip
+            previous = self.screen.get_clip()
+            if clip is not None:
+                self.screen.set_clip(clip)
+            try:
+                yield
+            finally:
+                self.screen.set_clip(previous)
+            return
+
+        world = camera.world_view
+        if self.zoom_surface is None or self.zoom_surface.get_size() != world.size:
+            self.zoom_surface = pygame.Surface(world.size).convert()
+        screen = self.screen
+        self.screen = self.zoom_surface
+        self.origin = (-world.x, -world.y)
+        try:
+            yield
+        finally:
+            self.screen = screen
+            self.origin = camera.origin()
+        # Potongan world_view dibulatkan ke atas: skala ke view + sisa pecahan, lalu klip
+        scaled_size = (round(world.width * camera.zoom), round(world.height * camera.zoom))
+        previous = screen.get_clip()
+        screen.set_clip(camera.view)
+        screen.blit(pygame.transform.smoothscale(self.zoom_surface, scaled_size), camera.view.topleft)
+        screen.set_clip(previous)
+
+    def _paint_tile(self, layer: pygame.Surface, i: int, x: int, y: int) -> None:
+        """Marble tile, seal and number of tile i with its top-left at (x, y) on `layer`"""
+        rect = pygame.Rect(x, y, CELL, CELL)
+
+        theme = TILE_EVEN if i % 2 == 0 else TILE_ODD
+
+        base_col  = theme['base']
+        highlight = theme['highlight']
+        shadow    = theme['shadow']
+        crack_col = theme['crack']
+
+        pygame.draw.rect(layer, base_col, rect)
+
+        local_rng = random.Random(i)
+        for _ in range(3):
+            vx_start = local_rng.randint(x, x + CELL)
+            vy_start = local_rng.randint(y, y + CELL)
+            vx_end = vx_start + local_rng.randint(-20, 20)
+            vy_end = vy_start + local_rng.randint(-20, 20)
+            pygame.draw.line(layer, shadow, (vx_start, vy_start), (vx_end, vy_end), 1)
+
+        for _ in range(5):
+            nx = local_rng.randint(x + 4, x + CELL - 4)
+            ny = local_rng.randint(y + 4, y + CELL - 4)
+            pygame.draw.circle(layer, crack_col, (nx, ny), 1)
+
+        if local_rng.random() > 0.75:
+            sx_crack = local_rng.randint(x + 15, x + CELL - 15)
+            sy_crack = local_rng.randint(y + 15, y + CELL - 15)
+            points = [(sx_crack, sy_crack)]
             for _ in range(3):
-                vx_start = local_rng.randint(x, x + CELL)
-                vy_start = local_rng.randint(y, y + CELL)
-                vx_end = vx_start + local_rng.randint(-20, 20)
-                vy_end = vy_start + local_rng.randint(-20, 20)
-                pygame.draw.line(self.screen, shadow, (vx_start, vy_start), (vx_end, vy_end), 1)
-
-            for _ in range(5):
-                nx = local_rng.randint(x + 4, x + CELL - 4)
-                ny = local_rng.randint(y + 4, y + CELL - 4)
-                pygame.draw.circle(self.screen, crack_col, (nx, ny), 1)
-
-            if local_rng.random() > 0.75:
-                sx_crack = local_rng.randint(x + 15, x + CELL - 15)
-                sy_crack = local_rng.randint(y + 15, y + CELL - 15)
-                points = [(sx_crack, sy_crack)]
-                for _ in range(3):
-                    sx_crack += local_rng.randint(-6, 6)
-                    sy_crack += local_rng.randint(-6, 6)
-                    points.append((sx_crack, sy_crack))
-                if len(points) > 1:
-                    pygame.draw.lines(self.screen, crack_col, False, points, 2)
-
-            pygame.draw.line(self.screen, highlight, (x, y), (x + CELL, y), 3)
-            pygame.draw.line(self.screen, highlight, (x, y), (x, y + CELL), 3)
-            pygame.draw.line(self.screen, shadow, (x, y + CELL), (x + CELL, y + CELL), 3)
-            pygame.draw.line(self.screen, shadow, (x + CELL, y), (x + CELL, y + CELL), 3)
-
-            rivet_col = (60, 60, 70)
-            offset = 6
-            for pos in [(x+offset, y+offset), (x+CELL-offset, y+offset), 
-                       (x+offset, y+CELL-offset), (x+CELL-offset, y+CELL-offset)]:
-                pygame.draw.circle(self.screen, rivet_col, pos, 2)
-                pygame.draw.circle(self.screen, (150, 150, 160), (pos[0]-1, pos[1]-1), 1)
-
-            seal_center = (x + 18, y + 18)
-            local_rng.seed(i * 100)
-            blob_points = []
-            for ang in range(0, 360, 45):
-                rad = local_rng.randint(11, 15)
-                bx = seal_center[0] + math.cos(math.radians(ang)) * rad
-                by = seal_center[1] + math.sin(math.radians(ang)) * rad
-                blob_points.append((bx, by))
-            pygame.draw.polygon(self.screen, (140, 20, 20), blob_points)
-            pygame.draw.circle(self.screen, (180, 40, 40), seal_center, 10)
-            pygame.draw.circle(self.screen, (220, 100, 100), (seal_center[0]-3, seal_center[1]-3), 2)
-
-            num_surf = self.fonts['small'].render(str(i), True, (255, 240, 200))
-            num_rect = num_surf.get_rect(center=seal_center)
-            self.screen.blit(num_surf, num_rect)
-
-            is_snake_head = i in state.snakes
-            is_ladder_base = i in state.ladders
-
-            if str(i) in state.challenges and not is_snake_head and not is_ladder_base:
-                cx, cy = x + CELL // 2, y + CELL // 2
-                float_y = math.sin(pygame.time.get_ticks() * 0.005 + i) * 6
-                
-                challenge_text = state.challenges[str(i)].lower()
-                scroll_to_use = self.assets.get('scroll_default')
-                
-                if "truth" in challenge_text or "kebenaran" in challenge_text:
-                    if self.assets.get('scroll_truth'):
-                        scroll_to_use = self.assets['scroll_truth']
-                elif "dare" in challenge_text or "tantangan" in challenge_text:
-                    if self.assets.get('scroll_dare'):
-                        scroll_to_use = self.assets['scroll_dare']
-                
-                if scroll_to_use:
-                    shadow_rect = pygame.Rect(cx - 10, cy + 18, 20, 6)
-                    pygame.draw.ellipse(self.screen, (0,0,0,60), shadow_rect)
-                    scroll_rect = scroll_to_use.get_rect(center=(cx, cy + float_y))
-                    self.screen.blit(scroll_to_use, scroll_rect)
-                else:
-                    draw_scroll(self.screen, cx, cy + float_y)
+                sx_crack += local_rng.randint(-6, 6)
+                sy_crack += local_rng.randint(-6, 6)
+                points.append((sx_crack, sy_crack))
+            if len(points) > 1:
+                pygame.draw.lines(layer, crack_col, False, points, 2)
+
+        pygame.draw.line(layer, highlight, (x, y), (x + CELL, y), 3)
+        pygame.draw.line(layer, highlight, (x, y), (x, y + CELL), 3)
+        pygame.draw.line(layer, shadow, (x, y + CELL), (x + CELL, y + CELL), 3)
+        pygame.draw.line(layer, shadow, (x + CELL, y), (x + CELL, y + CELL), 3)
+
+        rivet_col = (60, 60, 70)
+        offset = 6
+        for pos in [(x+offset, y+offset), (x+CELL-offset, y+offset), 
+                   (x+offset, y+CELL-offset), (x+CELL-offset, y+CELL-offset)]:
+            pygame.draw.circle(layer, rivet_col, pos, 2)
+            pygame.draw.circle(layer, (150, 150, 160), (pos[0]-1, pos[1]-1), 1)
+
+        seal_center = (x + 18, y + 18)
+        local_rng.seed(i * 100)
+        blob_points = []
+        for ang in range(0, 360, 45):
+            rad = local_rng.randint(11, 15)
+            bx = seal_center[0] + math.cos(math.radians(ang)) * rad
+            by = seal_center[1] + math.sin(math.radians(ang)) * rad
+            blob_points.append((bx, by))
+        pygame.draw.polygon(layer, (140, 20, 20), blob_points)
+        pygame.draw.circle(layer, (180, 40, 40), seal_center, 10)
+        pygame.draw.circle(layer, (220, 100, 100), (seal_center[0]-3, seal_center[1]-3), 2)
+
+        num_surf = render_text(self.fonts['small'], str(i), True, (255, 240, 200))
+        num_rect = num_surf.get_rect(center=seal_center)
+        layer.blit(num_surf, num_rect)
+
+    def draw_board_layer(self) -> None:
+        """Blit the cached marble chunks in view, rebuilding them if their inputs changed"""
+        key = self._board_cache_key()
+        if self.board_chunks is None or self.board_chunks_key != key:
+            self.board_chunks = BoardChunks(self.layout, self._paint_tile)
+            self.board_chunks_key = key
+
+        self.board_chunks.draw(self.screen, self.camera.world_view, self.origin)
+
+    def _tile_center(self, i: int) -> Tuple[int, int]:
+        x, y = self.layout.center(i)
+        return x + self.origin[0], y + self.origin[1]
+
+    def _scroll_tiles(self, state: GameState) -> List[int]:
+        tiles = []
+        for tile_key in state.challenges:
+            i = int(tile_key)
+            if i not in state.snakes and i not in state.ladders:
+                tiles.append(i)
+        return tiles
+
+    def sprite(self, name: str) -> Optional[Sprite]:
+        """
+        Sprite for an asset: from assets['atlas'] when there is one (trimmed,
+        on a shared page), else the standalone surface in assets
+        """
+        sprite = self.sprites.get(name)
+        if sprite is None:
+            atlas = self.assets.get('atlas')
+            if atlas is not None and name in atlas:
+                sprite = atlas[name]
+            elif self.assets.get(name):
+                sprite = Sprite.of(self.assets[name], name)
+            else:
+                return None
+            self.sprites[name] = sprite
+        return sprite
+
+    def avatar(self, idx: int, size: int) -> pygame.Surface:
+        """Hero avatar idx at size x size: atlas variant "hero_<idx>@<size>" or scaled once"""
+        key = ("avatar", idx, size)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            atlas = self.assets.get('atlas')
+            name = f"hero_{idx}@{size}"
+            if atlas is not None and name in atlas:
+                sprite = atlas[name]
+            else:
+                scaled = pygame.transform.smoothscale(self.assets['hero_avatars'][idx], (size, size))
+                sprite = Sprite.of(scaled, name)
+            self.sprites[key] = sprite
+        return sprite.surface
+
+    def _scroll_sprite(self, state: GameState, i: int) -> Optional[Sprite]:
+        kind = get_record(state.challenges[str(i)]).kind
+        if kind in ("truth", "dare"):
+            sprite = self.sprite(f"scroll_{kind}")
+            if sprite:
+                return sprite
+        return self.sprite('scroll_default')
+
+    def _scroll_world_rect(self, i: int) -> pygame.Rect:
+        sprite = self.sprite('scroll_truth') or self.sprite('scroll_default')
+        cx, cy = self.layout.center(i)
+        if sprite:
+            bounds = sprite.bounds(center=(cx, cy))
+        else:
+            bounds = pygame.Rect(cx - 12, cy - 10, 24, 20)
+        return pygame.Rect(bounds.x - 1, bounds.y - 7, bounds.width + 2, bounds.height + 14).union(
+            pygame.Rect(cx - 10, cy + 18, 20, 6))
+
+    def _index(self, state: GameState) -> SpatialGrid:
+        """Spatial index of every snake, ladder and scroll on the board (world rects)"""
+        key = (id(state.challenges), len(state.challenges),
+               tuple(state.snakes.items()), tuple(state.ladders.items()))
+        if self.board_index is None or self.board_index_key != key:
+            index = SpatialGrid(BOARD_CHUNK_TILES * self.layout.cell)
+            for start, end in state.ladders.items():
+                index.insert(("ladder", start, end), self._ladder_world_rect(start, end))
+            for start, end in state.snakes.items():
+                index.insert(("snake", start, end), self._snake_world_rect(start, end))
+            for i in self._scroll_tiles(state):
+                index.insert(("scroll", i), self._scroll_world_rect(i))
+            self.board_index = index
+            self.board_index_key = key
+        return self.board_index
+
+    def visible(self, state: GameState, kind: str) -> List[Tuple[int, ...]]:
+        """
+        ("ladder"/"snake", start, end) or ("scroll", tile) entries in view,
+        in board order. Classic fixed board: everything, without the index.
+        """
+        if self.camera.static:
+            if kind == "scroll":
+                return [(i,) for i in self._scroll_tiles(state)]
+            return list((state.snakes if kind == "snake" else state.ladders).items())
+        return [key[1:] for key in self._index(state).query(self.camera.world_view) if key[0] == kind]
+
+    def scroll_rects(self, state: GameState) -> List[pygame.Rect]:
+        """Screen area each visible floating scroll can cover (including its float range)"""
+        return [self._scroll_world_rect(i).move(self.origin) for (i,) in self.visible(state, "scroll")]
+
+    def draw_scrolls(self, state: GameState) -> None:
+        """Draw the floating challenge scrolls on top of the board layer"""
+        ticks = pygame.time.get_ticks()
+        blits = []
+        for (i,) in self.visible(state, "scroll"):
+            cx, cy = self._tile_center(i)
+            float_y = math.sin(ticks * 0.005 + i) * 6
+            sprite = self._scroll_sprite(state, i)
+
+            if sprite:
+                # Bayangan langsung, gulungannya sekaligus di akhir (tidak saling tumpang tindih)
+                shadow_rect = pygame.Rect(cx - 10, cy + 18, 20, 6)
+                pygame.draw.ellipse(self.screen, (0,0,0,60), shadow_rect)
+                blits.append(sprite.blit_args(sprite.rect(center=(cx, cy + float_y)).topleft))
+            else:
+                draw_scroll(self.screen, cx, cy + float_y)
+        self.screen.blits(blits, doreturn=False)
+
+    def draw_board(self, state: GameState) -> None:
+        """Draw the game board: cached marble layer plus floating scrolls"""
+        self.draw_board_layer()
+        self.draw_scrolls(state)
 
     def _board_xy(self, n: int) -> Tuple[int, int]:
-        """Wrapper for board_xy with local offset"""
-        x, y = board_xy(n, COLS, ROWS, CELL)
-        return x + SIDEBAR_LEFT_WIDTH, y
+        """Tile centre on the surface being drawn on"""
+        return self._tile_center(n)
+
+    def _snake_world_rect(self, start: int, end: int) -> pygame.Rect:
+        sx, sy = self.layout.center(start)
+        ex, ey = self.layout.center(end)
+        left, right = min(sx, ex) - 25 - 22, max(sx, ex) + 25 + 22 + 8
+        top, bottom = min(sy, ey) - 30, max(sy, ey) + 22 + 8
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def snake_rect(self, start: int, end: int) -> pygame.Rect:
+        """Screen area a snake can cover: wiggle, glow width, shadow and horns"""
+        return self._snake_world_rect(start, end).move(self.origin)
+
+    def _snake_geometry(self, start: int, end: int) -> SnakeGeometry:
+        """Precomputed body frames for a snake in world coordinates, built on first use"""
+        geometry = self.snake_geometry.get((start, end))
+        if geometry is None:
+            if len(self.snake_geometry) >= 64:
+                self.snake_geometry.clear()  # Old boards from previous games
+            sx, sy = self.layout.center(start)
+            ex, ey = self.layout.center(end)
+            geometry = SnakeGeometry(sx, sy, ex, ey)
+            self.snake_geometry[(start, end)] = geometry
+        return geometry
 
     def draw_snake(self, start: int, end: int, glow: bool = False) -> None:
         """
@@ -141,30 +359,16 @@ class GameRenderer:
             end: Tail position (lower tile number)
             glow: Whether to apply active interaction glow
         """
-        sx, sy = self._board_xy(start)
-        ex, ey = self._board_xy(end)
-        
+        geometry = self._snake_geometry(start, end)
         time_ms = pygame.time.get_ticks()
         breath = math.sin(time_ms * 0.005) * 2
-        
-        points = []
-        steps = 45
-        for i in range(steps):
-            t = i / (steps - 1)
-            bx = lerp(sx, ex, t)
-            by = lerp(sy, ey, t)
-            
-            freq = 3.5  
-            amp = 25    
-            curve = math.sin(t * math.pi * freq + (time_ms * 0.002)) * amp
-            
-            px = bx + curve
-            py = by 
-            points.append((px, py))
 
-        shadow_points = [(p[0] + 8, p[1] + 8) for p in points]
-        if len(points) > 1:
-            pygame.draw.lines(self.screen, (0, 0, 0, 80), False, shadow_points, 24)
+        frame = geometry.frame(time_ms)
+        ox, oy = self.origin
+        points = [(x + ox, y + oy) for x, y in geometry.points[frame]]
+        shadow = [(x + ox, y + oy) for x, y in geometry.shadow[frame]]
+
+        pygame.draw.lines(self.screen, (0, 0, 0, 80), False, shadow, 24)
 
         if glow:
             for w in range(20, 0, -4):
@@ -176,15 +380,8 @@ class GameRenderer:
         pygame.draw.lines(self.screen, (20, 80, 20), False, points, 16 + int(breath))
         pygame.draw.lines(self.screen, (40, 180, 60), False, points, 6)
 
-        for i in range(2, len(points) - 5, 4):
-            p_curr = points[i]
-            p_next = points[i+1]
-            dx, dy = p_next[0] - p_curr[0], p_next[1] - p_curr[1]
-            angle = math.atan2(dy, dx)
-            spine_len = 10
-            sx_spine = p_curr[0] + math.sin(angle) * spine_len
-            sy_spine = p_curr[1] - math.cos(angle) * spine_len
-            pygame.draw.circle(self.screen, (200, 190, 140), (int(sx_spine), int(sy_spine)), 3)
+        for dx, dy in geometry.dots[frame]:
+            pygame.draw.circle(self.screen, (200, 190, 140), (dx + ox, dy + oy), 3)
 
         hx, hy = points[0]
         head_color = (20, 100, 30)
@@ -204,6 +401,17 @@ class GameRenderer:
         pygame.draw.circle(self.screen, (0, 20, 0), (hx - 3, hy + 10), 1)
         pygame.draw.circle(self.screen, (0, 20, 0), (hx + 3, hy + 10), 1)
 
+    def _ladder_world_rect(self, start: int, end: int) -> pygame.Rect:
+        sx, sy = self.layout.center(start)
+        ex, ey = self.layout.center(end)
+        left, right = min(sx, ex) - 14 - 8, max(sx, ex) + 14 + 12
+        top, bottom = min(sy, ey) - 8, max(sy, ey) + 12
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def ladder_rect(self, start: int, end: int) -> pygame.Rect:
+        """Screen area of a ladder including rails, rung shadows and glow"""
+        return self._ladder_world_rect(start, end).move(self.origin)
+
     def draw_ladder(self, start: int, end: int, glow: bool = False) -> None:
         """
         Draw a ladder from start tile to end tile.
@@ -257,6 +465,15 @@ class GameRenderer:
             pygame.draw.circle(self.screen, glow_col, (int(l1[0]), int(l1[1])), 5)
             pygame.draw.circle(self.screen, glow_col, (int(r2[0]), int(r2[1])), 5)
 
+    def pion_rect(self, state: GameState, idx: int, offset: int) -> pygame.Rect:
+        """Screen area of a standing pion including bounce, pulse and turn aura"""
+        x, y = self._board_xy(state.positions[idx])
+        cx = x + offset
+        r = int(12 * max(1.0, state.pulse_scale[idx]))
+        half_w = max(r + 10, 32)
+        top = y - 6 - r - 20
+        return pygame.Rect(cx - half_w, top, half_w * 2, (y + 40) - top)
+
     def draw_pion(self, state: GameState, idx: int, offset: int) -> None:
         """
         Draw a player's pion (avatar) on the board.
@@ -266,8 +483,7 @@ class GameRenderer:
             idx: Index of the player
             offset: Pixel offset for centering/stacking
         """
-        x, y = board_xy(state.positions[idx], COLS, ROWS, CELL)
-        x += SIDEBAR_LEFT_WIDTH
+        x, y = self._board_xy(state.positions[idx])
         
         bounce = int(6 * abs(math.sin(state.bounce_phase[idx])))
         state.bounce_phase[idx] += BOUNCE_SPEED
@@ -358,6 +574,20 @@ class GameRenderer:
 
         self.screen.blit(overlay, (0,0))
 
+    def _header_fonts(self) -> Tuple[pygame.font.Font, pygame.font.Font, pygame.font.Font]:
+        """Header fonts, loaded once (a new Font per frame also defeats the text cache)"""
+        if self.header_fonts is None:
+            try:
+                lbl_font = pygame.font.Font(FONT_FILE, 10) 
+                name_font = pygame.font.Font(FONT_FILE, 22) # Size 22 jauh lebih rapi daripada 48
+                info_font = pygame.font.Font(FONT_FILE, 12)
+            except:
+                lbl_font = self.fonts['small']
+                name_font = self.fonts['font']
+                info_font = self.fonts['small']
+            self.header_fonts = (lbl_font, name_font, info_font)
+        return self.header_fonts
+
     def draw_current_turn_header(self, state):
         """
         [REMASTERED] Header Player yang Estetik, Rapi, dan Medieval.
@@ -388,24 +618,16 @@ class GameRenderer:
         pygame.draw.circle(self.screen, curr_col, (av_center_x, av_center_y), (avatar_size // 2), 1)
         
         if state.turn < len(self.assets.get('hero_avatars', [])):
-            raw_img = self.assets['hero_avatars'][state.turn]
-            avatar_img = pygame.transform.smoothscale(raw_img, (avatar_size - 6, avatar_size - 6))
+            avatar_img = self.avatar(state.turn, avatar_size - 6)
             av_rect = avatar_img.get_rect(center=(av_center_x, av_center_y))
             self.screen.blit(avatar_img, av_rect)
 
         text_start_x = av_center_x + (avatar_size // 2) + 12
         text_center_y = av_center_y 
         
-        try:
-            lbl_font = pygame.font.Font(FONT_FILE, 10) 
-            name_font = pygame.font.Font(FONT_FILE, 22) # Size 22 jauh lebih rapi daripada 48
-            info_font = pygame.font.Font(FONT_FILE, 12)
-        except:
-            lbl_font = self.fonts['small']
-            name_font = self.fonts['font']
-            info_font = self.fonts['small']
-
-        lbl_surf = lbl_font.render("CURRENT TURN", True, (150, 160, 170))
+        lbl_font, name_font, info_font = self._header_fonts()
+
+        lbl_surf = render_text(lbl_font, "CURRENT TURN", True, (150, 160, 170))
         self.screen.blit(lbl_surf, (text_start_x, text_center_y - 24))
         
         p_name = state.players[state.turn]
@@ -413,14 +635,14 @@ class GameRenderer:
         text_color = (245, 235, 215) if lum < 120 else (20, 20, 20)
         if lum > 120: text_color = (240, 240, 230)
 
-        name_shadow = name_font.render(p_name, True, (0, 0, 0))
+        name_shadow = render_text(name_font, p_name, True, (0, 0, 0))
         self.screen.blit(name_shadow, (text_start_x + 1, text_center_y - 8))
         
-        name_surf = name_font.render(p_name, True, text_color)
+        name_surf = render_text(name_font, p_name, True, text_color)
         self.screen.blit(name_surf, (text_start_x, text_center_y - 9))
         
-        info_text = f"Tile: {state.positions[state.turn]} / {TOTAL}"
-        info_surf = info_font.render(info_text, True, (180, 180, 180))
+        info_text = f"Tile: {state.positions[state.turn]} / {self.layout.total}"
+        info_surf = render_text(info_font, info_text, True, (180, 180, 180))
         self.screen.blit(info_surf, (text_start_x, text_center_y + 14))
 
         bar_x = card_x + 10
@@ -430,7 +652,7 @@ class GameRenderer:
         
         pygame.draw.rect(self.screen, (20, 20, 30), (bar_x, bar_y, bar_w, bar_h), border_radius=2)
         
-        progress = state.positions[state.turn] / TOTAL
+        progress = state.positions[state.turn] / self.layout.total
         fill_w = int(bar_w * progress)
         if fill_w > 0:
             glow_surf = pygame.Surface((fill_w + 4, bar_h + 4), pygame.SRCALPHA)
@@ -440,10 +662,11 @@ class GameRenderer:
             pygame.draw.rect(self.screen, curr_col, (bar_x, bar_y, fill_w, bar_h), border_radius=2)
 
     def draw_panel(self, state, sidebar_helper):
-        full_log = state.log_manager.get_full_log() 
+        log_manager = state.log_manager
         sidebar_rect = pygame.Rect(WIDTH - SIDEBAR_WIDTH, 0, SIDEBAR_WIDTH, HEIGHT)
 
-        current_len = len(full_log)
+        # Revision, not length: once the log is full its length stops changing
+        current_len = log_manager.revision
         if current_len != self.last_history_len:
             self.sidebar_snapshot = None 
 
@@ -468,9 +691,10 @@ class GameRenderer:
         self.draw_current_turn_header(state)
 
         sidebar_helper.draw_history_ui(
-            self.screen, full_log, state.players, state.colors, state.challenges, 
-            start_y=135, sidebar_width=SIDEBAR_WIDTH, width_total=WIDTH
+            self.screen, None, state.players, state.colors, state.challenges, 
+            start_y=135, sidebar_width=SIDEBAR_WIDTH, width_total=WIDTH,
+            blocks=log_manager.iter_recent_blocks()
         )
 
         self.sidebar_snapshot = self.screen.subsurface(sidebar_rect).copy()
-        state.log_manager.sidebar_snapshot = self.sidebar_snapshot
+        log_manager.sidebar_snapshot = self.sidebar_snapshot
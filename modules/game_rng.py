@@ -0,0 +1,37 @@
+"""
+Acakan Sesi - Semua angka acak satu sesi berasal dari satu seed
+
+Setiap keperluan punya stream random.Random sendiri yang diturunkan dari
+seed sesi, jadi pemakaian di satu tempat tidak menggeser yang lain:
+jumlah frame animasi (efek) tidak mengubah kartu yang keluar, dan kartu
+yang dilewati (NEXT) tidak mengubah lemparan dadu berikutnya.
+"""
+import random
+from typing import Optional
+
+STREAMS = ("board", "deck", "dice", "fx")
+
+
+class SessionRandom:
+    """
+    Stream acak per keperluan dari satu seed.
+
+    board: susunan ular/tangga dan penyebaran kartu
+    deck:  kocok dan ambil kartu
+    dice:  lemparan dadu (GameEngine)
+    fx:    kosmetik saja (wajah dadu saat dikocok, goyangan layar)
+    """
+
+    board: random.Random
+    deck: random.Random
+    dice: random.Random
+    fx: random.Random
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2 ** 32)
+        for name in STREAMS:
+            # Seed string di-hash sha512 oleh random, sama di setiap proses
+            setattr(self, name, random.Random(f"{self.seed}:{name}"))
+
+    def __repr__(self) -> str:
+        return f"SessionRandom(seed={self.seed})"
@@ -0,0 +1,432 @@
+"""
+Server Multi-Meja - Banyak sesi game dalam satu proses asyncio
+
+Setiap meja adalah GameEngine headless dengan GameState dan SessionRandom
+sendiri. Deck tantangan dimuat sekali per level (ChallengeDeck template)
+dan dipakai bersama; meja hanya menyimpan tumpukan kocoknya sendiri
+(lihat ChallengeDeck.fork).
+
+Protokol: satu objek JSON per baris di atas TCP. Setiap permintaan
+dibalas satu baris {"ok": true, ...} atau {"ok": false, "error": ...};
+"id" dari permintaan ikut dikembalikan. Klien lain yang sudah "join" ke
+meja yang sama menerima {"event": ...} untuk setiap langkah giliran.
+
+    {"op": "create", "players": ["Ani", "Budi"], "level": 1, "seed": 42}
+    {"op": "join", "table": 1}
+    {"op": "roll", "table": 1}       lempar dadu, jalan, ular/tangga
+    {"op": "next", "table": 1}       ganti kartu (tombol NEXT)
+    {"op": "accept", "table": 1}     terima kartu, giliran selesai
+    {"op": "state", "table": 1}
+    {"op": "close", "table": 1}
+    {"op": "stats"}
+
+Meja ditutup dengan "close", saat klien terakhirnya terputus, atau
+setelah SERVER_TABLE_IDLE detik tanpa permintaan (termasuk game yang
+sudah selesai tapi kliennya masih tersambung).
+
+Menjalankan server:
+    python -m modules.game_server --port 8765
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from typing import Any, Dict, List, Optional, Set
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_constants import BASE_DIR, SERVER_HOST, SERVER_PORT, SERVER_MAX_TABLES, SERVER_TABLE_IDLE
+from modules.game_logger import logger
+from modules.game_rng import SessionRandom
+from modules.game_deck import ChallengeDeck
+from modules.game_engine import GameEngine
+from modules.game_utils import load_level_challenges
+from modules.challenge_index import ChallengeRecord
+
+PHASE_ROLL = "roll"
+PHASE_CARD = "card"
+PHASE_OVER = "over"
+
+MAX_LINE = 64 * 1024
+LEVELS = (1, 2, 3)  # challenges_lv1..3.json; level lain tidak boleh mengisi cache template
+TABLE_OPS = ("join", "state", "close", "roll", "next", "accept")
+
+
+class ProtocolError(Exception):
+    """Permintaan yang tidak bisa dijalankan; dikirim ke klien sebagai error"""
+
+
+def card_info(record: Optional[ChallengeRecord]) -> Optional[Dict[str, Any]]:
+    if record is None:
+        return None
+    return {"text": record.clean_text, "kind": record.kind, "timer": record.timer, "effect": record.effect}
+
+
+class ChallengeLibrary:
+    """Satu ChallengeDeck template per level, dimuat saat pertama dipakai"""
+
+    def __init__(self, base_dir: str = BASE_DIR) -> None:
+        self.base_dir = base_dir
+        self.templates: Dict[int, Optional[ChallengeDeck]] = {}
+
+    def template(self, level: int) -> Optional[ChallengeDeck]:
+        if level not in self.templates:
+            data = load_level_challenges(self.base_dir, level)
+            self.templates[level] = ChallengeDeck(data, verbose=False) if data else None
+        return self.templates[level]
+
+
+class Table:
+    """Satu meja: engine + fase giliran + klien yang mengikuti"""
+
+    def __init__(self, table_id: int, engine: GameEngine, seed: int) -> None:
+        self.id = table_id
+        self.engine = engine
+        self.seed = seed
+        self.phase = PHASE_ROLL
+        self.card: Optional[ChallengeRecord] = None
+        self.watchers: Set["ClientConnection"] = set()
+        self.last_active = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.engine.state
+        return {
+            "table": self.id,
+            "players": state.players,
+            "positions": state.positions,
+            "turn": state.turn,
+            "phase": self.phase,
+            "card": card_info(self.card),
+            "winner": self.engine.winner,
+            "turns_played": self.engine.turns_played,
+        }
+
+    def board(self) -> Dict[str, Any]:
+        state = self.engine.state
+        return {"snakes": state.snakes, "ladders": state.ladders,
+                "challenges": sorted(int(tile) for tile in state.challenges)}
+
+    # ------------------------------------------------------------------
+    # Giliran (urutan langkah sama dengan play_turn di game.py)
+    # ------------------------------------------------------------------
+    def roll(self) -> Dict[str, Any]:
+        if self.phase != PHASE_ROLL:
+            raise ProtocolError(f"table {self.id} is waiting for {self.phase}")
+        engine = self.engine
+        player = engine.begin_turn()
+        dice = engine.roll_dice()
+        start, landed = engine.advance(dice)
+        jump = engine.resolve_jump()
+        result = {"player": player, "dice": dice, "start": start, "landed": landed,
+                  "jump": jump[0] if jump else None, "after_jump": engine.position}
+        self.card = engine.pending_challenge()
+        if self.card is not None:
+            self.phase = PHASE_CARD
+            result["card"] = card_info(self.card)
+        else:
+            result.update(self._finish())
+        return result
+
+    def next_card(self) -> Dict[str, Any]:
+        self._need_card()
+        self.card = self.engine.skip_challenge()
+        return {"card": card_info(self.card)}
+
+    def accept(self) -> Dict[str, Any]:
+        self._need_card()
+        record, effect, final = self.engine.accept_challenge()
+        result = {"effect": effect, "final": final}
+        result.update(self._finish())
+        return result
+
+    def _need_card(self) -> None:
+        if self.phase != PHASE_CARD:
+            raise ProtocolError(f"table {self.id} has no card waiting")
+
+    def _finish(self) -> Dict[str, Any]:
+        self.card = None
+        won = self.engine.finish_turn()
+        self.phase = PHASE_OVER if self.engine.winner is not None else PHASE_ROLL
+        return {"won": won}
+
+
+class GameServer:
+    """Semua meja dan handler protokolnya; tidak ada I/O selain di ClientConnection"""
+
+    def __init__(self, library: Optional[ChallengeLibrary] = None,
+                 max_tables: int = SERVER_MAX_TABLES, idle_timeout: float = SERVER_TABLE_IDLE) -> None:
+        self.library = library or ChallengeLibrary()
+        self.max_tables = max_tables
+        self.idle_timeout = idle_timeout
+        self.tables: Dict[int, Table] = {}
+        self.next_id = 1
+        self.requests = 0
+        self.turns = 0
+        self.started = time.perf_counter()
+        self.server: Optional[asyncio.base_events.Server] = None
+        self.sweeper: Optional["asyncio.Task[None]"] = None
+
+    # ------------------------------------------------------------------
+    # Operasi
+    # ------------------------------------------------------------------
+    def create_table(self, players: List[str], level: int = 1, seed: Optional[int] = None) -> Table:
+        if level not in LEVELS:
+            raise ProtocolError(f"level must be one of {', '.join(map(str, LEVELS))}")
+        if len(self.tables) >= self.max_tables and not self.expire_idle():
+            raise ProtocolError("server is full")
+        if not players or len(players) > 4 or not all(isinstance(p, str) for p in players):
+            raise ProtocolError("players must be a list of 1-4 names")
+        streams = SessionRandom(seed)
+        engine = GameEngine.new_game(list(players), level, streams=streams, record_log=False,
+                                     deck_template=self.library.template(level))
+        table = Table(self.next_id, engine, streams.seed)
+        self.tables[table.id] = table
+        self.next_id += 1
+        return table
+
+    def table(self, request: Dict[str, Any]) -> Table:
+        table = self.tables.get(request.get("table"))
+        if table is None:
+            raise ProtocolError(f"no table {request.get('table')}")
+        return table
+
+    def handle(self, client: "ClientConnection", request: Dict[str, Any]) -> Dict[str, Any]:
+        """Jalankan satu permintaan -> balasan (tanpa "ok"/"id")"""
+        self.requests += 1
+        op = request.get("op")
+
+        if op == "create":
+            table = self.create_table(request.get("players") or [], int(request.get("level", 1)),
+                                      request.get("seed"))
+            table.watchers.add(client)
+            client.tables.add(table.id)
+            return {"table": table.id, "seed": table.seed, "board": table.board(), "state": table.snapshot()}
+
+        if op == "stats":
+            return self.stats()
+        if op not in TABLE_OPS:
+            raise ProtocolError(f"unknown op {op!r}")
+
+        table = self.table(request)
+        table.last_active = time.monotonic()
+        if op == "join":
+            table.watchers.add(client)
+            client.tables.add(table.id)
+            return {"board": table.board(), "state": table.snapshot()}
+        if op == "state":
+            return {"state": table.snapshot()}
+        if op == "close":
+            self.close_table(table)
+            return {}
+
+        if op == "roll":
+            result = table.roll()
+        elif op == "next":
+            result = table.next_card()
+        else:
+            result = table.accept()
+
+        if "won" in result:
+            self.turns += 1
+        result["state"] = table.snapshot()
+        self.broadcast(table, dict(result, event=op), skip=client)
+        return result
+
+    def close_table(self, table: Table) -> None:
+        self.broadcast(table, {"event": "close", "table": table.id})
+        for client in table.watchers:
+            client.tables.discard(table.id)
+        table.watchers.clear()
+        self.tables.pop(table.id, None)
+
+    def leave(self, client: "ClientConnection") -> None:
+        """Klien terputus: lepas dari semua mejanya; meja yang tidak punya klien lagi dibuang"""
+        for table_id in list(client.tables):
+            table = self.tables.get(table_id)
+            if table is None:
+                continue
+            table.watchers.discard(client)
+            if not table.watchers:
+                self.tables.pop(table_id, None)
+        client.tables.clear()
+
+    def expire_idle(self, now: Optional[float] = None) -> int:
+        """Tutup meja tanpa permintaan selama idle_timeout detik -> jumlah yang ditutup"""
+        now = time.monotonic() if now is None else now
+        idle = [table for table in self.tables.values() if now - table.last_active >= self.idle_timeout]
+        for table in idle:
+            self.close_table(table)
+        if idle:
+            logger.info(f"Game server closed {len(idle)} idle tables")
+        return len(idle)
+
+    def broadcast(self, table: Table, message: Dict[str, Any], skip: Optional["ClientConnection"] = None) -> None:
+        if len(table.watchers) <= (1 if skip in table.watchers else 0):
+            return
+        line = (json.dumps(dict(message, table=table.id)) + "\n").encode("utf-8")
+        for client in table.watchers:
+            if client is not skip:
+                client.send_line(line)
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {"tables": len(self.tables), "requests": self.requests, "turns": self.turns,
+                "uptime": round(elapsed, 3)}
+
+    # ------------------------------------------------------------------
+    # Jaringan
+    # ------------------------------------------------------------------
+    async def start(self, host: str = SERVER_HOST, port: int = SERVER_PORT) -> int:
+        """Mulai mendengarkan; port 0 = port bebas. Return port yang dipakai"""
+        self.server = await asyncio.start_server(self._on_connect, host, port, limit=MAX_LINE)
+        port = self.server.sockets[0].getsockname()[1]
+        self.sweeper = asyncio.get_running_loop().create_task(self._sweep())
+        logger.info(f"Game server listening on {host}:{port}")
+        return port
+
+    async def _sweep(self) -> None:
+        while True:
+            await asyncio.sleep(min(60.0, self.idle_timeout))
+            self.expire_idle()
+
+    async def stop(self) -> None:
+        if self.sweeper is not None:
+            self.sweeper.cancel()
+            self.sweeper = None
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client = ClientConnection(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    client.send({"ok": False, "error": "request too long"})
+                    break
+                if not line:
+                    break
+                client.send(self._reply(client, line))
+                await client.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(client)
+            writer.close()
+
+    def _reply(self, client: "ClientConnection", line: bytes) -> Dict[str, Any]:
+        request: Dict[str, Any] = {}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ProtocolError("request must be a JSON object")
+            reply = dict(self.handle(client, request), ok=True)
+        except (ProtocolError, ValueError, TypeError) as e:
+            reply = {"ok": False, "error": str(e)}
+        except Exception as e:
+            logger.error(f"Game server request {request.get('op')!r} failed: {e}")
+            reply = {"ok": False, "error": "internal error"}
+        if "id" in request:
+            reply["id"] = request["id"]
+        return reply
+
+
+class ClientConnection:
+    """Sisi server dari satu koneksi klien"""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        self.writer = writer
+        self.tables: Set[int] = set()
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.send_line((json.dumps(message) + "\n").encode("utf-8"))
+
+    def send_line(self, line: bytes) -> None:
+        if not self.writer.is_closing():
+            self.writer.write(line)
+
+    async def drain(self) -> None:
+        await self.writer.drain()
+
+
+class GameClient:
+    """
+    Klien tipis: request() mengirim satu perintah dan menunggu balasannya.
+    Event dari klien lain di meja yang sama dikumpulkan di `events`.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.events: List[Dict[str, Any]] = []
+        self.next_id = 1
+
+    @classmethod
+    async def connect(cls, host: str = SERVER_HOST, port: int = SERVER_PORT) -> "GameClient":
+        reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        request_id = self.next_id
+        self.next_id += 1
+        self.writer.write((json.dumps(dict(fields, op=op, id=request_id)) + "\n").encode("utf-8"))
+        await self.writer.drain()
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection")
+            message = json.loads(line)
+            if "event" in message and "id" not in message:
+                self.events.append(message)
+                continue
+            if message.get("id") == request_id:
+                return message
+
+    async def play_turn(self, table: int, accept_after: int = 0) -> Dict[str, Any]:
+        """Roll, lalu NEXT `accept_after` kali dan terima kartu jika ada -> balasan terakhir"""
+        reply = await self.request("roll", table=table)
+        nexts = 0
+        while reply.get("ok") and reply["state"]["phase"] == PHASE_CARD:
+            if nexts < accept_after:
+                nexts += 1
+                reply = await self.request("next", table=table)
+            else:
+                reply = await self.request("accept", table=table)
+        return reply
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str, port: int) -> None:
+    server = GameServer()
+    await server.start(host, port)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Host many game tables in one process")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,7 +20,7 @@ class GameState:
     shake_decay: float
     snakes: Dict[int, int]
     ladders: Dict[int, int]
-    challenges: Dict[str, str]
+    challenges: Dict[str, int]  # tile -> ID record di challenge_index
     log_manager: LogManager
 
     def __init__(self, players: List[str], game_level: int) -> None:
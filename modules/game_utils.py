@@ -3,14 +3,15 @@ Fungsi Utilitas Game
 """
 import os
 import sys
+import json
 import random
 import re
-import pygame
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from game_constants import TOTAL
+from modules.game_logger import logger
 
 def resource_path(relative_path):
     """ Mencari path file yang benar (baik saat dev maupun di dalam .exe) """
@@ -21,6 +22,24 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
+def load_level_challenges(base_dir, level):
+    """Isi challenges_lv{level}.json, atau challenges.json jika tidak ada ({} jika keduanya gagal)"""
+    filename = f"challenges_lv{level}.json"
+    try:
+        with open(os.path.join(base_dir, filename), encoding="utf-8") as f:
+            data = json.load(f)
+        logger.info(f"Berhasil memuat tantangan Level {level}")
+        return data
+    except FileNotFoundError:
+        logger.warning(f"File {filename} tidak ada, menggunakan default.")
+    except ValueError as e:
+        logger.warning(f"File {filename} rusak ({e}), menggunakan default.")
+    try:
+        with open(os.path.join(base_dir, "challenges.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 def get_timer_duration(text):
     """Parse durasi timer dari teks tantangan"""
     text = text.lower()
@@ -59,10 +78,10 @@ def lerp(a, b, t):
     """Linear interpolation antara a dan b dengan faktor t (0.0 - 1.0)"""
     return a + (b - a) * t
 
-def overflow_reflect(target):
+def overflow_reflect(target, total=TOTAL):
     """Pantulkan jika target melewati TOTAL (overflow handling)"""
-    if target > TOTAL:
-        return TOTAL - (target - TOTAL)
+    if target > total:
+        return total - (target - total)
     return target
 
 def play_sound(snd):
@@ -73,39 +92,14 @@ def play_sound(snd):
         except Exception:
             pass
 
-def fade_to_dark(screen, width, height):
-    """Transisi Menu -> Gelap (Durasi ~1.5 Detik)"""
-    overlay = pygame.Surface((width, height))
-    medieval_dark = (15, 12, 10) 
-    overlay.fill(medieval_dark)
-    
-    for alpha in range(0, 255, 3):
-        overlay.set_alpha(alpha)
-        screen.blit(overlay, (0, 0))
-        pygame.display.flip()
-        pygame.time.delay(18) # Semakin besar angka ini, semakin lambat
-        
-    return overlay
-
-def fade_from_dark(screen, overlay, width, height):
-    """Transisi Gelap -> Game Board (Durasi ~1.5 Detik)"""
-    board_snapshot = screen.copy()
-
-    for alpha in range(255, -1, -3):
-        screen.blit(board_snapshot, (0, 0))
-        overlay.set_alpha(alpha)
-        screen.blit(overlay, (0, 0))
-        
-        pygame.display.flip()
-        pygame.time.delay(18)
-
-def distribute_random_challenges(deck_system, ref_snakes, ref_ladders, amount=30):
+def distribute_random_challenges(deck_system, ref_snakes, ref_ladders, amount=30, rng=None):
     """Distribusikan tantangan secara acak ke kotak kosong di board"""
+    rng = rng or random
     distributed = {}
     
     forbidden = set(ref_snakes.keys()) | set(ref_ladders.keys()) | {1, TOTAL}
     available = [i for i in range(2, TOTAL) if i not in forbidden]
-    random.shuffle(available)
+    rng.shuffle(available)
     
     count = 0
     last_t = -1
@@ -113,7 +107,7 @@ def distribute_random_challenges(deck_system, ref_snakes, ref_ladders, amount=30
         if count >= amount: break
         
         if abs(t - last_t) > 1:
-            card_type = random.choice(["truth", "dare"])
+            card_type = rng.choice(["truth", "dare"])
             distributed[str(t)] = deck_system.draw_card(card_type)
             last_t = t
             count += 1
@@ -2,13 +2,14 @@
 Victory Screen - Tampilan kemenangan
 """
 import pygame
-import random
 import math
 import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from game_constants import WIDTH, HEIGHT, FONT_FILE
+from game_constants import WIDTH, HEIGHT, FONT_FILE, VICTORY_EMBERS
+from modules.particles import ParticleField, ParticleSprites, circle_sprite
+from modules.text_cache import render_text
 
 def show_victory_screen(screen, winner_name, winner_color):
     """
@@ -25,16 +26,13 @@ def show_victory_screen(screen, winner_name, winner_color):
         sub_font = pygame.font.SysFont("georgia", 30)
         hint_font = pygame.font.SysFont("arial", 12)
 
-    embers = []
-    for _ in range(150):
-        embers.append({
-            'x': random.randint(0, WIDTH),
-            'y': random.randint(0, HEIGHT),
-            'speed': random.uniform(0.5, 2.0),
-            'size': random.randint(2, 4),
-            'alpha': random.randint(50, 255),
-            'drift': random.uniform(-0.5, 0.5) # Gerakan kiri-kanan angin
-        })
+    embers = ParticleField(
+        VICTORY_EMBERS, WIDTH, HEIGHT,
+        speed=(0.5, 2.0), size=(2, 4), alpha=(50, 255),
+        drift=(-0.5, 0.5), # Gerakan kiri-kanan angin
+        fade=0.5, respawn_alpha=255,
+    )
+    ember_sprites = ParticleSprites(circle_sprite, [(255, 200, 100)], 2, 4, alpha_levels=32)
 
     clock = pygame.time.Clock()
     running_victory = True
@@ -50,23 +48,8 @@ def show_victory_screen(screen, winner_name, winner_color):
 
         screen.fill((10, 8, 8)) # Hampir hitam, sedikit merah gelap
 
-        for p in embers:
-            p['y'] -= p['speed'] # Naik ke atas
-            p['x'] += p['drift']
-            
-            if p['y'] < -10:
-                p['y'] = HEIGHT + 10
-                p['x'] = random.randint(0, WIDTH)
-                p['alpha'] = 255
-            
-            if p['alpha'] > 0:
-                p['alpha'] -= 0.5
-            
-            s = pygame.Surface((p['size']*2, p['size']*2), pygame.SRCALPHA)
-            
-            col_core = (255, 200, 100, int(p['alpha']))
-            pygame.draw.circle(s, col_core, (p['size'], p['size']), p['size'])
-            screen.blit(s, (p['x'], p['y']))
+        embers.step() # Naik ke atas, bara yang lewat atas muncul lagi terang di bawah
+        embers.draw(screen, ember_sprites)
 
         center_x, center_y = WIDTH // 2, HEIGHT // 2 - 30
         
@@ -96,9 +79,9 @@ def show_victory_screen(screen, winner_name, winner_color):
         pulse_val += 0.05
         
         title_col = (180, 170, 170) 
-        title_surf = title_font.render("VICTORY", True, title_col)
+        title_surf = render_text(title_font, "VICTORY", True, title_col)
         
-        shadow_surf = title_font.render("VICTORY", True, (10, 5, 5))
+        shadow_surf = render_text(title_font, "VICTORY", True, (10, 5, 5))
         screen.blit(shadow_surf, (center_x - title_surf.get_width()//2 + 4, center_y + 84))
         screen.blit(title_surf, (center_x - title_surf.get_width()//2, center_y + 80))
         
@@ -106,10 +89,10 @@ def show_victory_screen(screen, winner_name, winner_color):
         pygame.draw.line(screen, (150, 50, 50), (center_x - line_w/2, center_y + 160), (center_x + line_w/2, center_y + 160), 3)
 
         name_text = f"Lord {winner_name} has claimed the throne."
-        name_surf = sub_font.render(name_text, True, (200, 180, 100)) # Emas Kusam
+        name_surf = render_text(sub_font, name_text, True, (200, 180, 100)) # Emas Kusam
         screen.blit(name_surf, (center_x - name_surf.get_width()//2, center_y + 180))
         
-        hint_surf = hint_font.render("[ PRESS ANY KEY TO END THE CHRONICLE ]", True, (80, 80, 80))
+        hint_surf = render_text(hint_font, "[ PRESS ANY KEY TO END THE CHRONICLE ]", True, (80, 80, 80))
         screen.blit(hint_surf, (center_x - hint_surf.get_width()//2, HEIGHT - 40))
 
         pygame.display.flip()
@@ -2,18 +2,20 @@ import pygame
 import os
 
 class LeftSidebar:
-    def __init__(self, width, height, image_dir, font_path=None):
+    def __init__(self, width, height, image_dir, font_path=None, load_image=pygame.image.load, bg_image=None):
         self.width = width
         self.height = height
         
-        self.bg_image = None
-        try:
-            bg_path = os.path.join(image_dir, "sidebar_bg.png")
-            if os.path.exists(bg_path):
-                raw_bg = pygame.image.load(bg_path).convert()
-                self.bg_image = pygame.transform.smoothscale(raw_bg, (width, height))
-        except:
-            pass
+        # bg_image: background yang sudah di-scale (mis. dari AssetLoader + cache disk)
+        self.bg_image = bg_image
+        if bg_image is None:
+            try:
+                bg_path = os.path.join(image_dir, "sidebar_bg.png")
+                if os.path.exists(bg_path):
+                    raw_bg = load_image(bg_path).convert()
+                    self.bg_image = pygame.transform.smoothscale(raw_bg, (width, height))
+            except:
+                pass
 
         if font_path and os.path.exists(font_path):
             self.title_font = pygame.font.Font(font_path, 22)
@@ -1,10 +1,12 @@
 import pygame
 import sys
 import os
-import random
 import math
 import time
 
+from modules.text_cache import render_text
+from modules.particles import ParticleField, ParticleSprites, centered_sprite
+
 THEMES = {
     "MEDIEVAL": {
         "text": (255, 230, 200), 
@@ -47,6 +49,31 @@ def draw_cloud(surface, x, y, size, color):
     pygame.draw.circle(surface, color, (x + size, y + size//4), int(size * 0.8))
     pygame.draw.circle(surface, color, (x - size, y + size//4), int(size * 0.8))
 
+def draw_ember(surface, x, y, size, color):
+    """Bara api untuk tema Medieval"""
+    pygame.draw.circle(surface, color, (x, y), size)
+
+# Sprite partikel per tema, dibuat sekali saat tema pertama kali tampil
+_theme_sprites = {}
+_bg_overlays = {}
+
+def theme_sprites(theme_key):
+    sprites = _theme_sprites.get(theme_key)
+    if sprites is None:
+        if theme_key == "MEDIEVAL":
+            # Bara berkedip: warna & radius diacak tiap frame (flicker)
+            colors = [(255, g, 50) for g in range(100, 201, 20)]
+            sprites = ParticleSprites(centered_sprite(draw_ember), colors, 2, 4)
+        elif theme_key == "RELAXING":
+            sprites = ParticleSprites(centered_sprite(draw_cloud), [(255, 255, 255)], 2, 5)
+        else:
+            sprites = ParticleSprites(centered_sprite(draw_heart, scale=3), [THEMES[theme_key]["accent"]], 2, 5)
+        _theme_sprites[theme_key] = sprites
+    return sprites
+
+def make_menu_particles(width, height, count=60):
+    return ParticleField(count, width, height, speed=(1, 3), size=(2, 5), sway=0.5, margin=20)
+
 def render_background(screen, width, height, particles, bg_images):
     theme = THEMES[current_theme_key]
     
@@ -54,18 +81,24 @@ def render_background(screen, width, height, particles, bg_images):
     
     if bg_img:
         screen.blit(bg_img, (0, 0))
-        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
-        if current_theme_key == "MEDIEVAL": overlay.fill((0, 0, 0, 80)) 
-        elif current_theme_key == "RELAXING": overlay.fill((255, 255, 255, 20)) # Overlay putih tipis
-        else: overlay.fill((255, 200, 200, 30))
+        overlay = _bg_overlays.get((current_theme_key, width, height))
+        if overlay is None:
+            overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+            if current_theme_key == "MEDIEVAL": overlay.fill((0, 0, 0, 80)) 
+            elif current_theme_key == "RELAXING": overlay.fill((255, 255, 255, 20)) # Overlay putih tipis
+            else: overlay.fill((255, 200, 200, 30))
+            _bg_overlays[(current_theme_key, width, height)] = overlay
         screen.blit(overlay, (0,0))
     else:
         if current_theme_key == "MEDIEVAL":
             screen.fill(theme["fallback_top"])
-            glow = pygame.Surface((width, 200), pygame.SRCALPHA)
-            for i in range(200):
-                alpha = int((i/200) * 100)
-                pygame.draw.line(glow, (*theme["accent"], alpha), (0, i), (width, i))
+            glow = _bg_overlays.get(("glow", width))
+            if glow is None:
+                glow = pygame.Surface((width, 200), pygame.SRCALPHA)
+                for i in range(200):
+                    alpha = int((i/200) * 100)
+                    pygame.draw.line(glow, (*theme["accent"], alpha), (0, i), (width, i))
+                _bg_overlays[("glow", width)] = glow
             screen.blit(glow, (0, height - 200))
         elif current_theme_key == "RELAXING":
             screen.fill(theme["fallback_top"])
@@ -74,21 +107,14 @@ def render_background(screen, width, height, particles, bg_images):
             screen.fill(theme["fallback_top"])
             pygame.draw.rect(screen, theme["fallback_bot"], (0, height-150, width, 150))
 
-    for p in particles:
-        p['y'] -= p['speed']
-        p['x'] += math.sin(time.time() + p['y']*0.01) * 0.5
-        if p['y'] < -20: 
-            p['y'] = height + 20; p['x'] = random.randint(0, width)
-        
-        if current_theme_key == "MEDIEVAL":
-            col = (255, random.randint(100, 200), 50)
-            pygame.draw.circle(screen, col, (int(p['x']), int(p['y'])), random.randint(2, 4))
-        elif current_theme_key == "RELAXING":
-            draw_cloud(screen, int(p['x']), int(p['y']), p['size'], (255, 255, 255))
-        elif current_theme_key == "LOVES":
-            draw_heart(screen, int(p['x']), int(p['y']), p['size']*3, theme["accent"])
+    particles.step(time.time())
+    particles.draw(screen, theme_sprites(current_theme_key), flicker=current_theme_key == "MEDIEVAL")
 
 def show_main_menu(screen, config):
+    """
+    Return: (nama pemain, level), atau (None, None) jika pemain memilih CONTINUE
+    (hanya tampil jika config['save_available'])
+    """
     global current_theme_key
     WIDTH, HEIGHT = config['WIDTH'], config['HEIGHT']
     
@@ -103,20 +129,40 @@ def show_main_menu(screen, config):
         "RELAXING": "bg_ghibli.png", # File tetap pakai nama lama gpp
         "LOVES": "bg_cinta.png"
     }
+    # Dengan preloader, background diambil begitu selesai di-decode (lihat poll_backgrounds);
+    # sampai saat itu render_background memakai gradient fallback.
+    preloader = config.get('preloader')
+    pending_bg = {}
     for key, fname in img_files.items():
         path = os.path.join(IMAGES_DIR, fname)
         if os.path.exists(path):
+            if preloader:
+                pending_bg[key] = path
+                continue
             try:
                 raw = pygame.image.load(path).convert()
                 bg_images[key] = pygame.transform.smoothscale(raw, (WIDTH, HEIGHT))
             except: pass
 
+    def poll_backgrounds():
+        for key, path in list(pending_bg.items()):
+            if preloader.ready(path):
+                del pending_bg[key]
+                img = preloader.surface(path, (WIDTH, HEIGHT), alpha=False)
+                if img: bg_images[key] = img
+
+    def load_sfx(name):
+        path = os.path.join(SOUNDS_DIR, name)
+        if not os.path.exists(path): return None
+        if preloader: return preloader.sound(path)
+        return pygame.mixer.Sound(path)
+
     sfx_hover, sfx_click = None, None
     try:
-        if os.path.exists(os.path.join(SOUNDS_DIR, "hover.wav")):
-            sfx_hover = pygame.mixer.Sound(os.path.join(SOUNDS_DIR, "hover.wav")); sfx_hover.set_volume(0.4)
-        if os.path.exists(os.path.join(SOUNDS_DIR, "click.wav")):
-            sfx_click = pygame.mixer.Sound(os.path.join(SOUNDS_DIR, "click.wav")); sfx_click.set_volume(0.8)
+        sfx_hover = load_sfx("hover.wav")
+        if sfx_hover: sfx_hover.set_volume(0.4)
+        sfx_click = load_sfx("click.wav")
+        if sfx_click: sfx_click.set_volume(0.8)
     except: pass
 
     def play_sfx(type):
@@ -150,8 +196,17 @@ def show_main_menu(screen, config):
         input_font = pygame.font.SysFont("arial", 36)
         small_font = pygame.font.SysFont("arial", 16)
 
-    particles = [{'x': random.randint(0, WIDTH), 'y': random.randint(0, HEIGHT), 'speed': random.uniform(1, 3), 'size': random.randint(2, 5)} for _ in range(60)]
+    particles = make_menu_particles(WIDTH, HEIGHT)
     
+    main_items = ["START GAME", "THEMES", "EXIT"] # Nama menu diperbarui
+    if config.get('save_available'): main_items.insert(0, "CONTINUE")
+
+    def choose_main(item):
+        if item == "CONTINUE": return True
+        if item == "START GAME": return "SELECT_COUNT"
+        if item == "THEMES": return "THEMES" # Ke menu Themes
+        pygame.quit(); sys.exit()
+
     state = "MAIN"
     idx_main = 0; idx_settings = 0; idx_player = 0; idx_level = 0
     num_players = 2; player_names = []; temp_name = ""
@@ -179,13 +234,13 @@ def show_main_menu(screen, config):
                     elif state == "SELECT_LEVEL": state = "INPUT_NAMES"
                 
                 elif state == "MAIN":
-                    if e.key == pygame.K_UP: idx_main = (idx_main - 1) % 3; play_sfx("hover")
-                    elif e.key == pygame.K_DOWN: idx_main = (idx_main + 1) % 3; play_sfx("hover")
+                    if e.key == pygame.K_UP: idx_main = (idx_main - 1) % len(main_items); play_sfx("hover")
+                    elif e.key == pygame.K_DOWN: idx_main = (idx_main + 1) % len(main_items); play_sfx("hover")
                     elif e.key == pygame.K_RETURN:
                         play_sfx("click")
-                        if idx_main == 0: state = "SELECT_COUNT"
-                        elif idx_main == 1: state = "THEMES" # Ke menu Themes
-                        elif idx_main == 2: pygame.quit(); sys.exit()
+                        nxt = choose_main(main_items[idx_main])
+                        if nxt is True: pygame.mixer.music.fadeout(1000); return None, None
+                        state = nxt
 
                 elif state == "THEMES":
                     if e.key == pygame.K_UP: idx_settings = (idx_settings - 1) % 4; play_sfx("hover")
@@ -218,6 +273,7 @@ def show_main_menu(screen, config):
                         play_sfx("click"); selected_level = idx_level + 1; pygame.mixer.music.fadeout(1000)
                         return player_names, selected_level
 
+        if pending_bg: poll_backgrounds()
         render_background(screen, WIDTH, HEIGHT, particles, bg_images)
 
         def draw_btn(text, cx, cy, w, h, is_hl, is_act=False):
@@ -240,7 +296,7 @@ def show_main_menu(screen, config):
             txt_col = theme["text"]
             if is_hl: txt_col = theme["accent"] # Text Highlight
             
-            tsurf = ui_font.render(text, True, txt_col)
+            tsurf = render_text(ui_font, text, True, txt_col)
             screen.blit(tsurf, tsurf.get_rect(center=(cx, cy)))
             return d_rect
 
@@ -249,8 +305,8 @@ def show_main_menu(screen, config):
         title_y = (HEIGHT // 5) + float_offset
         
         # 1. Judul Utama
-        title_txt = title_font.render("Snake & Ladder", True, theme["accent"])
-        t_shad = title_font.render("Snake & Ladder", True, (0,0,0))
+        title_txt = render_text(title_font, "Snake & Ladder", True, theme["accent"])
+        t_shad = render_text(title_font, "Snake & Ladder", True, (0,0,0))
         tr = title_txt.get_rect(center=(WIDTH//2, title_y))
         
         # 2. Subtitle (Truth or Dare Edition) - DIBUAT BOLD MANUAL
@@ -258,7 +314,7 @@ def show_main_menu(screen, config):
         sub_col = theme["text"]
         
         # Render Teks Utama
-        sub_txt = input_font.render(sub_text_str, True, sub_col) 
+        sub_txt = render_text(input_font, sub_text_str, True, sub_col) 
         sub_rect = sub_txt.get_rect(center=(WIDTH//2, title_y + 65))
 
         # Render Outline (Bayangan di 4 arah agar terlihat TEBAL)
@@ -279,7 +335,7 @@ def show_main_menu(screen, config):
         
         # B. Subtitle (Gambar Outline dulu, baru teks utama)
         for dx, dy in offsets:
-            shadow_surf = input_font.render(sub_text_str, True, outline_col)
+            shadow_surf = render_text(input_font, sub_text_str, True, outline_col)
             screen.blit(shadow_surf, (sub_rect.x + dx, sub_rect.y + dy))
         
         screen.blit(sub_txt, sub_rect)
@@ -288,20 +344,19 @@ def show_main_menu(screen, config):
         menu_start_y = title_y + 190 
 
         if state == "MAIN":
-            items = ["START GAME", "THEMES", "EXIT"] # Nama menu diperbarui
-            for i, item in enumerate(items):
+            for i, item in enumerate(main_items):
                 btn = draw_btn(item, WIDTH//2, menu_start_y + (i*70), 280, 55, (i==idx_main))
                 if btn.collidepoint(mouse_pos):
                     idx_main = i; current_hovered_btn = f"m_{i}"
                     if mouse_clicked:
                         play_sfx("click")
-                        if i==0: state="SELECT_COUNT"
-                        elif i==1: state="THEMES"
-                        elif i==2: pygame.quit(); sys.exit()
+                        nxt = choose_main(item)
+                        if nxt is True: pygame.mixer.music.fadeout(1000); return None, None
+                        state = nxt
 
         elif state == "THEMES": # Ganti SETTINGS jadi THEMES
             lbl_y = menu_start_y - 40
-            lbl = small_font.render("- SELECT THEME -", True, theme["text"])
+            lbl = render_text(small_font, "- SELECT THEME -", True, theme["text"])
             screen.blit(lbl, lbl.get_rect(center=(WIDTH//2, lbl_y)))
             
             opts = ["MEDIEVAL", "RELAXING", "LOVES", "BACK"] # Opsi baru
@@ -322,7 +377,7 @@ def show_main_menu(screen, config):
 
         elif state == "SELECT_COUNT":
             lbl_y = menu_start_y - 20
-            lbl = ui_font.render("How many players?", True, theme["text"])
+            lbl = render_text(ui_font, "How many players?", True, theme["text"])
             screen.blit(lbl, lbl.get_rect(center=(WIDTH//2, lbl_y)))
             if draw_btn("< BACK", 80, HEIGHT-50, 120, 40, False).collidepoint(mouse_pos) and mouse_clicked: state="MAIN"; play_sfx("click")
             
@@ -339,7 +394,7 @@ def show_main_menu(screen, config):
             if draw_btn("< BACK", 80, HEIGHT-50, 120, 40, False).collidepoint(mouse_pos) and mouse_clicked: state="SELECT_COUNT"; player_names=[]; play_sfx("click")
             p_idx = len(player_names) + 1
             center_y = HEIGHT // 2 + 40
-            lbl = ui_font.render(f"Enter Name for Player {p_idx}", True, theme["text"])
+            lbl = render_text(ui_font, f"Enter Name for Player {p_idx}", True, theme["text"])
             screen.blit(lbl, lbl.get_rect(center=(WIDTH//2, center_y - 60)))
             
             box = pygame.Rect(0,0, 400, 70); box.center=(WIDTH//2, center_y + 10)
@@ -355,15 +410,15 @@ def show_main_menu(screen, config):
             pygame.draw.rect(screen, theme["accent"], box, 2, border_radius=10)
             
             cur = "|" if int(time.time()*2)%2==0 else ""
-            nm = input_font.render(temp_name + cur, True, theme["text"])
+            nm = render_text(input_font, temp_name + cur, True, theme["text"])
             screen.blit(nm, nm.get_rect(center=box.center))
-            hint = small_font.render("Press ENTER to confirm", True, theme["text"])
+            hint = render_text(small_font, "Press ENTER to confirm", True, theme["text"])
             screen.blit(hint, hint.get_rect(center=(WIDTH//2, HEIGHT - 100)))
 
         elif state == "SELECT_LEVEL":
             if draw_btn("< BACK", 80, HEIGHT-50, 120, 40, False).collidepoint(mouse_pos) and mouse_clicked: state="INPUT_NAMES"; play_sfx("click")
             lbl_y = menu_start_y - 20
-            lbl = ui_font.render("Select Difficulty", True, theme["text"])
+            lbl = render_text(ui_font, "Select Difficulty", True, theme["text"])
             screen.blit(lbl, lbl.get_rect(center=(WIDTH//2, lbl_y)))
             lvls = ["EASY", "NORMAL", "HARD"]
             for i, lv in enumerate(lvls):
@@ -400,6 +455,10 @@ def show_pause_menu(screen, config):
     running_pause = True
     selected_idx = 0
     items = ["RESUME", "MAIN MENU", "EXIT GAME"]
+    # Tombol turbo hanya jika game memberi toggle_turbo; dipilih = ganti mode, menu tetap terbuka
+    toggle_turbo = config.get('toggle_turbo')
+    if toggle_turbo:
+        items.append(f"TURBO: {config.get('turbo_mode', 'OFF')}")
 
     while running_pause:
         screen.blit(game_snapshot, (0, 0))
@@ -424,8 +483,9 @@ def show_pause_menu(screen, config):
                     if selected_idx == 0: return "RESUME"
                     if selected_idx == 1: return "MAIN_MENU"
                     if selected_idx == 2: return "EXIT"
+                    if selected_idx == 3: items[3] = f"TURBO: {toggle_turbo()}"
 
-        title_surf = title_font.render("GAME PAUSED", True, (255, 215, 0)) # Warna Emas
+        title_surf = render_text(title_font, "GAME PAUSED", True, (255, 215, 0)) # Warna Emas
         screen.blit(title_surf, title_surf.get_rect(center=(WIDTH//2, HEIGHT//2 - 100)))
 
         btn_start_y = HEIGHT // 2 - 20
@@ -442,13 +502,45 @@ def show_pause_menu(screen, config):
             pygame.draw.rect(screen, bg_col, btn_rect, border_radius=10)
             pygame.draw.rect(screen, border_col, btn_rect, 3 if is_selected else 1, border_radius=10)
             
-            txt_surf = ui_font.render(item, True, text_col)
+            txt_surf = render_text(ui_font, item, True, text_col)
             screen.blit(txt_surf, txt_surf.get_rect(center=btn_rect.center))
 
             if is_selected and mouse_clicked:
                 if i == 0: return "RESUME"
                 if i == 1: return "MAIN_MENU"
                 if i == 2: return "EXIT"
+                if i == 3: items[3] = f"TURBO: {toggle_turbo()}"
 
         pygame.display.flip()
-        config['clock'].tick(60)
\ No newline at end of file
+        config['clock'].tick(60)
+def show_loading_screen(screen, config, paths=None):
+    """
+    Layar loading selama preloader masih men-decode aset game.
+    Langsung kembali jika tidak ada preloader atau semuanya sudah siap.
+    """
+    preloader = config.get('preloader')
+    if preloader is None: return
+    done, total = preloader.progress(paths)
+    if done >= total: return
+
+    WIDTH, HEIGHT = config['WIDTH'], config['HEIGHT']
+    ui_font = config['font']
+    clock = config['clock']
+    theme = THEMES[current_theme_key]
+    particles = make_menu_particles(WIDTH, HEIGHT, 30)
+    bar = pygame.Rect(0, 0, WIDTH // 3, 18); bar.center = (WIDTH // 2, HEIGHT // 2 + 30)
+
+    while done < total:
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT: pygame.quit(); sys.exit()
+
+        render_background(screen, WIDTH, HEIGHT, particles, {})
+        label = render_text(ui_font, "LOADING...", True, theme["text"])
+        screen.blit(label, label.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 10)))
+        pygame.draw.rect(screen, (20, 20, 20), bar, border_radius=9)
+        fill = bar.copy(); fill.width = int(bar.width * done / total)
+        if fill.width: pygame.draw.rect(screen, theme["accent"], fill, border_radius=9)
+        pygame.draw.rect(screen, theme["panel_border"], bar, 2, border_radius=9)
+
+        pygame.display.flip(); clock.tick(30)
+        done, total = preloader.progress(paths)
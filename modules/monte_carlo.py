@@ -0,0 +1,210 @@
+"""
+Simulasi Monte Carlo - Memainkan banyak game sekaligus dengan array NumPy
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from typing import Dict, List, Optional, Any
+import numpy as np
+
+from game_constants import TOTAL
+from modules.challenge_index import get_record
+from modules.board_analysis import DICE_SIDES, transition_table
+
+BATCH_SIZE = 250_000
+MAX_ROUNDS = 1000
+
+
+class _DeckModel:
+    """
+    Per-game truth/dare pools kept as counts of each distinct move effect.
+
+    Drawing without replacement from a shuffled pool is the same as drawing
+    uniformly from the cards left, so each game only needs a few counters
+    instead of a full permutation. Both pools refill when a draw finds its
+    pool empty, like ChallengeDeck.shuffle_pool. A game starts from the
+    pools left after the board was dealt (see deal).
+    """
+
+    def __init__(self, truth_cards: List[Any], dare_cards: List[Any]) -> None:
+        pools = [[get_record(c).effect for c in truth_cards],
+                 [get_record(c).effect for c in dare_cards]]
+        self.values = np.array(sorted({e for pool in pools for e in pool} | {0}), dtype=np.int32)
+        self.full = np.zeros((2, len(self.values)), dtype=np.int32)
+        for kind, pool in enumerate(pools):
+            for effect in pool:
+                self.full[kind, np.searchsorted(self.values, effect)] += 1
+        self.card_ids = [set(truth_cards), set(dare_cards)]
+        self.start = self.full
+
+    def deal(self, records: List[Any]) -> None:
+        """
+        Take the cards on the board out of the starting pools, as
+        distribute_random_challenges drew them from the deck: each card
+        leaves the pool it is in (its kind), which for a card that is both
+        truth and dare is not its replace_kind. Cards the deck does not
+        hold are skipped, as are copies beyond what a pool has left (the
+        deal ran the pool dry and reshuffled).
+        """
+        start = self.full.copy()
+        for record in records:
+            slot = np.searchsorted(self.values, record.effect)
+            for kind, ids in enumerate(self.card_ids):
+                if record.id in ids and start[kind, slot] > 0:
+                    start[kind, slot] -= 1
+                    break
+        self.start = start
+
+    def new_counts(self, n_games: int) -> np.ndarray:
+        return np.broadcast_to(self.start, (n_games,) + self.start.shape).copy()
+
+    def draw(self, counts: np.ndarray, games: np.ndarray, kinds: np.ndarray,
+             rng: np.random.Generator) -> np.ndarray:
+        """Draw one card per (game, kind) and return its move effect"""
+        remaining = counts[games, kinds]
+        empty = remaining.sum(axis=1) == 0
+        if empty.any():
+            counts[games[empty]] = self.full
+            remaining = counts[games, kinds]
+
+        cum = np.cumsum(remaining, axis=1)
+        available = cum[:, -1]
+        has_cards = available > 0
+        pick = np.floor(rng.random(len(games)) * np.maximum(available, 1)).astype(np.int32)
+        slot = (cum > pick[:, None]).argmax(axis=1)
+
+        counts[games[has_cards], kinds[has_cards], slot[has_cards]] -= 1
+        return np.where(has_cards, self.values[slot], 0)
+
+
+def simulate_games(snakes: Dict[int, int], ladders: Dict[int, int],
+                   challenges: Optional[Dict[str, Any]] = None,
+                   num_players: int = 2, num_games: int = 100_000,
+                   deck: Any = None, seed: Optional[int] = None,
+                   total: int = TOTAL, dice_sides: int = DICE_SIDES,
+                   max_rounds: int = MAX_ROUNDS, batch_size: int = BATCH_SIZE) -> Dict[str, Any]:
+    """
+    Play many independent games at once and collect seat statistics.
+
+    Each seat move resolves in the same order as the SPACE handler in
+    game.py: roll, overflow_reflect, snake or ladder jump, then the
+    maju/mundur effect of the challenge on the final tile. Positions are
+    int arrays, dice one bulk draw per seat, and the board a tile-indexed
+    lookup built by board_analysis.transition_table.
+
+    Args:
+        snakes, ladders, challenges: Board as stored on GameState
+        num_players: Seats per game (2-4)
+        num_games: Number of games to play
+        deck: Optional ChallengeDeck. When given, the card on a challenge
+            tile is replaced after every landing by a card drawn from the
+            same truth/dare pool, so card reshuffles are modelled. The
+            pools start without the cards already on the board. Without
+            it the cards on the board stay fixed.
+        seed: Seed for the NumPy generator
+        max_rounds: Games still running after this many rounds are
+            counted as unfinished
+
+    Returns:
+        Dict with per-seat win probabilities, the round distribution,
+        expected rounds and total turns, plus throughput.
+    """
+    rng = np.random.default_rng(seed)
+
+    deck_model = None
+    slot_of_tile = np.full(total + 1, -1, dtype=np.int32)
+    slot_kind = np.zeros(0, dtype=np.int32)
+    if deck is not None and challenges:
+        deck_model = _DeckModel(deck.truth_master, deck.dare_master)
+        tiles = sorted(int(t) for t in challenges)
+        slot_of_tile[tiles] = np.arange(len(tiles), dtype=np.int32)
+        records = [get_record(challenges[str(t)]) for t in tiles]
+        slot_kind = np.array([0 if r.replace_kind == "truth" else 1 for r in records], dtype=np.int32)
+        deck_model.deal(records)
+        initial_effects = np.array([r.effect for r in records], dtype=np.int32)
+        # Roll + bounce + snake/ladder only; card effects are applied per game
+        moves = transition_table(snakes, ladders, None, total, dice_sides).ravel()
+    else:
+        # Whole turn, including the fixed card effects, in one lookup
+        moves = transition_table(snakes, ladders, challenges, total, dice_sides).ravel()
+
+    wins = np.zeros(num_players, dtype=np.int64)
+    round_hist = np.zeros(max_rounds + 1, dtype=np.int64)
+    turns_sum = 0
+    unfinished = 0
+
+    started = time.perf_counter()
+    done_games = 0
+    while done_games < num_games:
+        n = min(batch_size, num_games - done_games)
+        done_games += n
+
+        # Seat-major so each seat's row is contiguous. Decided games keep
+        # moving (the finish tile is absorbing) until enough of them pile up
+        # to be worth compacting out; `games` keeps their batch index.
+        positions = np.ones((num_players, n), dtype=np.int32)
+        alive = np.ones(n, dtype=bool)
+        games = np.arange(n)
+        alive_count = n
+
+        if deck_model is not None:
+            card_effects = np.broadcast_to(initial_effects, (n, len(slot_kind))).copy()
+            deck_counts = deck_model.new_counts(n)
+
+        for rnd in range(1, max_rounds + 1):
+            if alive_count == 0:
+                break
+            for seat in range(num_players):
+                faces = rng.integers(0, dice_sides, size=len(games), dtype=np.uint8)
+                target = moves[positions[seat] * dice_sides + faces]
+
+                if deck_model is not None:
+                    slot = slot_of_tile[target]
+                    on_card = np.nonzero(slot >= 0)[0]
+                    if len(on_card):
+                        batch_games = games[on_card]
+                        slots = slot[on_card]
+                        steps = card_effects[batch_games, slots]
+                        card_effects[batch_games, slots] = deck_model.draw(
+                            deck_counts, batch_games, slot_kind[slots], rng)
+                        moved = on_card[steps != 0]
+                        if len(moved):
+                            target[moved] = np.clip(target[moved] + steps[steps != 0], 1, total)
+
+                positions[seat] = target
+
+                won = alive & (target == total)
+                count = int(np.count_nonzero(won))
+                if count:
+                    wins[seat] += count
+                    round_hist[rnd] += count
+                    turns_sum += count * ((rnd - 1) * num_players + seat + 1)
+                    alive &= ~won
+                    alive_count -= count
+                    if alive_count == 0:
+                        break
+
+            if alive_count * 2 < len(games):
+                positions = positions[:, alive]
+                games = games[alive]
+                alive = np.ones(alive_count, dtype=bool)
+
+        unfinished += alive_count
+
+    elapsed = time.perf_counter() - started
+    finished_games = max(num_games - unfinished, 1)
+    rounds = np.arange(max_rounds + 1)
+
+    return {
+        "games": num_games,
+        "win_probabilities": (wins / num_games).tolist(),
+        "round_distribution": round_hist / num_games,
+        "expected_rounds": float((round_hist * rounds).sum() / finished_games),
+        "expected_total_turns": turns_sum / finished_games,
+        "unfinished": unfinished,
+        "elapsed": elapsed,
+        "games_per_second": num_games / elapsed if elapsed > 0 else float("inf"),
+    }
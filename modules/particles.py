@@ -0,0 +1,161 @@
+import os
+import sys
+from typing import Callable, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pygame
+
+Color = Tuple[int, ...]
+# draw(size, color) -> (sprite, (anchor_x, anchor_y)); the anchor is the pixel placed on the particle position
+SpriteFactory = Callable[[int, Color], Tuple[pygame.Surface, Tuple[int, int]]]
+
+
+def circle_sprite(size: int, color: Color) -> Tuple[pygame.Surface, Tuple[int, int]]:
+    """Circle of radius `size` whose top-left corner sits on the particle position"""
+    surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surf, color, (size, size), size)
+    return surf, (0, 0)
+
+
+def centered_sprite(draw: Callable[[pygame.Surface, int, int, int, Color], None],
+                    scale: int = 1) -> SpriteFactory:
+    """Sprite factory for draw(surface, x, y, size, color) helpers that draw around (x, y)"""
+    def factory(size: int, color: Color) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        size *= scale
+        half = size * 2 + 1
+        surf = pygame.Surface((half * 2, half * 2), pygame.SRCALPHA)
+        draw(surf, half, half, size, color)
+        return surf, (half, half)
+    return factory
+
+
+class ParticleSprites:
+    """
+    Pre-rendered sprites for every (color variant, size, alpha level).
+
+    Sizes are the integer range size_min..size_max. With alpha_levels > 1
+    the particle alpha (0-255) is quantized to that many levels and baked
+    into the sprite color; with 1 level the colors are used as given.
+    """
+
+    def __init__(self, factory: SpriteFactory, colors: Sequence[Color],
+                 size_min: int, size_max: int, alpha_levels: int = 1) -> None:
+        self.size_min = size_min
+        self.num_sizes = size_max - size_min + 1
+        self.num_variants = len(colors)
+        self.alpha_levels = alpha_levels
+
+        self.sprites: List[pygame.Surface] = []
+        anchors = []
+        for color in colors:
+            for size in range(size_min, size_max + 1):
+                for level in range(alpha_levels):
+                    if alpha_levels > 1:
+                        alpha = min(255, (level * 256 + 128) // alpha_levels)
+                        sprite, anchor = factory(size, (*color[:3], alpha))
+                    else:
+                        sprite, anchor = factory(size, color)
+                    self.sprites.append(sprite)
+                    anchors.append(anchor)
+        self.anchors = np.array(anchors, dtype=np.int32).reshape(-1, 2)
+
+    def index(self, variant: np.ndarray, size_idx: np.ndarray, level: np.ndarray) -> np.ndarray:
+        return (variant * self.num_sizes + size_idx) * self.alpha_levels + level
+
+
+class ParticleField:
+    """
+    Particles rising up the screen, stored as NumPy arrays.
+
+    step() moves every particle at once (speed up, optional sideways
+    drift and sine sway, optional alpha fade) and respawns the ones that
+    left the top at a random x below the bottom edge. draw() picks a
+    pre-rendered sprite per particle and hands the whole frame to one
+    Surface.blits call.
+    """
+
+    def __init__(self, count: int, width: int, height: int,
+                 speed: Tuple[float, float], size: Tuple[int, int],
+                 alpha: Optional[Tuple[int, int]] = None,
+                 drift: Optional[Tuple[float, float]] = None,
+                 sway: float = 0.0, fade: float = 0.0, margin: int = 10,
+                 respawn_alpha: Optional[float] = None,
+                 rng: Optional[np.random.Generator] = None) -> None:
+        self.rng = rng or np.random.default_rng()
+        self.width = width
+        self.height = height
+        self.sway = sway
+        self.fade = fade
+        self.margin = margin
+        self.respawn_alpha = respawn_alpha
+
+        self.x = self.rng.integers(0, width + 1, count).astype(np.float32)
+        self.y = self.rng.integers(0, height + 1, count).astype(np.float32)
+        self.speed = self.rng.uniform(speed[0], speed[1], count).astype(np.float32)
+        self.size = self.rng.integers(size[0], size[1] + 1, count)
+        self.alpha = (self.rng.integers(alpha[0], alpha[1] + 1, count).astype(np.float32)
+                      if alpha else np.full(count, 255, np.float32))
+        self.drift = self.rng.uniform(drift[0], drift[1], count).astype(np.float32) if drift else None
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def step(self, t: float = 0.0) -> None:
+        """Advance one frame; t is the time in seconds used by the sway"""
+        self.y -= self.speed
+        if self.drift is not None:
+            self.x += self.drift
+        if self.sway:
+            self.x += np.sin(t + self.y * 0.01) * self.sway
+
+        gone = self.y < -self.margin
+        n = int(np.count_nonzero(gone))
+        if n:
+            self.y[gone] = self.height + self.margin
+            self.x[gone] = self.rng.integers(0, self.width + 1, n)
+            if self.respawn_alpha is not None:
+                self.alpha[gone] = self.respawn_alpha
+
+        if self.fade:
+            np.maximum(self.alpha - self.fade, 0, out=self.alpha)
+
+    def _placement(self, sprites: ParticleSprites,
+                   flicker: bool) -> Tuple[np.ndarray, List[int], List[int]]:
+        """Sprite index and top-left corner of every visible particle"""
+        count = len(self.x)
+        if flicker:
+            variant = self.rng.integers(0, sprites.num_variants, count)
+            size_idx = self.rng.integers(0, sprites.num_sizes, count)
+        else:
+            variant = np.zeros(count, np.int64)
+            size_idx = np.clip(self.size - sprites.size_min, 0, sprites.num_sizes - 1)
+
+        visible = self.alpha >= 1
+        if sprites.alpha_levels > 1:
+            level = np.minimum(self.alpha.astype(np.int64) * sprites.alpha_levels // 256,
+                               sprites.alpha_levels - 1)
+        else:
+            level = np.zeros(count, np.int64)
+
+        idx = sprites.index(variant, size_idx, level)[visible]
+        anchors = sprites.anchors[idx]
+        xs = (self.x[visible].astype(np.int32) - anchors[:, 0]).tolist()
+        ys = (self.y[visible].astype(np.int32) - anchors[:, 1]).tolist()
+        return idx, xs, ys
+
+    def draw(self, surface: pygame.Surface, sprites: ParticleSprites, flicker: bool = False) -> None:
+        """
+        Blit all visible particles. flicker=True picks a random color variant
+        and size per particle every frame instead of the particle's own size.
+        """
+        idx, xs, ys = self._placement(sprites, flicker)
+        table = sprites.sprites
+        surface.blits([(table[i], (x, y)) for i, x, y in zip(idx.tolist(), xs, ys)], doreturn=False)
+
+    def rects(self, sprites: ParticleSprites) -> List[pygame.Rect]:
+        """Screen area each visible particle covers when drawn without flicker"""
+        idx, xs, ys = self._placement(sprites, False)
+        table = sprites.sprites
+        return [table[i].get_rect(topleft=(x, y)) for i, x, y in zip(idx.tolist(), xs, ys)]
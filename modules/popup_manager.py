@@ -1,91 +1,62 @@
 import pygame
 import math
 import time
-import os
 
-def show_popup(screen, text, step_number, config):
+from modules.challenge_index import get_record
+from modules.popup_resources import get_popup_resources
+from modules.text_cache import render_text
+
+def show_popup(screen, text, step_number, config, record=None):
+    """
+    record: ChallengeRecord dari challenge_index; jika ada, klasifikasi,
+    timer dan efek langkah diambil dari sana (tanpa parse ulang teks).
+    """
     WIDTH, HEIGHT = config['WIDTH'], config['HEIGHT']
     IMAGE_DIR = config['IMAGE_DIR']
-    SOUND_DIR = os.path.join(os.path.dirname(IMAGE_DIR), "sounds")
+    res = config.get('popup_resources') or get_popup_resources(IMAGE_DIR)
     
     snapshot = screen.copy()
-    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    overlay.fill((10, 10, 20, 230))
+    overlay = res.overlay((WIDTH, HEIGHT))
+
+    if record is None:
+        record = get_record(text)
 
-    clean_text = text.replace("🎯", "").replace("📜", "").strip()
+    clean_text = record.clean_text
     
-    is_truth = "truth" in clean_text.lower() or "kebenaran" in clean_text.lower()
-    is_dare = "dare" in clean_text.lower() or "tantangan" in clean_text.lower()
-    is_win = any(k in clean_text.upper() for k in ["MENANG", "WINNER", "JUARA", "WIN"])
+    is_truth = record.is_truth
+    is_dare = record.is_dare
+    is_win = record.is_win
     is_snake_ladder = "Ular" in clean_text or "Tangga" in clean_text
     
-    is_challenge = any(k in clean_text.lower() for k in ["tantangan", "detik", "menit", "timer"])
-    timer_duration = config['get_timer_duration'](clean_text) if is_challenge else 0
+    is_challenge = record.is_challenge
+    timer_duration = record.timer
     timer_started, timer_finished = False, False
     start_ticks, time_left, sound_played = 0, timer_duration, False
 
+    # Semua gambar dari res sudah 200x200 dan di-cache antar popup
     challenge_img = None
     
     if is_truth and config.get('scroll_truth_img'):
-        path = os.path.join(IMAGE_DIR, "scroll_truth.png")
-        try:
-            challenge_img = pygame.image.load(path).convert_alpha()
-        except:
-            challenge_img = config['scroll_truth_img']
+        challenge_img = res.image("scroll_truth.png") or res.scale(config['scroll_truth_img'])
     elif is_dare and config.get('scroll_dare_img'):
-        path = os.path.join(IMAGE_DIR, "scroll_dare.png")
-        try:
-            challenge_img = pygame.image.load(path).convert_alpha()
-        except:
-            challenge_img = config['scroll_dare_img']
+        challenge_img = res.image("scroll_dare.png") or res.scale(config['scroll_dare_img'])
     
     if challenge_img is None:
         if "Ular" in clean_text:
-            path = os.path.join(IMAGE_DIR, "ular_icon.png")
-            if os.path.exists(path): 
-                challenge_img = pygame.image.load(path).convert_alpha()
+            challenge_img = res.image("ular_icon.png")
         elif "Tangga" in clean_text:
-            path = os.path.join(IMAGE_DIR, "tangga_icon.png")
-            if os.path.exists(path): 
-                challenge_img = pygame.image.load(path).convert_alpha()
+            challenge_img = res.image("tangga_icon.png")
     
     if challenge_img is None and step_number:
-        challenge_img = config['get_challenge_image'](step_number)
+        challenge_img = res.step_image(step_number, config['get_challenge_image'])
     
     if challenge_img is None and not is_win:
-        d_path = os.path.join(IMAGE_DIR, "default_challenge.png")
-        if os.path.exists(d_path): 
-            challenge_img = pygame.image.load(d_path).convert_alpha()
-
-    if challenge_img:
-        challenge_img = pygame.transform.smoothscale(challenge_img, (200, 200))
+        challenge_img = res.image("default_challenge.png")
 
     focused_button = 0  # 0 = Kiri, 1 = Kanan
     
-    def wrap_text_smart(text, font, max_width):
-        """Wrap teks berdasarkan LEBAR PIXEL, bukan jumlah karakter"""
-        words = text.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            test_line = current_line + word + " "
-            text_width = font.size(test_line)[0]
-            
-            if text_width <= max_width:
-                current_line = test_line
-            else:
-                if current_line:
-                    lines.append(current_line.strip())
-                current_line = word + " "
-        
-        if current_line:
-            lines.append(current_line.strip())
-        
-        return lines
-    
     MAX_TEXT_WIDTH = 640  # Lebar maksimal kotak teks
-    wrapped_lines = wrap_text_smart(clean_text, config['font'], MAX_TEXT_WIDTH)
+    wrapped_lines = res.wrap(clean_text, config['font'], MAX_TEXT_WIDTH)
     
     line_height = 32
     text_block_height = len(wrapped_lines) * line_height
@@ -106,9 +77,9 @@ def show_popup(screen, text, step_number, config):
                 timer_finished = True
                 if not sound_played:
                     try:
-                        s_path = os.path.join(SOUND_DIR, "timer_end.wav")
-                        if os.path.exists(s_path): 
-                            pygame.mixer.Sound(s_path).play()
+                        timer_sound = res.sound("timer_end.wav")
+                        if timer_sound: 
+                            timer_sound.play()
                         sound_played = True
                     except: 
                         pass
@@ -132,7 +103,7 @@ def show_popup(screen, text, step_number, config):
         dialog_y_offset = 180  # Jarak dialog dari gambar
 
         if is_win:
-            v_surf = config['big_font'].render("VICTORY", True, (180, 160, 100))
+            v_surf = render_text(config['big_font'], "VICTORY", True, (180, 160, 100))
             screen.blit(v_surf, v_surf.get_rect(center=(WIDTH // 2, content_y)))
         else:
             if challenge_img:
@@ -147,7 +118,7 @@ def show_popup(screen, text, step_number, config):
                                math.radians(-90), math.radians(angle-90), 8)
                 
                 t_str = f"{int(time_left // 60):02d}:{int(time_left % 60):02d}"
-                t_surf = config['big_font'].render(t_str, True, (200, 200, 205))
+                t_surf = render_text(config['big_font'], t_str, True, (200, 200, 205))
                 screen.blit(t_surf, t_surf.get_rect(center=(WIDTH // 2, content_y + 140)))
 
         dialog_rect = pygame.Rect(0, 0, 680, dialog_height)
@@ -162,7 +133,7 @@ def show_popup(screen, text, step_number, config):
         ty = dialog_rect.centery - (len(wrapped_lines) * line_height // 2)
         for i, line in enumerate(wrapped_lines):
             col = (240, 240, 245) if i % 2 == 0 else (170, 175, 185)
-            s_line = config['font'].render(line, True, col)
+            s_line = render_text(config['font'], line, True, col)
             screen.blit(s_line, s_line.get_rect(center=(WIDTH // 2, ty + (i * line_height))))
 
         btn_y = popup_rect.bottom + 45
@@ -218,10 +189,10 @@ def show_popup(screen, text, step_number, config):
             pygame.draw.rect(screen, (*left_col, 40), highlight_rect, border_radius=8)
         
         text_col = (255, 255, 100) if is_left_focused else (180, 185, 190)
-        t_left = config['font'].render(left_msg, True, text_col)
+        t_left = render_text(config['font'], left_msg, True, text_col)
         
         if is_left_focused:
-            shadow = config['font'].render(left_msg, True, (0, 0, 0))
+            shadow = render_text(config['font'], left_msg, True, (0, 0, 0))
             screen.blit(shadow, (left_rect.centerx - t_left.get_width()//2 + 2, 
                                  left_rect.centery - t_left.get_height()//2 + 2))
         
@@ -250,10 +221,10 @@ def show_popup(screen, text, step_number, config):
                 pygame.draw.rect(screen, (*next_col, 40), highlight_rect, border_radius=8)
             
             text_col = (255, 255, 100) if is_right_focused else (255, 220, 100)
-            t_next = config['font'].render("NEXT CHALLENGE?", True, text_col)
+            t_next = render_text(config['font'], "NEXT CHALLENGE?", True, text_col)
             
             if is_right_focused:
-                shadow = config['font'].render("NEXT CHALLENGE?", True, (0, 0, 0))
+                shadow = render_text(config['font'], "NEXT CHALLENGE?", True, (0, 0, 0))
                 screen.blit(shadow, (next_rect.centerx - t_next.get_width()//2 + 2, 
                                      next_rect.centery - t_next.get_height()//2 + 2))
             
@@ -267,7 +238,7 @@ def show_popup(screen, text, step_number, config):
             hint_text = "← → navigate  |  SPACE/ENTER: Next Question  |  ESC: skip"
             hint_col = (255, 180, 50)
         
-        hint_surf = config['small_font'].render(hint_text, True, hint_col)
+        hint_surf = render_text(config['small_font'], hint_text, True, hint_col)
         screen.blit(hint_surf, hint_surf.get_rect(center=(WIDTH // 2, hint_y)))
 
         pygame.display.flip()
@@ -284,7 +255,7 @@ def show_popup(screen, text, step_number, config):
                 
                 if left_rect.collidepoint(mouse_pos):
                     if is_win:
-                        return config['get_move_effect'](clean_text)
+                        return record.effect
                     
                     if is_challenge:
                         if not timer_started:
@@ -293,9 +264,9 @@ def show_popup(screen, text, step_number, config):
                             timer_finished = True
                             time_left = 0
                         elif timer_finished:
-                            return config['get_move_effect'](clean_text)
+                            return record.effect
                     else:
-                        return config['get_move_effect'](clean_text)
+                        return record.effect
             
             if e.type == pygame.KEYDOWN:
                 if e.key == pygame.K_LEFT and show_next_btn:
@@ -308,7 +279,7 @@ def show_popup(screen, text, step_number, config):
                         return "NEXT"
                     else:
                         if is_win:
-                            return config['get_move_effect'](clean_text)
+                            return record.effect
                         if is_challenge:
                             if not timer_started:
                                 timer_started, start_ticks = True, pygame.time.get_ticks()
@@ -316,16 +287,16 @@ def show_popup(screen, text, step_number, config):
                                 timer_finished = True
                                 time_left = 0
                             elif timer_finished:
-                                return config['get_move_effect'](clean_text)
+                                return record.effect
                         else:
-                            return config['get_move_effect'](clean_text)
+                            return record.effect
                 
                 if e.key == pygame.K_SPACE:
                     if focused_button == 1 and show_next_btn:
                         return "NEXT"
                     
                     if is_win:
-                        return config['get_move_effect'](clean_text)
+                        return record.effect
                     if is_challenge:
                         if not timer_started:
                             timer_started, start_ticks = True, pygame.time.get_ticks()
@@ -333,9 +304,9 @@ def show_popup(screen, text, step_number, config):
                             timer_finished = True
                             time_left = 0
                         elif timer_finished:
-                            return config['get_move_effect'](clean_text)
+                            return record.effect
                     else:
-                        return config['get_move_effect'](clean_text)
+                        return record.effect
                 
                 if e.key == pygame.K_ESCAPE and is_challenge and timer_started and not timer_finished:
                     timer_finished = True
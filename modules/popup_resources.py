@@ -0,0 +1,156 @@
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from modules.game_logger import logger
+
+POPUP_IMAGE_SIZE = (200, 200)
+POPUP_IMAGES = ("scroll_truth.png", "scroll_dare.png", "ular_icon.png", "tangga_icon.png", "default_challenge.png")
+POPUP_SOUNDS = ("timer_end.wav",)
+MAX_LAYOUTS = 256
+
+
+def wrap_text_smart(text: str, font: pygame.font.Font, max_width: int) -> List[str]:
+    """Wrap teks berdasarkan LEBAR PIXEL, bukan jumlah karakter"""
+    words = text.split()
+    lines = []
+    current_line = ""
+
+    for word in words:
+        test_line = current_line + word + " "
+        text_width = font.size(test_line)[0]
+
+        if text_width <= max_width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line.strip())
+            current_line = word + " "
+
+    if current_line:
+        lines.append(current_line.strip())
+
+    return lines
+
+
+class PopupResources:
+    """
+    Everything show_popup needs that does not change between popups.
+
+    Images are loaded and smoothscaled to the popup size once, wrapped text
+    is kept per (text, font, width), sounds are built once, and the dimming
+    overlay is reused. Missing files are remembered as None so they are not
+    looked up again on the next popup.
+    """
+
+    def __init__(self, image_dir: str, sound_dir: Optional[str] = None,
+                 load_image: Callable[[str], pygame.Surface] = pygame.image.load,
+                 load_sound: Optional[Callable[[str], Any]] = None,
+                 image_size: Tuple[int, int] = POPUP_IMAGE_SIZE) -> None:
+        self.image_dir = image_dir
+        self.sound_dir = sound_dir or os.path.join(os.path.dirname(image_dir), "sounds")
+        self.load_image = load_image
+        self.load_sound = load_sound
+        self.image_size = image_size
+        self.images: Dict[str, Optional[pygame.Surface]] = {}
+        self.scaled: Dict[pygame.Surface, pygame.Surface] = {}
+        self.step_images: Dict[Any, Optional[pygame.Surface]] = {}
+        self.layouts: Dict[Tuple[str, pygame.font.Font, int], List[str]] = {}
+        self.sounds: Dict[str, Any] = {}
+        self.overlays: Dict[Tuple[int, int], pygame.Surface] = {}
+
+    def image(self, filename: str) -> Optional[pygame.Surface]:
+        """images/<filename> scaled to the popup size, or None if it can't be loaded"""
+        if filename not in self.images:
+            img = None
+            path = os.path.join(self.image_dir, filename)
+            if os.path.exists(path):
+                try:
+                    raw = self.load_image(path).convert_alpha()
+                    img = pygame.transform.smoothscale(raw, self.image_size)
+                except Exception as e:
+                    logger.warning(f"Popup image {filename} failed to load: {e}")
+            self.images[filename] = img
+        return self.images[filename]
+
+    def use_atlas(self, atlas: Any, prefix: str = "popup/") -> None:
+        """
+        Serve the loaded popup images from a SpriteAtlas (added as prefix +
+        filename with atlas_images()) instead of their own surfaces.
+        """
+        for filename in self.images:
+            if prefix + filename in atlas:
+                self.images[filename] = atlas.surface(prefix + filename)
+        self.scaled.clear()
+        self.step_images.clear()
+
+    def atlas_images(self, prefix: str = "popup/") -> List[Tuple[str, pygame.Surface]]:
+        """(name, surface) of every loaded popup image, for SpriteAtlas.add"""
+        return [(prefix + filename, img) for filename, img in self.images.items() if img is not None]
+
+    def scale(self, surface: pygame.Surface) -> pygame.Surface:
+        """Popup-sized copy of a surface that is already loaded elsewhere"""
+        img = self.scaled.get(surface)
+        if img is None:
+            img = pygame.transform.smoothscale(surface, self.image_size)
+            self.scaled[surface] = img
+        return img
+
+    def step_image(self, step_number: Any, getter: Callable[[Any], Optional[pygame.Surface]]) -> Optional[pygame.Surface]:
+        """Scaled result of config['get_challenge_image'](step), looked up once per step"""
+        if step_number not in self.step_images:
+            img = getter(step_number)
+            self.step_images[step_number] = self.scale(img) if img else None
+        return self.step_images[step_number]
+
+    def wrap(self, text: str, font: pygame.font.Font, max_width: int) -> List[str]:
+        key = (text, font, max_width)
+        lines = self.layouts.get(key)
+        if lines is None:
+            if len(self.layouts) >= MAX_LAYOUTS:
+                self.layouts.clear()
+            lines = wrap_text_smart(text, font, max_width)
+            self.layouts[key] = lines
+        return lines
+
+    def sound(self, filename: str) -> Any:
+        if filename not in self.sounds:
+            snd = None
+            path = os.path.join(self.sound_dir, filename)
+            if os.path.exists(path):
+                try:
+                    snd = self.load_sound(path) if self.load_sound else pygame.mixer.Sound(path)
+                except Exception as e:
+                    logger.warning(f"Popup sound {filename} failed to load: {e}")
+            self.sounds[filename] = snd
+        return self.sounds[filename]
+
+    def overlay(self, size: Tuple[int, int]) -> pygame.Surface:
+        surf = self.overlays.get(size)
+        if surf is None:
+            surf = pygame.Surface(size, pygame.SRCALPHA)
+            surf.fill((10, 10, 20, 230))
+            self.overlays[size] = surf
+        return surf
+
+    def preload(self) -> None:
+        """Load the standard popup images and sounds now instead of on the first popup"""
+        for filename in POPUP_IMAGES:
+            self.image(filename)
+        for filename in POPUP_SOUNDS:
+            self.sound(filename)
+
+
+_default_resources: Dict[str, PopupResources] = {}
+
+
+def get_popup_resources(image_dir: str) -> PopupResources:
+    """Shared PopupResources for callers that don't pass one in the popup config"""
+    res = _default_resources.get(image_dir)
+    if res is None:
+        res = _default_resources[image_dir] = PopupResources(image_dir)
+    return res
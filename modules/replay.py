@@ -0,0 +1,248 @@
+"""
+Rekaman & Replay Sesi - Seed + log kejadian per giliran
+
+File replay adalah JSONL: baris pertama header (versi, seed, pemain,
+level, ...), lalu satu baris per giliran yang selesai:
+
+    [dadu, "NNA"]
+
+"N" = tombol NEXT di popup kartu, "A" = kartu diterima; kosong jika
+tidak ada kartu di kotak akhir. Dengan seed yang sama papan, deck dan
+penyebaran kartu tersusun ulang persis (lihat SessionRandom), jadi log
+ini cukup untuk memainkan ulang seluruh sesi. Setiap giliran langsung
+ditulis (flush), sesi yang crash tetap punya log sampai giliran terakhir.
+
+Replay tanpa layar, secepat mungkin:
+    python -m modules.replay replays/replay_20250101_120000_123.jsonl
+Replay lewat renderer (waktu nyata):
+    python game.py --replay replays/replay_20250101_120000_123.jsonl
+"""
+import os
+import sys
+import json
+import time
+import base64
+import hashlib
+import argparse
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_constants import BASE_DIR, TOTAL
+from modules.game_logger import logger
+from modules.game_rng import SessionRandom
+from modules.game_state import GameState
+from modules.game_deck import ChallengeDeck
+from modules.game_engine import GameEngine
+from modules.game_utils import load_level_challenges
+from modules.save_game import decode_game, restore_game
+
+REPLAY_VERSION = 1
+CHOICE_NEXT = "N"
+CHOICE_ACCEPT = "A"
+
+
+def deck_digest(challenge_data: Dict[str, Any]) -> str:
+    """Sidik jari isi file tantangan, untuk memperingatkan replay dengan deck lain"""
+    raw = json.dumps(challenge_data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def build_engine(players: List[str], level: int, challenge_data: Dict[str, Any],
+                 streams: SessionRandom, target_turns: Optional[float] = None,
+                 num_challenges: int = 40, snapshot: Optional[bytes] = None) -> GameEngine:
+    """
+    Engine untuk sesi baru, atau lanjutan dari snapshot save (game yang di-CONTINUE).
+    game.py dan replay memakai fungsi ini agar susunan awalnya selalu sama.
+    """
+    if snapshot is None:
+        return GameEngine.new_game(players, level, challenge_data, streams=streams,
+                                   target_turns=target_turns, num_challenges=num_challenges)
+
+    saved = decode_game(snapshot)
+    state = GameState(saved.players, saved.level)
+    deck = ChallengeDeck(challenge_data, rng=streams.deck, verbose=False) if challenge_data else None
+    restore_game(saved, state, deck)
+    engine = GameEngine(state, deck, rng=streams.dice)
+    engine.winner = saved.winner
+    engine.turns_played = saved.turns_played
+    return engine
+
+
+class ReplayRecorder:
+    """Tulis header lalu satu baris per giliran; gagal tulis = rekaman berhenti, game tetap jalan"""
+
+    def __init__(self, path: str, header: Dict[str, Any]) -> None:
+        self.path = path
+        self.dice: Optional[int] = None
+        self.choices: List[str] = []
+        self.file: Optional[TextIO] = None
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.file = open(path, "w", encoding="utf-8")
+            self.file.write(json.dumps(dict(header, v=REPLAY_VERSION), ensure_ascii=False) + "\n")
+            self.file.flush()
+            logger.info(f"Recording replay: {path}")
+        except OSError as e:
+            logger.warning(f"Replay recording disabled: {e}")
+            self.file = None
+
+    def record_dice(self, dice: int) -> None:
+        self.dice = dice
+
+    def record_choice(self, next_card: bool) -> None:
+        self.choices.append(CHOICE_NEXT if next_card else CHOICE_ACCEPT)
+
+    def end_turn(self) -> None:
+        if self.file is not None and self.dice is not None:
+            try:
+                self.file.write(json.dumps([self.dice, "".join(self.choices)]) + "\n")
+                self.file.flush()
+            except OSError as e:
+                logger.warning(f"Replay recording stopped: {e}")
+                self.close()
+        self.dice = None
+        self.choices = []
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ReplayLog:
+    """Isi file replay; next_dice()/next_choice() membacanya berurutan"""
+
+    def __init__(self, header: Dict[str, Any], turns: List[Tuple[int, str]]) -> None:
+        self.header = header
+        self.turns = turns
+        self.turn_index = 0
+        self.choice_index = 0
+
+    @classmethod
+    def load(cls, path: str) -> "ReplayLog":
+        """ValueError jika bukan file replay yang didukung"""
+        with open(path, encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        if not lines:
+            raise ValueError("empty replay file")
+        header = json.loads(lines[0])
+        if header.get("v") != REPLAY_VERSION:
+            raise ValueError(f"unsupported replay version {header.get('v')}")
+        turns = []
+        for line in lines[1:]:
+            try:
+                dice, choices = json.loads(line)
+            except ValueError:
+                break  # Baris terakhir terpotong (crash saat menulis)
+            turns.append((int(dice), str(choices)))
+        return cls(header, turns)
+
+    @property
+    def seed(self) -> int:
+        return self.header["seed"]
+
+    @property
+    def snapshot(self) -> Optional[bytes]:
+        snap = self.header.get("snapshot")
+        return base64.b64decode(snap) if snap else None
+
+    @property
+    def finished(self) -> bool:
+        return self.turn_index >= len(self.turns)
+
+    def next_dice(self) -> int:
+        dice = self.turns[self.turn_index][0]
+        self.choice_index = 0
+        return dice
+
+    def next_choice(self) -> str:
+        """Pilihan berikutnya di popup kartu; log yang habis dianggap menerima"""
+        choices = self.turns[self.turn_index][1]
+        choice = choices[self.choice_index] if self.choice_index < len(choices) else CHOICE_ACCEPT
+        self.choice_index += 1
+        return choice
+
+    def end_turn(self) -> None:
+        self.turn_index += 1
+
+    def build_engine(self, challenge_data: Dict[str, Any], streams: Optional[SessionRandom] = None,
+                     record_log: bool = True) -> GameEngine:
+        """Engine di keadaan awal rekaman; streams harus dari SessionRandom(self.seed)"""
+        if challenge_data and self.header.get("deck") not in (None, deck_digest(challenge_data)):
+            logger.warning("Replay was recorded with different challenge files; cards will differ")
+        engine = build_engine(self.header["players"], self.header["level"], challenge_data,
+                              streams or SessionRandom(self.seed), self.header.get("board_target_turns"),
+                              self.header.get("num_challenges", 40), self.snapshot)
+        engine.record_log = record_log
+        return engine
+
+
+def make_header(seed: int, players: List[str], level: int, challenge_data: Dict[str, Any],
+                target_turns: Optional[float] = None, num_challenges: int = 40,
+                snapshot: Optional[bytes] = None) -> Dict[str, Any]:
+    header = {
+        "seed": seed,
+        "players": list(players),
+        "level": level,
+        "board_target_turns": target_turns,
+        "num_challenges": num_challenges,
+        "deck": deck_digest(challenge_data) if challenge_data else None,
+        "total": TOTAL,
+        "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    if snapshot is not None:
+        header["snapshot"] = base64.b64encode(snapshot).decode("ascii")
+    return header
+
+
+def play_logged_turn(engine: GameEngine, log: ReplayLog) -> bool:
+    """Satu giliran dari log, urutan langkah sama dengan play_turn di game.py -> menang?"""
+    engine.begin_turn()
+    dice = engine.roll_dice(log.next_dice())
+    engine.advance(dice)
+    engine.resolve_jump()
+    while engine.pending_challenge() is not None:
+        if log.next_choice() == CHOICE_NEXT:
+            engine.skip_challenge()
+            continue
+        engine.accept_challenge()
+        break
+    log.end_turn()
+    return engine.finish_turn()
+
+
+def replay_headless(log: ReplayLog, challenge_data: Dict[str, Any]) -> GameEngine:
+    """Mainkan seluruh log tanpa pygame dan kembalikan engine di keadaan akhirnya"""
+    engine = log.build_engine(challenge_data, record_log=False)
+    while not log.finished:
+        if play_logged_turn(engine, log):
+            break
+    return engine
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay a recorded session without a window")
+    parser.add_argument("replay", help="replay .jsonl file")
+    parser.add_argument("--base-dir", default=BASE_DIR, help="directory with the challenge files")
+    args = parser.parse_args(argv)
+
+    log = ReplayLog.load(args.replay)
+    data = load_level_challenges(args.base_dir, log.header["level"])
+    started = time.perf_counter()
+    engine = replay_headless(log, data)
+    elapsed = time.perf_counter() - started
+
+    print(json.dumps({
+        "seed": log.seed,
+        "turns": log.turn_index,
+        "turns_in_log": len(log.turns),
+        "winner": engine.state.players[engine.winner] if engine.winner is not None else None,
+        "positions": engine.state.positions,
+        "ms": round(elapsed * 1000, 3),
+    }, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
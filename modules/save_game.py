@@ -0,0 +1,255 @@
+"""
+Simpan & Lanjutkan Game - Snapshot biner kecil dari satu sesi
+
+Format (little-endian, versi SAVE_VERSION):
+    header      magic "SLSV", versi, panjang body, crc32 body
+    body        jumlah pemain, level, giliran, pemenang, jumlah giliran
+                nama pemain (panjang + UTF-8)
+                posisi pion                     varint per pemain
+                papan: TOTAL + 1 kotak          varint tujuan ular/tangga (0 = kosong)
+                                                kartu per kotak (pack_cards, NO_CARD = kosong)
+                deck: truth/dare master & pool  varint per kartu
+                tabel teks kartu                zlib, dipisah "\\0"
+
+Daftar bilangan memakai modules/binary_codec (varint, tanpa batas 65535).
+Versi 1 (semua uint16, 0xFFFF = kotak tanpa kartu) masih bisa dibaca.
+
+Kartu disimpan sebagai indeks ke tabel teks di file itu sendiri, bukan
+ID challenge_index (ID hanya berlaku di proses yang memuatnya). Log
+giliran dan keadaan RNG tidak disimpan.
+"""
+import os
+import sys
+import zlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game_constants import TOTAL
+from modules.game_state import GameState
+from modules.game_deck import ChallengeDeck
+from modules.challenge_index import ChallengeIndex, challenge_index, get_record
+from modules.game_logger import logger
+from modules.binary_codec import NO_CARD, pack_uints, unpack_uints, pack_cards, unpack_cards
+
+SAVE_MAGIC = b"SLSV"
+SAVE_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+HEADER = struct.Struct("<4sHII")  # magic, versi, panjang body, crc32 body
+GAME = struct.Struct("<BBBbI")    # pemain, level, giliran, pemenang (-1 = belum), giliran dimainkan
+V1_NO_CARD = 0xFFFF
+
+
+class SavedGame:
+    """Isi satu file save, sudah diterjemahkan ke ID challenge_index"""
+
+    __slots__ = ("players", "level", "turn", "winner", "turns_played", "positions",
+                 "snakes", "ladders", "challenges", "truth_master", "dare_master",
+                 "truth_pool", "dare_pool")
+
+    def __init__(self, players: List[str], level: int, turn: int, winner: Optional[int],
+                 turns_played: int, positions: List[int], snakes: Dict[int, int],
+                 ladders: Dict[int, int], challenges: Dict[str, int],
+                 truth_master: List[int], dare_master: List[int],
+                 truth_pool: List[int], dare_pool: List[int]) -> None:
+        self.players = players
+        self.level = level
+        self.turn = turn
+        self.winner = winner
+        self.turns_played = turns_played
+        self.positions = positions
+        self.snakes = snakes
+        self.ladders = ladders
+        self.challenges = challenges
+        self.truth_master = truth_master
+        self.dare_master = dare_master
+        self.truth_pool = truth_pool
+        self.dare_pool = dare_pool
+
+    def __repr__(self) -> str:
+        return f"SavedGame(players={self.players}, level={self.level}, turn={self.turn}, positions={self.positions})"
+
+
+def _unpack_u16(data: bytes, offset: int) -> Tuple[List[int], int]:
+    (count,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    values = list(struct.unpack_from(f"<{count}H", data, offset))
+    return values, offset + count * 2
+
+
+def encode_game(state: GameState, deck: Optional[ChallengeDeck] = None,
+                winner: Optional[int] = None, turns_played: int = 0,
+                total: int = TOTAL) -> bytes:
+    """Snapshot state (+ deck) sebagai bytes"""
+    texts: List[str] = []
+    slots: Dict[int, int] = {}
+
+    def slot(record_id: int) -> int:
+        if record_id not in slots:
+            slots[record_id] = len(texts)
+            texts.append(get_record(record_id).text)
+        return slots[record_id]
+
+    jumps = [0] * (total + 1)
+    for start, end in list(state.snakes.items()) + list(state.ladders.items()):
+        jumps[start] = end
+
+    cards = [NO_CARD] * (total + 1)
+    for tile, value in state.challenges.items():
+        record = get_record(value)
+        if record is not None:
+            cards[int(tile)] = slot(record.id)
+
+    pools = ([], [], [], [])
+    if deck is not None:
+        pools = tuple([slot(i) for i in ids] for ids in
+                      (deck.truth_master, deck.dare_master, deck.truth_pool, deck.dare_pool))
+
+    parts = [GAME.pack(len(state.players), state.game_level, state.turn,
+                       -1 if winner is None else winner, turns_played)]
+    for name in state.players:
+        raw = name.encode("utf-8")[:255]
+        parts.append(struct.pack("<B", len(raw)) + raw)
+    parts.append(pack_uints(state.positions))
+    parts.append(pack_uints(jumps))
+    parts.append(pack_cards(cards))
+    parts.extend(pack_uints(p) for p in pools)
+    packed_texts = zlib.compress("\0".join(texts).encode("utf-8"), 6)
+    parts.append(struct.pack("<I", len(packed_texts)) + packed_texts)
+
+    body = b"".join(parts)
+    return HEADER.pack(SAVE_MAGIC, SAVE_VERSION, len(body), zlib.crc32(body)) + body
+
+
+def decode_game(data: bytes, index: ChallengeIndex = challenge_index) -> SavedGame:
+    """Kebalikan encode_game; ValueError jika file bukan save yang valid"""
+    if len(data) < HEADER.size:
+        raise ValueError("save file too short")
+    magic, version, size, crc = HEADER.unpack_from(data)
+    if magic != SAVE_MAGIC:
+        raise ValueError("not a save file")
+    if version not in READABLE_VERSIONS:
+        raise ValueError(f"unsupported save version {version}")
+    body = data[HEADER.size:]
+    if len(body) != size or zlib.crc32(body) != crc:
+        raise ValueError("save file is truncated or corrupt")
+
+    try:
+        count, level, turn, winner, turns_played = GAME.unpack_from(body)
+        offset = GAME.size
+        players = []
+        for _ in range(count):
+            (n,) = struct.unpack_from("<B", body, offset)
+            players.append(body[offset + 1:offset + 1 + n].decode("utf-8"))
+            offset += 1 + n
+        if version == 1:
+            positions = list(struct.unpack_from(f"<{count}H", body, offset))
+            offset += count * 2
+            jumps, offset = _unpack_u16(body, offset)
+            cards, offset = _unpack_u16(body, offset)
+            cards = [NO_CARD if slot == V1_NO_CARD else slot for slot in cards]
+            unpack_ids = _unpack_u16
+        else:
+            positions, offset = unpack_uints(body, offset)
+            jumps, offset = unpack_uints(body, offset)
+            cards, offset = unpack_cards(body, offset)
+            unpack_ids = unpack_uints
+        if len(positions) != count:
+            raise ValueError(f"{len(positions)} positions for {count} players")
+        pools = []
+        for _ in range(4):
+            ids, offset = unpack_ids(body, offset)
+            pools.append(ids)
+        (text_size,) = struct.unpack_from("<I", body, offset)
+        offset += 4
+        raw_texts = zlib.decompress(body[offset:offset + text_size]).decode("utf-8")
+    except (struct.error, zlib.error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"save file is corrupt: {e}") from e
+
+    texts = raw_texts.split("\0") if raw_texts else []
+    slots = [slot for slot in cards if slot != NO_CARD] + [slot for p in pools for slot in p]
+    if slots and max(slots) >= len(texts):
+        raise ValueError("save file is corrupt: card outside the text table")
+    ids = [index.add(text).id for text in texts]
+
+    snakes = {tile: dest for tile, dest in enumerate(jumps) if dest and dest < tile}
+    ladders = {tile: dest for tile, dest in enumerate(jumps) if dest and dest > tile}
+    challenges = {str(tile): ids[slot] for tile, slot in enumerate(cards) if slot != NO_CARD}
+    truth_master, dare_master, truth_pool, dare_pool = ([ids[s] for s in p] for p in pools)
+
+    return SavedGame(players, level, turn, None if winner < 0 else winner, turns_played,
+                     positions, snakes, ladders, challenges,
+                     truth_master, dare_master, truth_pool, dare_pool)
+
+
+def restore_game(saved: SavedGame, state: GameState, deck: Optional[ChallengeDeck] = None) -> None:
+    """Terapkan save ke GameState (dan deck) yang sudah dibuat untuk pemain & level yang sama"""
+    state.reset_for_new_game(saved.players, saved.level)
+    state.positions[:] = saved.positions
+    state.turn = saved.turn
+    state.snakes = dict(saved.snakes)
+    state.ladders = dict(saved.ladders)
+    state.challenges = dict(saved.challenges)
+    if deck is not None:
+        deck.truth_master = list(saved.truth_master)
+        deck.dare_master = list(saved.dare_master)
+        deck.truth_pool = list(saved.truth_pool)
+        deck.dare_pool = list(saved.dare_pool)
+
+
+def save_game(path: str, state: GameState, deck: Optional[ChallengeDeck] = None,
+              winner: Optional[int] = None, turns_played: int = 0) -> bool:
+    """Tulis snapshot secara atomik (file .tmp lalu os.replace); False jika gagal"""
+    tmp = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(encode_game(state, deck, winner, turns_played))
+        os.replace(tmp, path)
+        return True
+    except (OSError, struct.error, ValueError) as e:
+        logger.warning(f"Game save to {path} failed: {e}")
+        return False
+
+
+def load_snapshot(path: str) -> Optional[bytes]:
+    """Isi file save yang sudah dicek valid, atau None jika tidak ada / tidak bisa dibaca"""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        decode_game(data)
+        return data
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Save file {path} unusable: {e}")
+        return None
+
+
+def load_game(path: str) -> Optional[SavedGame]:
+    """Save di `path`, atau None jika tidak ada / tidak bisa dibaca"""
+    data = load_snapshot(path)
+    return decode_game(data) if data is not None else None
+
+
+def has_save(path: str) -> bool:
+    """Cek cepat (hanya header) apakah ada save yang bisa dilanjutkan"""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, version, _, _ = HEADER.unpack(header)
+    return magic == SAVE_MAGIC and version in READABLE_VERSIONS
+
+
+def delete_save(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not delete save {path}: {e}")
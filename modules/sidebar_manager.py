@@ -2,6 +2,61 @@ import pygame
 import os
 import re
 
+from modules.text_cache import render_text
+from modules.challenge_index import challenge_text
+from modules.sprite_atlas import Sprite
+
+LOG_ICON_SIZE = (20, 20)
+ICON_FILES = {
+    "move": "pindah.png",
+    "snake": "ular_icon.png",
+    "ladder": "tangga_icon.png",
+    "challenge": "scroll_icon.png"
+}
+
+def card_alpha(i):
+    """Transparansi kartu giliran ke-i (0 = terbaru)"""
+    return 255 if i == 0 else max(220 - (i * 50), 40)
+
+# Semua tingkat transparansi kartu yang mungkin (ikon versi pudar ada di atlas)
+CARD_ALPHAS = tuple(sorted({card_alpha(i) for i in range(8)}, reverse=True))
+
+def load_icons(image_dir, load_image=pygame.image.load):
+    """Ikon log 20x20 dari images/, lingkaran abu-abu jika file tidak ada"""
+    icons = {}
+    for key, filename in ICON_FILES.items():
+        path = os.path.join(image_dir, filename)
+        try:
+            img = load_image(path).convert_alpha()
+            icons[key] = pygame.transform.smoothscale(img, LOG_ICON_SIZE)
+        except Exception:
+            surf = pygame.Surface(LOG_ICON_SIZE, pygame.SRCALPHA)
+            pygame.draw.circle(surf, (150, 150, 150), (10, 10), 8)
+            icons[key] = surf
+    return icons
+
+def faded_icon(surface, alpha):
+    """Salinan ikon dengan alpha per piksel dikali alpha (sama dengan set_alpha saat blit)"""
+    img = surface.copy()
+    if alpha < 255:
+        img.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    return img
+
+def icon_sources(icons, dice_images, hero_avatars):
+    """Semua ikon yang bisa muncul di log: ikon tetap, dadu 1-6 dan avatar, 20x20"""
+    sources = dict(icons)
+    for n, img in dice_images.items():
+        sources[f"dice_{n}"] = pygame.transform.smoothscale(img, LOG_ICON_SIZE)
+    for idx, img in enumerate(hero_avatars):
+        sources[f"hero_{idx}"] = pygame.transform.smoothscale(img, LOG_ICON_SIZE)
+    return sources
+
+def atlas_icons(icons, dice_images, hero_avatars):
+    """(nama, surface) setiap ikon di setiap CARD_ALPHAS untuk SpriteAtlas.add"""
+    for key, img in icon_sources(icons, dice_images, hero_avatars).items():
+        for alpha in CARD_ALPHAS:
+            yield f"icon_{key}@{alpha}", faded_icon(img, alpha)
+
 def clean_log_text(text):
     """
     Membersihkan teks dari karakter error (glitch), 
@@ -11,10 +66,18 @@ def clean_log_text(text):
     return cleaned.strip()
 
 class SidebarManager:
-    def __init__(self, image_dir, dice_images, hero_avatars, font_path=None):
+    def __init__(self, image_dir, dice_images, hero_avatars, font_path=None, load_image=pygame.image.load,
+                 icons=None, atlas=None):
+        """
+        icons: hasil load_icons() jika sudah dimuat; atlas: SpriteAtlas berisi
+        atlas_icons(), ikon lalu digambar langsung dari halaman atlas
+        """
         self.dice_images = dice_images
         self.hero_avatars = hero_avatars 
-        self.icons = {}
+        self.icons = icons if icons is not None else load_icons(image_dir, load_image)
+        self.atlas = atlas
+        self.icon_cache = {}
+        self.layout_cache = {}
         
         if font_path and os.path.exists(font_path):
             self.font = pygame.font.Font(font_path, 13) 
@@ -22,24 +85,23 @@ class SidebarManager:
         else:
             self.font = pygame.font.SysFont("segoe ui", 13)
             self.bold_font = pygame.font.SysFont("segoe ui", 15, bold=True)
-        
-        target_size = (20, 20)
-        names = {
-            "move": "pindah.png", 
-            "snake": "ular_icon.png", 
-            "ladder": "tangga_icon.png", 
-            "challenge": "scroll_icon.png"
-        }
-        
-        for key, filename in names.items():
-            path = os.path.join(image_dir, filename)
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                self.icons[key] = pygame.transform.smoothscale(img, target_size)
-            except Exception:
-                surf = pygame.Surface(target_size, pygame.SRCALPHA)
-                pygame.draw.circle(surf, (150, 150, 150), (10, 10), 8)
-                self.icons[key] = surf
+
+    def icon_sprite(self, key, alpha):
+        """Sprite ikon `key` (lihat get_icon_for_text) pada transparansi kartu `alpha`"""
+        name = f"icon_{key}@{alpha}"
+        if self.atlas is not None and name in self.atlas:
+            return self.atlas[name]
+        sprite = self.icon_cache.get(name)
+        if sprite is None:
+            # Tanpa atlas: dibuat sekali per ikon & alpha, bukan copy() tiap frame
+            if key.startswith("dice_"):
+                source = pygame.transform.smoothscale(self.dice_images[int(key[5:])], LOG_ICON_SIZE)
+            elif key.startswith("hero_"):
+                source = pygame.transform.smoothscale(self.hero_avatars[int(key[5:])], LOG_ICON_SIZE)
+            else:
+                source = self.icons[key]
+            sprite = self.icon_cache[name] = Sprite.of(faded_icon(source, alpha), name)
+        return sprite
 
     def get_contrast_color(self, color):
         lum = 0.299 * color[0] + 0.587 * color[1] + 0.114 * color[2]
@@ -71,8 +133,8 @@ class SidebarManager:
         return lines
 
     def get_icon_for_text(self, text, challenges_dict, players_list, colors_list):
+        """(kunci ikon atau None, teks bersih); gambar ikonnya lewat icon_sprite()"""
         clean_text = clean_log_text(text)
-        target_size = (20, 20)
         lower_text = text.lower()
 
         scroll_keywords = ["truth", "dare", "tantangan", "challenge", "zonk", "scroll", "misi", "quest"]
@@ -82,31 +144,30 @@ class SidebarManager:
         is_game_system = "dice" in lower_text or "dadu" in lower_text or "turn" in lower_text or "win" in lower_text
         
         if (any(k in lower_text for k in scroll_keywords) or has_symbol) or (is_long_text and not is_game_system):
-            return self.icons.get("challenge"), clean_text
+            return "challenge", clean_text
 
         if "dice" in lower_text or "dadu" in lower_text:
             nums = re.findall(r'\d+', clean_text)
             if nums and 1 <= int(nums[0]) <= 6:
-                return pygame.transform.smoothscale(self.dice_images[int(nums[0])], target_size), clean_text
+                return f"dice_{int(nums[0])}", clean_text
         
         if "snake" in lower_text or "ular" in lower_text or "🐍" in text: 
-            return self.icons.get("snake"), clean_text
+            return "snake", clean_text
         if "ladder" in lower_text or "tangga" in lower_text or "🪜" in text: 
-            return self.icons.get("ladder"), clean_text
+            return "ladder", clean_text
         if "stop" in lower_text or "berhenti" in lower_text: 
-            return self.icons.get("move"), clean_text
+            return "move", clean_text
         
         for idx, name in enumerate(players_list):
             if name in clean_text:
                 if idx < len(self.hero_avatars):
-                    original_img = self.hero_avatars[idx]
-                    small_icon = pygame.transform.smoothscale(original_img, target_size)
-                    return small_icon, clean_text
+                    return f"hero_{idx}", clean_text
         
         if challenges_dict:
-            for c_text in challenges_dict.values():
+            for value in challenges_dict.values():
+                c_text = challenge_text(value)
                 if c_text and (clean_text in c_text or c_text in clean_text):
-                     return self.icons.get("challenge"), clean_text
+                     return "challenge", clean_text
 
         return None, clean_text
 
@@ -123,16 +184,12 @@ class SidebarManager:
             elif "maju" in word_lower: color = (100, 255, 100)
             elif "ular" in word_lower: color = (150, 255, 150)
             
-            surf = self.font.render(word + " ", True, color)
-            surf.set_alpha(alpha)
+            surf = render_text(self.font, word + " ", True, color, alpha=alpha)
             screen.blit(surf, (cursor_x, y))
             cursor_x += surf.get_width()
 
-    def draw_history_ui(self, screen, history, players, colors, challenges, start_y, sidebar_width, width_total):
-        y_log = start_y
-        sidebar_x = width_total - sidebar_width
-        max_y = 680 
-        
+    def split_turn_blocks(self, history, players):
+        """Kelompokkan list log biasa per giliran (untuk pemanggil tanpa block id)"""
         turn_blocks = []
         current_block = []
         
@@ -152,49 +209,82 @@ class SidebarManager:
             current_block.append(entry)
         
         if current_block: turn_blocks.append(current_block)
-        reversed_blocks = turn_blocks[::-1] 
+        return turn_blocks
+
+    def layout_block(self, block, players, colors, challenges, sidebar_width):
+        """Ikon + word-wrap satu kartu giliran -> (wrapped_content, player_idx)"""
+        ICON_GAP = 30
+
+        wrapped_content = []
+        player_idx = -1
+        
+        for line in block:
+            icon, clean_txt = self.get_icon_for_text(line, challenges, players, colors)
+            
+            is_header = "▶" in line
+            if is_header:
+                for idx, p in enumerate(players):
+                    if p in clean_txt:
+                        player_idx = idx
+                        break
+            elif icon and player_idx == -1:
+                 for idx, p in enumerate(players):
+                    if p in clean_txt:
+                        player_idx = idx
+                        is_header = True
+                        break
+
+            display_txt = clean_txt.replace("▶", "").replace("ｶ", "").strip()
+            
+            max_text_width = sidebar_width - (20 + ICON_GAP + 20)
+            target_font = self.bold_font if is_header else self.font
+            wrapped_lines = self.wrap_text(display_txt, target_font, max_text_width)
+            
+            for j, line_txt in enumerate(wrapped_lines):
+                current_icon = icon if j == 0 else None
+                wrapped_content.append({"text": line_txt, "icon": current_icon, "is_header": is_header})
+
+        return wrapped_content, player_idx
+
+    def draw_history_ui(self, screen, history, players, colors, challenges, start_y, sidebar_width, width_total, blocks=None):
+        """
+        Gambar kartu-kartu giliran, terbaru di atas.
+
+        blocks: (block_id, lines) terbaru dulu dari LogManager.iter_recent_blocks().
+        Layout tiap blok di-cache per block_id, jadi giliran baru hanya
+        mengukur teksnya sendiri. Tanpa blocks, `history` dikelompokkan ulang.
+        """
+        y_log = start_y
+        sidebar_x = width_total - sidebar_width
+        max_y = 680 
+        
+        if blocks is None:
+            blocks = [(None, block) for block in reversed(self.split_turn_blocks(history, players))]
+
+        used_layouts = {}
         
         PADDING = 12
         LINE_H = 24
         ICON_SIZE = 20
         ICON_GAP = 30
         
-        for i, block in enumerate(reversed_blocks):
-            wrapped_content = []
-            player_idx = -1
-            
-            for line in block:
-                icon, clean_txt = self.get_icon_for_text(line, challenges, players, colors)
-                
-                is_header = "▶" in line
-                if is_header:
-                    for idx, p in enumerate(players):
-                        if p in clean_txt:
-                            player_idx = idx
-                            break
-                elif icon and player_idx == -1:
-                     for idx, p in enumerate(players):
-                        if p in clean_txt:
-                            player_idx = idx
-                            is_header = True
-                            break
-
-                display_txt = clean_txt.replace("▶", "").replace("ｶ", "").strip()
-                
-                max_text_width = sidebar_width - (20 + ICON_GAP + 20)
-                target_font = self.bold_font if is_header else self.font
-                wrapped_lines = self.wrap_text(display_txt, target_font, max_text_width)
-                
-                for j, line_txt in enumerate(wrapped_lines):
-                    current_icon = icon if j == 0 else None
-                    wrapped_content.append({"text": line_txt, "icon": current_icon, "is_header": is_header})
+        for i, (block_id, block) in enumerate(blocks):
+            if block_id is None:
+                wrapped_content, player_idx = self.layout_block(block, players, colors, challenges, sidebar_width)
+            else:
+                key = (block_id, len(block), tuple(players), tuple(colors), sidebar_width)
+                layout = self.layout_cache.get(key)
+                if layout is None:
+                    layout = self.layout_block(block, players, colors, challenges, sidebar_width)
+                used_layouts[key] = layout
+                wrapped_content, player_idx = layout
 
             content_height = len(wrapped_content) * LINE_H
             card_h = content_height + (PADDING * 2)
             
             if y_log + card_h > max_y: break
             
-            alpha = 255 if i == 0 else max(220 - (i * 50), 40)
+            alpha = card_alpha(i)
             
             player_color = (100, 100, 100)
             if player_idx != -1: player_color = colors[player_idx]
@@ -219,6 +309,7 @@ class SidebarManager:
 
             text_y = y_log + PADDING
             text_x = card_rect.x + 18 
+            icon_blits = []
             
             for line_data in wrapped_content:
                 txt_start_x = text_x + ICON_GAP
@@ -229,17 +320,20 @@ class SidebarManager:
                     base_col = (200, 200, 210)
 
                 if line_data["icon"]:
-                    icon_copy = line_data["icon"].copy()
-                    icon_copy.set_alpha(alpha)
                     center_y = text_y + (LINE_H - ICON_SIZE) // 2
-                    screen.blit(icon_copy, (text_x, center_y)) 
+                    icon_blits.append(self.icon_sprite(line_data["icon"], alpha).blit_args((text_x, center_y)))
                 
                 if line_data["is_header"]:
-                    surf = self.bold_font.render(line_data["text"], True, base_col)
+                    surf = render_text(self.bold_font, line_data["text"], True, base_col)
                     screen.blit(surf, (txt_start_x, text_y))
                 else:
                     self.draw_rich_text(screen, line_data["text"], txt_start_x, text_y, base_col, alpha)
                 
                 text_y += LINE_H
 
-            y_log += card_h + 10
\ No newline at end of file
+            # Ikon satu kartu sekaligus (semuanya sub-rect halaman atlas)
+            screen.blits(icon_blits, doreturn=False)
+            y_log += card_h + 10
+
+        if used_layouts:
+            self.layout_cache = used_layouts
@@ -0,0 +1,81 @@
+import math
+import os
+import sys
+from typing import List, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from game_constants import SNAKE_PHASE_FRAMES
+
+SNAKE_STEPS = 45
+SNAKE_FREQ = 3.5
+SNAKE_AMP = 25
+SNAKE_WIGGLE_SPEED = 0.002   # radians per ms
+SPINE_LEN = 10
+SHADOW_OFFSET = 8
+
+Point = Tuple[float, float]
+
+_wave_tables = {}
+
+
+def wave_table(frames: int = SNAKE_PHASE_FRAMES) -> np.ndarray:
+    """
+    Sideways wiggle offset of every spine sample for every phase frame.
+
+    Shape (frames, SNAKE_STEPS); row k is the body at phase 2*pi*k/frames.
+    The table does not depend on the snake, so all snakes share it.
+    """
+    table = _wave_tables.get(frames)
+    if table is None:
+        t = np.linspace(0.0, 1.0, SNAKE_STEPS)
+        phases = np.arange(frames) * (2 * math.pi / frames)
+        table = np.sin(t[None, :] * math.pi * SNAKE_FREQ + phases[:, None]) * SNAKE_AMP
+        _wave_tables[frames] = table
+    return table
+
+
+def phase_frame(time_ms: int, frames: int = SNAKE_PHASE_FRAMES) -> int:
+    """Phase frame to show at `time_ms` (same clock as the old per-frame sin)"""
+    phase = (time_ms * SNAKE_WIGGLE_SPEED) % (2 * math.pi)
+    return int(phase * frames / (2 * math.pi)) % frames
+
+
+class SnakeGeometry:
+    """
+    Every animation frame of one snake body, computed once.
+
+    Holds, per phase frame, the spine points, the shadow points and the
+    spine dot centres as plain lists so drawing is only pygame.draw calls.
+    """
+
+    def __init__(self, sx: float, sy: float, ex: float, ey: float,
+                 frames: int = SNAKE_PHASE_FRAMES) -> None:
+        self.frames = frames
+
+        t = np.linspace(0.0, 1.0, SNAKE_STEPS)
+        xs = sx + (ex - sx) * t + wave_table(frames)
+        ys = np.broadcast_to(sy + (ey - sy) * t, xs.shape)
+
+        # Dots sit SPINE_LEN to the left of the body direction at every 4th sample
+        idx = np.arange(2, SNAKE_STEPS - 5, 4)
+        dx = xs[:, idx + 1] - xs[:, idx]
+        dy = ys[:, idx + 1] - ys[:, idx]
+        length = np.hypot(dx, dy)
+        length[length == 0] = 1.0
+        dot_x = (xs[:, idx] + dy / length * SPINE_LEN).astype(np.int32)
+        dot_y = (ys[:, idx] - dx / length * SPINE_LEN).astype(np.int32)
+
+        pts = np.stack([xs, ys], axis=-1)
+        self.points: List[List[Point]] = [list(map(tuple, f)) for f in pts.tolist()]
+        self.shadow: List[List[Point]] = [
+            list(map(tuple, f)) for f in (pts + SHADOW_OFFSET).tolist()
+        ]
+        self.dots: List[List[Tuple[int, int]]] = [
+            list(zip(fx, fy)) for fx, fy in zip(dot_x.tolist(), dot_y.tolist())
+        ]
+
+    def frame(self, time_ms: int) -> int:
+        return phase_frame(time_ms, self.frames)
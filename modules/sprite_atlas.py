@@ -0,0 +1,229 @@
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from game_constants import ATLAS_PAGE_SIZE, ATLAS_PADDING
+
+BYTES_PER_PIXEL = 4
+
+
+class Sprite:
+    """
+    One image in an atlas page: `area` of `sheet`.
+
+    A trimmed sprite only stores the non-transparent part of the original
+    image; `offset` is where that part sat in the original `size` frame, so
+    callers keep positioning by the original image (rect(), dest()).
+    `surface` is a subsurface of the page: a normal Surface for code that
+    blits or scales single images, without pixels of its own.
+    """
+
+    __slots__ = ("name", "sheet", "area", "offset", "size", "surface")
+
+    def __init__(self, name: str, sheet: pygame.Surface, area: pygame.Rect,
+                 offset: Tuple[int, int] = (0, 0), size: Optional[Tuple[int, int]] = None) -> None:
+        self.name = name
+        self.sheet = sheet
+        self.area = pygame.Rect(area)
+        self.offset = offset
+        self.size = size or self.area.size
+        self.surface = sheet.subsurface(self.area)
+
+    @classmethod
+    def of(cls, surface: pygame.Surface, name: str = "") -> "Sprite":
+        """A whole standalone surface as a sprite (no atlas)"""
+        return cls(name, surface, surface.get_rect())
+
+    def rect(self, **position: Any) -> pygame.Rect:
+        """Rect of the original image, placed like Surface.get_rect(center=...)"""
+        return self._placed(position)
+
+    def _placed(self, position: Dict[str, Any]) -> pygame.Rect:
+        rect = pygame.Rect((0, 0), self.size)
+        for attr, value in position.items():
+            setattr(rect, attr, value)
+        return rect
+
+    def bounds(self, **position: Any) -> pygame.Rect:
+        """Screen rect of the stored (trimmed) pixels for the original placed like rect()"""
+        rect = self._placed(position)
+        return pygame.Rect(rect.x + self.offset[0], rect.y + self.offset[1], self.area.width, self.area.height)
+
+    def dest(self, topleft: Tuple[float, float]) -> Tuple[float, float]:
+        """Blit position of the stored pixels for the original image at `topleft`"""
+        return topleft[0] + self.offset[0], topleft[1] + self.offset[1]
+
+    def blit_args(self, topleft: Tuple[float, float]) -> Tuple[pygame.Surface, Tuple[float, float], pygame.Rect]:
+        """(source, dest, area) for Surface.blits"""
+        return self.sheet, self.dest(topleft), self.area
+
+
+class ShelfPacker:
+    """
+    Shelf (row) packing into a page `width` wide.
+
+    Fed tallest first: each shelf is as tall as the image that opened it
+    and is filled left to right in columns. An image first stacks under
+    the others in a column of a shelf with room left (small icons fill
+    the height of a tall shelf), then starts a new column at the end of
+    a shelf, and only then opens a new shelf at the bottom.
+    """
+
+    def __init__(self, width: int, max_height: int, padding: int = 0) -> None:
+        self.width = width
+        self.max_height = max_height
+        self.padding = padding
+        self.shelves: List[List[Any]] = []  # [y, tinggi, x berikutnya, kolom [x, lebar, y terisi]]
+        self.height = 0
+
+    def insert(self, w: int, h: int) -> Optional[pygame.Rect]:
+        """Place a w x h image; None if the page is full"""
+        pad = self.padding
+        if w + 2 * pad > self.width:
+            return None
+        for y, shelf_h, _, columns in self.shelves:
+            for column in columns:
+                x, col_w, used = column
+                if w <= col_w and used + h + pad <= shelf_h:
+                    column[2] = used + h + pad
+                    return pygame.Rect(x + pad, y + used + pad, w, h)
+        for shelf in self.shelves:
+            y, shelf_h, x, columns = shelf
+            if h + pad <= shelf_h and x + w + 2 * pad <= self.width:
+                shelf[2] = x + w + pad
+                columns.append([x, w, h + pad])
+                return pygame.Rect(x + pad, y + pad, w, h)
+        y = self.height
+        if y + h + 2 * pad > self.max_height:
+            return None
+        self.shelves.append([y, h + pad, w + pad, [[0, w, h + pad]]])
+        self.height = y + h + pad
+        return pygame.Rect(pad, y + pad, w, h)
+
+    @property
+    def used_height(self) -> int:
+        """Page height needed, including the padding under the last shelf"""
+        return self.height + self.padding if self.shelves else 0
+
+
+class SpriteAtlas:
+    """
+    Small images packed into a few large per-pixel-alpha pages.
+
+    add() every image, then build() once: images are (optionally) trimmed
+    to their visible pixels, packed tallest first with ShelfPacker, and
+    copied into pages sized to what they hold. After build() the source
+    surfaces are no longer referenced; sprites point into the pages.
+    """
+
+    def __init__(self, page_size: int = ATLAS_PAGE_SIZE, padding: int = ATLAS_PADDING) -> None:
+        self.page_size = page_size
+        self.padding = padding
+        self.pending: List[Tuple[str, pygame.Surface, bool]] = []
+        self.sprites: Dict[str, Sprite] = {}
+        self.pages: List[pygame.Surface] = []
+        self.source_bytes = 0
+
+    def add(self, name: str, surface: pygame.Surface, trim: bool = False) -> None:
+        """Queue an image; trim=True drops its fully transparent border"""
+        self.pending.append((name, surface, trim))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sprites
+
+    def __getitem__(self, name: str) -> Sprite:
+        return self.sprites[name]
+
+    def get(self, name: str) -> Optional[Sprite]:
+        return self.sprites.get(name)
+
+    def surface(self, name: str) -> pygame.Surface:
+        return self.sprites[name].surface
+
+    def _layout(self, items: List[Tuple[str, pygame.Rect, Any]], width: int) -> Tuple[List[List[Tuple[Any, pygame.Rect]]], List[int]]:
+        """Pack items (tallest first) into pages `width` wide -> (placements per page, page heights)"""
+        pages: List[List[Tuple[Any, pygame.Rect]]] = []
+        heights: List[int] = []
+        packer = None
+        for item in items:
+            w, h = item[1].size
+            rect = packer.insert(w, h) if packer else None
+            if rect is None:
+                packer = ShelfPacker(width, self.page_size, self.padding)
+                rect = packer.insert(w, h)
+                if rect is None:
+                    raise ValueError(f"sprite {item[0]} ({w}x{h}) does not fit a {self.page_size} px atlas page")
+                pages.append([])
+                heights.append(0)
+            pages[-1].append((item, rect))
+            heights[-1] = packer.used_height
+        return pages, heights
+
+    def build(self) -> "SpriteAtlas":
+        items = []
+        for name, surface, trim in self.pending:
+            self.source_bytes += surface.get_width() * surface.get_height() * BYTES_PER_PIXEL
+            content = surface.get_bounding_rect() if trim else surface.get_rect()
+            if content.width == 0 or content.height == 0:
+                content = pygame.Rect(0, 0, 1, 1)  # Kosong total: tetap satu piksel supaya ada sprite-nya
+            items.append((name, content, surface))
+        self.pending = []
+        items.sort(key=lambda item: (-item[1].height, -item[1].width))
+
+        # Lebar halaman: pangkat dua terkecil yang memberi luas total paling kecil
+        best = None
+        width = 64
+        while True:
+            width = min(width, self.page_size)
+            if all(item[1].width + 2 * self.padding <= width for item in items):
+                pages, heights = self._layout(items, width)
+                area = width * sum(heights)
+                if best is None or area < best[0]:
+                    best = (area, width, pages, heights)
+            if width >= self.page_size:
+                break
+            width *= 2
+
+        _, width, pages, heights = best
+        for placements, height in zip(pages, heights):
+            page = pygame.Surface((width, max(1, height)), pygame.SRCALPHA).convert_alpha()
+            page.fill((0, 0, 0, 0))
+            for (name, content, surface), rect in placements:
+                page.blit(surface, rect, content, special_flags=pygame.BLEND_RGBA_MAX)
+                self.sprites[name] = Sprite(name, page, rect, content.topleft, surface.get_size())
+            self.pages.append(page)
+        return self
+
+    def blits(self, target: pygame.Surface,
+              items: Iterable[Tuple[Union[str, Sprite], Tuple[float, float]]]) -> None:
+        """Draw many (sprite or name, original top-left) in one Surface.blits call"""
+        sprites = self.sprites
+        target.blits([
+            (sprite if isinstance(sprite, Sprite) else sprites[sprite]).blit_args(topleft)
+            for sprite, topleft in items
+        ], doreturn=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Packing efficiency (sprite pixels / page pixels) and memory, atlas vs separate surfaces"""
+        page_px = sum(p.get_width() * p.get_height() for p in self.pages)
+        sprite_px = sum(s.area.width * s.area.height for s in self.sprites.values())
+        original_px = sum(s.size[0] * s.size[1] for s in self.sprites.values())
+        return {
+            "sprites": len(self.sprites),
+            "pages": [list(p.get_size()) for p in self.pages],
+            "efficiency": round(sprite_px / page_px, 3) if page_px else 0.0,
+            "trimmed_px": original_px - sprite_px,
+            "atlas_bytes": page_px * BYTES_PER_PIXEL,
+            "separate_bytes": self.source_bytes,
+        }
+
+    def report(self) -> str:
+        s = self.stats()
+        pages = ", ".join(f"{w}x{h}" for w, h in s["pages"])
+        return (f"Atlas: {s['sprites']} sprite di {len(s['pages'])} halaman ({pages}), "
+                f"efisiensi {s['efficiency']:.0%}, {s['atlas_bytes'] / 1024:.0f} KB "
+                f"(terpisah {s['separate_bytes'] / 1024:.0f} KB)")
@@ -0,0 +1,328 @@
+"""
+Sinkronisasi State - Protokol biner snapshot + delta untuk layar/klien jarak jauh
+
+Klien menerima satu SNAPSHOT lalu satu DELTA setiap kali state berubah
+(biasanya dua per giliran: setelah dadu/ular/tangga dan setelah kartu).
+
+Frame (little-endian):
+    header      jenis (1 = snapshot, 2 = delta), seq uint32, panjang body uint32
+    snapshot    pemain, level, giliran, flag; nama pemain; posisi
+                ular & tangga (dari, ke); kartu (kotak, ID); teks kartu (ID, teks)
+                semua baris log
+    delta       dadu (0 = tidak ada), giliran, flag
+                posisi yang berubah (pemain, kotak)
+                kartu yang berubah (kotak, ID; NO_CARD = kartu hilang)
+                teks kartu baru (ID, teks); baris log baru
+
+Kotak, posisi dan ID kartu adalah varint dari modules/binary_codec (sama
+dengan save_game), jadi ID di atas 65535 tetap terkirim dan NO_CARD
+tidak memakai ID yang sah.
+
+ID kartu adalah ID challenge_index di proses pengirim. Teks sebuah ID
+hanya dikirim saat ID itu belum ada di papan pada frame sebelumnya,
+sehingga klien yang baru saja snapshot dan klien yang mengikuti semua
+delta sama-sama bisa membaca setiap delta berikutnya.
+
+Delta seq N hanya berlaku di atas state seq N - 1. Klien yang melewatkan
+satu frame (koneksi putus, antrian penuh) meminta snapshot baru
+(StateMirror.apply mengembalikan False).
+"""
+import os
+import sys
+import struct
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.game_state import GameState
+from modules.challenge_index import challenge_index, get_record
+from modules.binary_codec import NO_CARD, pack_uints, unpack_uints, pack_cards, unpack_cards
+
+FRAME_SNAPSHOT = 1
+FRAME_DELTA = 2
+FRAME = struct.Struct("<BII")   # jenis, seq, panjang body
+SNAP_HEAD = struct.Struct("<BBBB")  # pemain, level, giliran, flag
+DELTA_HEAD = struct.Struct("<BBB")  # dadu, giliran, flag
+FLAG_LOG_CLOSED = 0x01  # Giliran terakhir di log sudah selesai (end_turn)
+U16 = struct.Struct("<H")
+MAX_BODY = 1 << 24
+
+
+# ----------------------------------------------------------------------
+# Encoding bagian-bagian body
+# ----------------------------------------------------------------------
+def _pack_pairs(pairs: List[Tuple[int, int]]) -> bytes:
+    return pack_uints(v for pair in pairs for v in pair)
+
+
+def _unpack_pairs(data: bytes, offset: int) -> Tuple[List[Tuple[int, int]], int]:
+    flat, offset = unpack_uints(data, offset)
+    if len(flat) % 2:
+        raise ValueError("odd number of values in a pair list")
+    return list(zip(flat[0::2], flat[1::2])), offset
+
+
+def _pack_card_pairs(pairs: List[Tuple[int, int]]) -> bytes:
+    """(kotak, ID kartu atau NO_CARD)"""
+    return pack_uints(tile for tile, _ in pairs) + pack_cards(card for _, card in pairs)
+
+
+def _unpack_card_pairs(data: bytes, offset: int) -> Tuple[List[Tuple[int, int]], int]:
+    tiles, offset = unpack_uints(data, offset)
+    cards, offset = unpack_cards(data, offset)
+    if len(tiles) != len(cards):
+        raise ValueError("card list does not match its tiles")
+    return list(zip(tiles, cards)), offset
+
+
+def _pack_strings(texts: List[str]) -> bytes:
+    parts = [U16.pack(len(texts))]
+    for text in texts:
+        raw = text.encode("utf-8")[:0xFFFF]
+        parts.append(U16.pack(len(raw)) + raw)
+    return b"".join(parts)
+
+
+def _unpack_strings(data: bytes, offset: int) -> Tuple[List[str], int]:
+    (count,) = U16.unpack_from(data, offset)
+    offset += 2
+    texts = []
+    for _ in range(count):
+        (n,) = U16.unpack_from(data, offset)
+        offset += 2
+        if offset + n > len(data):
+            raise struct.error("string runs past the end of the frame")
+        texts.append(data[offset:offset + n].decode("utf-8"))
+        offset += n
+    return texts, offset
+
+
+def _pack_cards(ids: List[int]) -> bytes:
+    """Teks kartu untuk ID yang belum dikenal klien"""
+    return pack_uints(ids) + _pack_strings([get_record(i).text for i in ids])
+
+
+def _unpack_cards(data: bytes, offset: int) -> Tuple[Dict[int, str], int]:
+    ids, offset = unpack_uints(data, offset)
+    texts, offset = _unpack_strings(data, offset)
+    if len(ids) != len(texts):
+        raise ValueError("card texts do not match their IDs")
+    return dict(zip(ids, texts)), offset
+
+
+def _frame(kind: int, seq: int, body: bytes) -> bytes:
+    return FRAME.pack(kind, seq, len(body)) + body
+
+
+def decode_frame(data: bytes) -> Tuple[int, int, bytes]:
+    """Frame utuh -> (jenis, seq, body); ValueError jika tidak lengkap"""
+    if len(data) < FRAME.size:
+        raise ValueError("frame too short")
+    kind, seq, size = FRAME.unpack_from(data)
+    if kind not in (FRAME_SNAPSHOT, FRAME_DELTA):
+        raise ValueError(f"unknown frame type {kind}")
+    body = data[FRAME.size:]
+    if len(body) != size:
+        raise ValueError("frame length does not match header")
+    return kind, seq, body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> bytes:
+    """Satu frame dari stream; IncompleteReadError jika koneksi tertutup"""
+    header = await reader.readexactly(FRAME.size)
+    _, _, size = FRAME.unpack(header)
+    if size > MAX_BODY:
+        raise ValueError(f"frame of {size} bytes is too large")
+    return header + await reader.readexactly(size)
+
+
+# ----------------------------------------------------------------------
+# Pengirim
+# ----------------------------------------------------------------------
+class StateEncoder:
+    """
+    Sisi server: mengingat state yang terakhir dikirim dan membuat frame.
+
+    Panggil delta() setelah setiap perubahan state, sebelum snapshot()
+    untuk klien baru, agar snapshot dan delta berikutnya cocok. Game baru
+    (reset_for_new_game) perlu encoder baru.
+    """
+
+    def __init__(self, state: GameState) -> None:
+        self.state = state
+        self.seq = 0
+        self.bytes_sent = 0
+        self._positions = list(state.positions)
+        self._turn = state.turn
+        self._flags_sent = self._flags()
+        self._challenges = self._card_map()
+        self._log_total = state.log_manager.total_lines
+
+    def _card_map(self) -> Dict[int, int]:
+        return {int(tile): card for tile, card in self.state.challenges.items()}
+
+    def _flags(self) -> int:
+        return 0 if self.state.log_manager.current_turn_log else FLAG_LOG_CLOSED
+
+    def snapshot(self) -> bytes:
+        """Seluruh state saat ini dengan seq terakhir"""
+        state = self.state
+        cards = self._card_map()
+        parts = [SNAP_HEAD.pack(len(state.players), state.game_level, state.turn, self._flags())]
+        for name in state.players:
+            raw = name.encode("utf-8")[:255]
+            parts.append(struct.pack("<B", len(raw)) + raw)
+        parts.append(pack_uints(state.positions))
+        parts.append(_pack_pairs(sorted(state.snakes.items())))
+        parts.append(_pack_pairs(sorted(state.ladders.items())))
+        parts.append(_pack_card_pairs(sorted(cards.items())))
+        parts.append(_pack_cards(sorted(set(cards.values()))))
+        parts.append(_pack_strings(state.log_manager.get_full_log()))
+        frame = _frame(FRAME_SNAPSHOT, self.seq, b"".join(parts))
+        self.bytes_sent += len(frame)
+        return frame
+
+    def delta(self, dice: Optional[int] = None) -> Optional[bytes]:
+        """Perubahan sejak frame terakhir sebagai frame seq + 1, None jika tidak ada"""
+        state = self.state
+        log = state.log_manager
+
+        moved = [(i, pos) for i, pos in enumerate(state.positions) if self._positions[i] != pos]
+        cards = self._card_map()
+        changed = [(tile, card) for tile, card in cards.items() if self._challenges.get(tile) != card]
+        changed.extend((tile, NO_CARD) for tile in self._challenges if tile not in cards)
+        lines = log.lines_since(self._log_total)
+
+        flags = self._flags()
+        if (dice is None and not moved and not changed and not lines
+                and state.turn == self._turn and flags == self._flags_sent):
+            return None
+
+        known = set(self._challenges.values())
+        new_ids = sorted({card for _, card in changed if card != NO_CARD and card not in known})
+        body = b"".join((
+            DELTA_HEAD.pack(dice or 0, state.turn, flags),
+            _pack_pairs(moved),
+            _pack_card_pairs(sorted(changed)),
+            _pack_cards(new_ids),
+            _pack_strings(lines),
+        ))
+
+        self.seq += 1
+        self._positions = list(state.positions)
+        self._turn = state.turn
+        self._flags_sent = flags
+        self._challenges = cards
+        self._log_total = log.total_lines
+        frame = _frame(FRAME_DELTA, self.seq, body)
+        self.bytes_sent += len(frame)
+        return frame
+
+
+# ----------------------------------------------------------------------
+# Penerima
+# ----------------------------------------------------------------------
+class StateMirror:
+    """
+    Sisi klien: GameState lokal yang dibangun dari frame.
+
+    state.challenges berisi ID challenge_index lokal (teks dari server
+    ditambahkan ke index), jadi renderer dan popup bisa memakainya
+    seperti state biasa.
+    """
+
+    def __init__(self) -> None:
+        self.state: Optional[GameState] = None
+        self.seq: Optional[int] = None
+        self.dice: Optional[int] = None
+        self.local_ids: Dict[int, int] = {}  # ID pengirim -> ID lokal
+        self.frames = 0
+        self.resyncs = 0
+
+    @property
+    def synced(self) -> bool:
+        return self.seq is not None
+
+    def apply(self, frame: bytes) -> bool:
+        """
+        Terapkan satu frame. False = delta tidak bisa dipakai (belum ada
+        snapshot atau ada frame yang hilang): minta snapshot baru.
+        Delta lama (seq sudah lewat) diabaikan. ValueError jika frame rusak.
+        """
+        kind, seq, body = decode_frame(frame)
+        try:
+            if kind == FRAME_SNAPSHOT:
+                self._apply_snapshot(body)
+                self.seq = seq
+                self.frames += 1
+                return True
+            if self.seq is None:
+                return False
+            if seq > self.seq + 1:
+                self.seq = None
+                self.resyncs += 1
+                return False
+            if seq <= self.seq:
+                return True
+            self._apply_delta(body)
+            self.seq = seq
+            self.frames += 1
+            return True
+        except (struct.error, UnicodeDecodeError, KeyError, ValueError) as e:
+            self.seq = None
+            raise ValueError(f"corrupt {'snapshot' if kind == FRAME_SNAPSHOT else 'delta'} frame: {e}") from e
+
+    def _learn(self, texts: Dict[int, str]) -> None:
+        for remote_id, text in texts.items():
+            self.local_ids[remote_id] = challenge_index.add(text).id
+
+    def _apply_snapshot(self, body: bytes) -> None:
+        count, level, turn, flags = SNAP_HEAD.unpack_from(body)
+        offset = SNAP_HEAD.size
+        players = []
+        for _ in range(count):
+            (n,) = struct.unpack_from("<B", body, offset)
+            players.append(body[offset + 1:offset + 1 + n].decode("utf-8"))
+            offset += 1 + n
+        positions, offset = unpack_uints(body, offset)
+        if len(positions) != count:
+            raise ValueError(f"{len(positions)} positions for {count} players")
+        snakes, offset = _unpack_pairs(body, offset)
+        ladders, offset = _unpack_pairs(body, offset)
+        cards, offset = _unpack_card_pairs(body, offset)
+        texts, offset = _unpack_cards(body, offset)
+        lines, offset = _unpack_strings(body, offset)
+
+        self.local_ids = {}
+        self._learn(texts)
+        state = GameState(players, level)
+        state.positions[:] = positions
+        state.turn = turn
+        state.snakes = dict(snakes)
+        state.ladders = dict(ladders)
+        state.challenges = {str(tile): self.local_ids[card] for tile, card in cards}
+        state.log_manager.append_lines(lines, bool(flags & FLAG_LOG_CLOSED))
+        self.state = state
+        self.dice = None
+
+    def _apply_delta(self, body: bytes) -> None:
+        dice, turn, flags = DELTA_HEAD.unpack_from(body)
+        offset = DELTA_HEAD.size
+        moved, offset = _unpack_pairs(body, offset)
+        changed, offset = _unpack_card_pairs(body, offset)
+        texts, offset = _unpack_cards(body, offset)
+        lines, offset = _unpack_strings(body, offset)
+
+        self._learn(texts)
+        state = self.state
+        for player, pos in moved:
+            state.positions[player] = pos
+        for tile, card in changed:
+            if card == NO_CARD:
+                state.challenges.pop(str(tile), None)
+            else:
+                state.challenges[str(tile)] = self.local_ids[card]
+        state.turn = turn
+        state.log_manager.append_lines(lines, bool(flags & FLAG_LOG_CLOSED))
+        self.dice = dice or None
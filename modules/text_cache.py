@@ -0,0 +1,78 @@
+import os
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from game_constants import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """
+    Bounded LRU cache of rendered text surfaces.
+
+    Keyed by font object, text, antialias, color, background and alpha, so
+    the same label drawn every frame is rasterized once. Returned surfaces
+    are shared: blit them, never draw on them or change their alpha
+    (pass `alpha=` instead, it is part of the key).
+    """
+
+    def __init__(self, max_entries: int = TEXT_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[Any, ...], pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color: Any,
+               background: Any = None, alpha: Optional[int] = None) -> pygame.Surface:
+        """Same arguments as Font.render, plus an optional per-surface alpha"""
+        key = (
+            font, text, antialias, tuple(color),
+            tuple(background) if background is not None else None,
+            alpha,
+        )
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        if background is None:
+            surf = font.render(text, antialias, color)
+        else:
+            surf = font.render(text, antialias, color, background)
+        if alpha is not None:
+            surf.set_alpha(alpha)
+
+        self.entries[key] = surf
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return surf
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+text_cache = TextCache()
+
+
+def render_text(font: pygame.font.Font, text: str, antialias: bool, color: Any,
+                background: Any = None, alpha: Optional[int] = None) -> pygame.Surface:
+    """Cached Font.render using the shared text cache"""
+    return text_cache.render(font, text, antialias, color, background, alpha)
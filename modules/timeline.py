@@ -0,0 +1,225 @@
+import os
+import sys
+from typing import Any, Callable, Generator, List, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from game_constants import ANIMATION_STEP_MS
+
+# Longest real frame the timeline will catch up on (window drag, breakpoint, ...)
+MAX_FRAME_MS = 250
+
+
+class Task:
+    """
+    Something the timeline advances in fixed steps.
+
+    step(dt) advances by dt milliseconds and returns the part of dt it did
+    not need (non-zero only on the step that finishes the task), so a
+    sequence can hand the remainder to the next task and the total duration
+    does not depend on where the step boundaries fall.
+    """
+
+    done = False
+
+    def step(self, dt: float) -> float:
+        raise NotImplementedError
+
+    def skip(self) -> None:
+        """Jump to the end state"""
+        raise NotImplementedError
+
+
+class Tween(Task):
+    """
+    Progress 0..1 over `duration` ms of simulated time.
+
+    on_step(progress) runs after every fixed step, on_done() once at the
+    end (also when skipped; on_step is then not called for the skipped
+    steps). value(alpha) interpolates between the last two steps for
+    rendering between them.
+    """
+
+    def __init__(self, duration: float, on_step: Optional[Callable[[float], None]] = None,
+                 on_done: Optional[Callable[[], None]] = None) -> None:
+        self.duration = max(0.0, float(duration))
+        self.on_step = on_step
+        self.on_done = on_done
+        self.elapsed = 0.0
+        self.prev_elapsed = 0.0
+        self.done = False
+
+    @property
+    def progress(self) -> float:
+        return 1.0 if self.duration == 0 else min(1.0, self.elapsed / self.duration)
+
+    def value(self, alpha: float = 1.0) -> float:
+        if self.done or self.duration == 0:
+            return 1.0
+        elapsed = self.prev_elapsed + (self.elapsed - self.prev_elapsed) * alpha
+        return min(1.0, elapsed / self.duration)
+
+    def step(self, dt: float) -> float:
+        if self.done:
+            return dt
+        self.prev_elapsed = self.elapsed
+        self.elapsed += dt
+        leftover = max(0.0, self.elapsed - self.duration)
+        self.elapsed -= leftover
+        if self.on_step:
+            self.on_step(self.progress)
+        if self.elapsed >= self.duration:
+            self._finish()
+        return leftover
+
+    def skip(self) -> None:
+        if not self.done:
+            self.prev_elapsed = self.elapsed = self.duration
+            self._finish()
+
+    def _finish(self) -> None:
+        self.done = True
+        if self.on_done:
+            self.on_done()
+
+
+class Wait(Tween):
+    """Pause of `duration` ms inside a Script"""
+
+    def __init__(self, duration: float) -> None:
+        super().__init__(duration)
+
+
+class Script(Task):
+    """
+    Sequence written as a generator.
+
+    The generator yields Tasks (the script waits for each one), a number
+    (wait that many ms) or None (continue on the next step). Game logic
+    between the yields runs inside a timeline step. skip() only skips the
+    task the script is currently waiting on and moves on to the next one.
+    """
+
+    def __init__(self, generator: Generator[Any, None, None]) -> None:
+        self.generator = generator
+        self.current: Optional[Task] = None
+        self.done = False
+        self._advance()
+
+    def _advance(self) -> None:
+        while not self.done:
+            try:
+                item = next(self.generator)
+            except StopIteration:
+                self.done = True
+                self.current = None
+                return
+            if isinstance(item, (int, float)):
+                item = Wait(item)
+            self.current = item
+            if item is None or not item.done:
+                return
+
+    def step(self, dt: float) -> float:
+        while not self.done and dt > 0:
+            if self.current is None:
+                # `yield None`: one step
+                self._advance()
+                return 0.0
+            dt = self.current.step(dt)
+            if self.current.done:
+                self._advance()
+            else:
+                return 0.0
+        return dt
+
+    def skip(self) -> None:
+        if self.current is None:
+            self._advance()
+            return
+        self.current.skip()
+        if self.current.done:
+            self._advance()
+
+
+class Timeline:
+    """
+    Runs all active tasks from the main loop with a fixed simulation step.
+
+    update() turns the real time since the previous call into whole
+    ANIMATION_STEP_MS steps (the remainder carries over to the next frame)
+    and advances every task by each step, so animation length is simulated
+    time and not the number or speed of the rendered frames. Tasks run side
+    by side; `alpha` is how far the current frame lies between the last two
+    steps, for interpolated drawing.
+
+    `speed` scales simulated time (2.0 = animations take half as long);
+    None finishes every task on the next update. Task logic and the order
+    of its callbacks are the same at every speed.
+    """
+
+    def __init__(self, step_ms: float = ANIMATION_STEP_MS,
+                 clock: Callable[[], int] = pygame.time.get_ticks,
+                 speed: Optional[float] = 1.0) -> None:
+        self.step_ms = step_ms
+        self.clock = clock
+        self.speed = speed
+        self.tasks: List[Task] = []
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.last_time: Optional[int] = None
+
+    @property
+    def busy(self) -> bool:
+        return bool(self.tasks)
+
+    def add(self, task: Task) -> Task:
+        if not self.tasks:
+            self.resync()
+        self.tasks.append(task)
+        return task
+
+    def resync(self) -> None:
+        """Forget the time spent outside update() (modal popup, loading)"""
+        self.last_time = self.clock()
+        self.accumulator = 0.0
+
+    def update(self) -> int:
+        """Advance to the current time; returns the number of steps run"""
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+        if self.speed is None:
+            self.last_time = now
+            self.finish()
+            return 0
+        self.accumulator += min(MAX_FRAME_MS, now - self.last_time) * self.speed
+        self.last_time = now
+
+        steps = 0
+        while self.accumulator >= self.step_ms:
+            self.accumulator -= self.step_ms
+            steps += 1
+            for task in list(self.tasks):
+                if not task.done:
+                    task.step(self.step_ms)
+            self.tasks = [t for t in self.tasks if not t.done]
+        if not self.tasks:
+            self.accumulator = 0.0
+        self.alpha = self.accumulator / self.step_ms
+        return steps
+
+    def skip(self) -> None:
+        """Skip what every task is currently doing"""
+        for task in list(self.tasks):
+            task.skip()
+        self.tasks = [t for t in self.tasks if not t.done]
+
+    def finish(self) -> None:
+        """Run every task to its end now, including the rest of a Script"""
+        while self.tasks:
+            self.skip()
+        self.accumulator = 0.0
+        self.alpha = 0.0
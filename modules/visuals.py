@@ -1,35 +1,33 @@
 import pygame
 import math
-import random
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from game_constants import *
 
+from modules.particles import ParticleField, ParticleSprites, circle_sprite
+
 current_w = WIDTH 
 current_h = HEIGHT
-bg_particles = []
+bg_field = None
+bg_sprites = None
 
 def init_particles_dynamic(width, height):
     """
     Menginisialisasi ulang partikel dengan ukuran layar yang BENAR.
     Fungsi ini WAJIB dipanggil dari game.py setelah screen dibuat.
     """
-    global bg_particles, current_w, current_h
+    global bg_field, current_w, current_h
     
     current_w = width
     current_h = height
-    bg_particles = []
     
     count = int(width / 30) 
-    
-    for _ in range(count):
-        bg_particles.append({
-            'x': random.randint(0, width),
-            'y': random.randint(0, height),
-            'speed': random.uniform(0.2, 0.8), # Kecepatan variatif
-            'size': random.randint(2, 5)
-        })
+    bg_field = ParticleField(
+        count, width, height,
+        speed=(0.2, 0.8), # Kecepatan variatif
+        size=(2, 5),
+    )
 
 init_particles_dynamic(WIDTH, HEIGHT)
 
@@ -47,20 +45,32 @@ def get_tile_center(n):
     y = HEIGHT - (row * CELL + (CELL // 2)) # HEIGHT ini dari constants (tinggi board)
     return x, y
 
+def _background_sprites():
+    global bg_sprites
+    if bg_sprites is None:
+        bg_sprites = ParticleSprites(circle_sprite, [(255, 255, 255, 40)], 2, 5)
+    return bg_sprites
+
 def draw_background_effects(screen, shake_x=0, shake_y=0):
     """Menggambar efek partikel background"""
-    screen.fill(BG_COLOR) 
-    
-    for p in bg_particles:
-        p['y'] -= p['speed']
-        
-        if p['y'] < -10: 
-            p['y'] = current_h + 10
-            p['x'] = random.randint(0, current_w) # Reset x acak juga agar organik
-            
-        s = pygame.Surface((p['size']*2, p['size']*2), pygame.SRCALPHA)
-        pygame.draw.circle(s, (255, 255, 255, 40), (p['size'], p['size']), p['size'])
-        screen.blit(s, (p['x'], p['y']))
+    # Partikel yang keluar atas muncul lagi di bawah dengan x acak
+    bg_field.step()
+    draw_background_layer(screen)
+
+def draw_background_layer(screen):
+    """Background + partikel di posisi sekarang, tanpa menggerakkan partikel"""
+    screen.fill(BG_COLOR)
+    bg_field.draw(screen, _background_sprites())
+
+def step_background_particles():
+    """
+    Gerakkan partikel satu frame tanpa menggambar (mode dirty-rect).
+    Mengembalikan area partikel sebelum dan sesudah bergerak.
+    """
+    sprites = _background_sprites()
+    before = bg_field.rects(sprites)
+    bg_field.step()
+    return before + bg_field.rects(sprites)
 
 def draw_snake(screen, start_node, end_node, glow=False):
     """Menggambar ular dengan nomor kotak sebagai input"""
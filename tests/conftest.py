@@ -0,0 +1,27 @@
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.game_logger import logger
+
+
+@pytest.fixture(autouse=True, scope="session")
+def log_to_tmp(tmp_path_factory):
+    """Log file tes ke direktori sementara, bukan logs/game.log milik repo"""
+    log_file = tmp_path_factory.mktemp("logs") / "game.log"
+    originals = [h for h in logger.handlers if isinstance(h, logging.FileHandler)]
+    for handler in originals:
+        logger.removeHandler(handler)
+        temporary = logging.FileHandler(log_file, encoding="utf-8")
+        temporary.setFormatter(handler.formatter)
+        logger.addHandler(temporary)
+    yield log_file
+    for handler in [h for h in logger.handlers if isinstance(h, logging.FileHandler)]:
+        logger.removeHandler(handler)
+        handler.close()
+    for handler in originals:
+        logger.addHandler(handler)
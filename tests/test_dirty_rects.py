@@ -0,0 +1,69 @@
+import numpy as np
+import pygame
+
+from modules.dirty_rects import DirtyRectRenderer
+
+BACKGROUND = (30, 32, 40)
+SIZE = (60, 30)
+
+
+class Dot:
+    """Underlay yang bergerak: satu titik putih setengah transparan"""
+
+    def __init__(self):
+        self.x = 5
+        self.sprite = pygame.Surface((6, 6), pygame.SRCALPHA)
+        pygame.draw.circle(self.sprite, (255, 255, 255, 120), (3, 3), 3)
+
+    def rect(self):
+        return self.sprite.get_rect(topleft=(self.x, 12))
+
+    def draw(self, surface):
+        surface.fill(BACKGROUND)
+        surface.blit(self.sprite, (self.x, 12))
+
+
+def draw_layers(surface):
+    # Kiri: lapisan pejal; kanan: lapisan tembus pandang (background terlihat)
+    pygame.draw.rect(surface, (200, 60, 60), (0, 0, 30, 30))
+    veil = pygame.Surface((30, 30), pygame.SRCALPHA)
+    veil.fill((60, 200, 60, 100))
+    surface.blit(veil, (30, 0))
+
+
+def full_frame(dot):
+    surface = pygame.Surface(SIZE)
+    dot.draw(surface)
+    draw_layers(surface)
+    return pygame.surfarray.array3d(surface).astype(int)
+
+
+def test_underlay_keeps_moving_under_the_backdrop(monkeypatch):
+    # Tanpa jendela: present() cukup tidak mengirim apa-apa
+    monkeypatch.setattr(pygame.display, "flip", lambda: None)
+    monkeypatch.setattr(pygame.display, "update", lambda rects: None)
+    screen = pygame.Surface(SIZE)
+    renderer = DirtyRectRenderer(screen)
+    dot = Dot()
+    renderer.set_underlay(BACKGROUND, dot.draw)
+
+    screen.fill(renderer.probe_color)
+    draw_layers(screen)
+    renderer.capture_probe()
+    screen.fill(BACKGROUND)
+    draw_layers(screen)
+    renderer.capture_backdrop("board")
+    renderer.present()
+    assert renderer.exposed == pygame.Rect(30, 0, 30, 30)
+
+    for x in range(5, 50, 3):
+        before = dot.rect()
+        dot.x = x
+        shown = renderer.draw_underlay([before, dot.rect()])
+        # Di atas lapisan pejal tidak ada yang perlu digambar ulang
+        assert all(rect.left >= 30 for rect in shown)
+        renderer.begin(shown)
+        renderer.present()
+
+    diff = np.abs(pygame.surfarray.array3d(screen).astype(int) - full_frame(dot))
+    assert diff.max() <= 2
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+from modules.game_engine import GameEngine
+from modules.game_rng import SessionRandom
+
+PLAYERS = ["Ana", "Budi", "Citra"]
+CARDS = {i: f"Truth: pertanyaan {i}?" if i % 2 else f"Dare: tantangan {i}" for i in range(60)}
+
+
+def play(seed):
+    engine = GameEngine.new_game(list(PLAYERS), 1, CARDS, streams=SessionRandom(seed))
+    results = []
+    while engine.winner is None and engine.turns_played < 5000:
+        turn = engine.play_turn()
+        results.append((turn.player, turn.dice, turn.final))
+    return engine, results
+
+
+def test_same_seed_same_game():
+    engine_a, turns_a = play(1234)
+    engine_b, turns_b = play(1234)
+    assert turns_a == turns_b
+    assert engine_a.snapshot() == engine_b.snapshot()
+    assert engine_a.winner is not None
+    assert engine_a.state.positions[engine_a.winner] == engine_a.total
+
+
+def test_engine_does_not_import_pygame():
+    code = "import sys; import modules.game_engine; print('pygame' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,90 @@
+import time
+import asyncio
+
+import pytest
+
+from modules.game_server import GameServer, GameClient, ProtocolError, PHASE_OVER
+
+PLAYERS = ["Arthur", "Merlin"]
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    return predicate()
+
+
+def run_with_server(scenario, **options):
+    async def main():
+        server = GameServer(**options)
+        port = await server.start(port=0)
+        try:
+            await scenario(server, port)
+        finally:
+            await server.stop()
+    asyncio.run(main())
+
+
+def test_disconnect_without_close_drops_table():
+    async def scenario(server, port):
+        client = await GameClient.connect(port=port)
+        created = await client.request("create", players=PLAYERS, seed=7)
+        await client.play_turn(created["table"])
+        assert created["table"] in server.tables
+
+        await client.close()
+        assert await wait_for(lambda: not server.tables)
+
+    run_with_server(scenario)
+
+
+def test_table_stays_open_while_a_watcher_is_connected():
+    async def scenario(server, port):
+        player = await GameClient.connect(port=port)
+        watcher = await GameClient.connect(port=port)
+        table = (await player.request("create", players=PLAYERS, seed=7))["table"]
+        await watcher.request("join", table=table)
+
+        await player.close()
+        await asyncio.sleep(0.1)
+        assert table in server.tables
+        assert (await watcher.request("state", table=table))["ok"]
+
+        await watcher.close()
+        assert await wait_for(lambda: table not in server.tables)
+
+    run_with_server(scenario)
+
+
+def test_idle_and_finished_tables_expire():
+    server = GameServer(max_tables=2, idle_timeout=60)
+    finished = server.create_table(PLAYERS, seed=3)
+    while finished.phase != PHASE_OVER:
+        finished.roll()
+        if finished.card is not None:
+            finished.accept()
+    server.create_table(PLAYERS, seed=4)
+
+    with pytest.raises(ProtocolError, match="full"):
+        server.create_table(PLAYERS, seed=5)
+
+    assert server.expire_idle(time.monotonic() + 30) == 0
+    assert server.expire_idle(time.monotonic() + 61) == 2
+    assert not server.tables
+    server.create_table(PLAYERS, seed=5)
+
+
+def test_full_server_reclaims_idle_tables():
+    server = GameServer(max_tables=1, idle_timeout=0)
+    server.create_table(PLAYERS, seed=1)
+    table = server.create_table(PLAYERS, seed=2)
+    assert list(server.tables) == [table.id]
+
+
+@pytest.mark.parametrize("level", [0, 4, 256, 10**9])
+def test_unknown_level_is_rejected_before_loading_a_deck(level):
+    server = GameServer()
+    with pytest.raises(ProtocolError, match="level"):
+        server.create_table(PLAYERS, level)
+    assert not server.tables and level not in server.library.templates
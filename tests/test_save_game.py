@@ -0,0 +1,102 @@
+import struct
+import zlib
+import random
+
+from modules.challenge_index import ChallengeIndex, challenge_index
+from modules.game_deck import ChallengeDeck
+from modules.game_state import GameState
+from modules.save_game import (
+    GAME, HEADER, SAVE_MAGIC, decode_game, encode_game, load_game, restore_game, save_game,
+)
+
+
+def make_game(cards=40, total=100):
+    state = GameState(["Ana", "Budi", "Citra"], 2)
+    state.positions[:] = [5, 37, 88]
+    state.turn = 1
+    state.snakes = {98: 12, 54: 30}
+    state.ladders = {4: 25, 60: 91}
+    deck = ChallengeDeck({i: f"Truth: pertanyaan uji nomor {i}?" if i % 2 else f"Dare: tantangan uji nomor {i}"
+                          for i in range(cards)}, rng=random.Random(1), verbose=False)
+    for tile, card in zip((7, 13, 44, 71), deck.truth_master[-2:] + deck.dare_master[-2:]):
+        state.challenges[str(tile)] = card
+    return state, deck
+
+
+def texts(ids, index):
+    return [index.get(i).text for i in ids]
+
+
+def test_round_trip_into_fresh_index():
+    state, deck = make_game()
+    index = ChallengeIndex()
+    saved = decode_game(encode_game(state, deck, winner=None, turns_played=9), index)
+
+    assert saved.players == state.players
+    assert (saved.level, saved.turn, saved.winner, saved.turns_played) == (2, 1, None, 9)
+    assert saved.positions == state.positions
+    assert saved.snakes == state.snakes and saved.ladders == state.ladders
+    assert {tile: index.get(i).text for tile, i in saved.challenges.items()} == \
+        {tile: challenge_index.get(i).text for tile, i in state.challenges.items()}
+    assert texts(saved.truth_pool, index) == texts(deck.truth_pool, challenge_index)
+    assert texts(saved.dare_master, index) == texts(deck.dare_master, challenge_index)
+
+
+def test_large_deck_round_trip():
+    # Lebih dari 65535 kartu unik: slot & ID melewati batas uint16
+    state, deck = make_game(cards=80_000)
+    assert max(deck.truth_master) > 0xFFFF
+    saved = decode_game(encode_game(state, deck))
+
+    assert len(saved.truth_master) + len(saved.dare_master) == 80_000
+    assert texts(saved.truth_pool, challenge_index) == texts(deck.truth_pool, challenge_index)
+    assert texts(saved.dare_pool, challenge_index) == texts(deck.dare_pool, challenge_index)
+    assert saved.challenges == state.challenges
+
+
+def test_save_and_load_file(tmp_path):
+    state, deck = make_game()
+    path = str(tmp_path / "saves" / "autosave.sav")
+    assert save_game(path, state, deck, turns_played=3)
+
+    saved = load_game(path)
+    restored, restored_deck = make_game()
+    restored.positions[:] = [1, 1, 1]
+    restore_game(saved, restored, restored_deck)
+    assert restored.positions == state.positions
+    assert restored.challenges == state.challenges
+    assert restored_deck.truth_pool == deck.truth_pool
+
+
+def test_save_failure_returns_false(tmp_path):
+    state, deck = make_game()
+    state.turn = 300  # Tidak muat di header (uint8): struct.error
+    assert save_game(str(tmp_path / "bad.sav"), state, deck) is False
+    assert not (tmp_path / "bad.sav").exists()
+
+
+def test_reads_version_1():
+    # Format lama: semua uint16, 0xFFFF = kotak tanpa kartu
+    def u16(values):
+        return struct.pack(f"<H{len(values)}H", len(values), *values)
+
+    cards = [0xFFFF] * 101
+    cards[7] = 1
+    body = b"".join([
+        GAME.pack(2, 1, 0, -1, 4),
+        b"\x03Ana", b"\x04Budi",
+        struct.pack("<2H", 12, 3),
+        u16([0] * 4 + [25] + [0] * 96),
+        u16(cards),
+        u16([0]), u16([1]), u16([]), u16([1]),
+    ])
+    packed = zlib.compress("Truth: lama?\0Dare: lama".encode("utf-8"))
+    body += struct.pack("<I", len(packed)) + packed
+    data = HEADER.pack(SAVE_MAGIC, 1, len(body), zlib.crc32(body)) + body
+
+    index = ChallengeIndex()
+    saved = decode_game(data, index)
+    assert saved.positions == [12, 3]
+    assert saved.ladders == {4: 25}
+    assert {tile: index.get(i).text for tile, i in saved.challenges.items()} == {"7": "Dare: lama"}
+    assert texts(saved.dare_pool, index) == ["Dare: lama"]
@@ -0,0 +1,65 @@
+from modules.challenge_index import challenge_index
+from modules.game_state import GameState
+from modules.state_sync import StateEncoder, StateMirror
+
+
+def card_texts(state, index=challenge_index):
+    return {tile: index.get(card).text for tile, card in state.challenges.items()}
+
+
+def make_state():
+    state = GameState(["Ana", "Budi"], 1)
+    state.snakes = {98: 12}
+    state.ladders = {4: 25}
+    state.challenges = {str(tile): challenge_index.add(f"Truth: kotak {tile}?").id for tile in (7, 13, 44)}
+    return state
+
+
+def assert_mirrored(mirror, state):
+    assert mirror.state.positions == state.positions
+    assert mirror.state.turn == state.turn
+    assert mirror.state.snakes == state.snakes and mirror.state.ladders == state.ladders
+    assert card_texts(mirror.state) == card_texts(state)
+    assert mirror.state.log_manager.get_full_log() == state.log_manager.get_full_log()
+
+
+def test_snapshot_then_deltas_with_large_card_ids():
+    # ID kartu di atas batas uint16, termasuk tepat 65535 (dulu = "kartu hilang")
+    while len(challenge_index) <= 0x10000:
+        challenge_index.add(f"Dare: kartu pengisi {len(challenge_index)}")
+    state = make_state()
+    encoder = StateEncoder(state)
+    mirror = StateMirror()
+    assert mirror.apply(encoder.snapshot())
+
+    state.log_manager.start_turn("Ana")
+    state.log_manager.log_turn("Dice: 6")
+    state.positions[0] = 13
+    state.challenges["13"] = 0xFFFF
+    state.challenges["50"] = challenge_index.add("Truth: kartu dengan ID besar?").id
+    del state.challenges["44"]
+    assert state.challenges["50"] > 0xFFFF
+    assert mirror.apply(encoder.delta(dice=6))
+    assert mirror.dice == 6
+
+    state.log_manager.end_turn()
+    state.turn = 1
+    assert mirror.apply(encoder.delta())
+    assert_mirrored(mirror, state)
+    assert "44" not in mirror.state.challenges
+
+
+def test_missing_delta_asks_for_snapshot():
+    state = make_state()
+    encoder = StateEncoder(state)
+    mirror = StateMirror()
+    assert mirror.apply(encoder.snapshot())
+
+    state.positions[1] = 9
+    encoder.delta(dice=3)  # Hilang di jalan
+    state.turn = 1
+    assert not mirror.apply(encoder.delta())
+    assert not mirror.synced
+
+    assert mirror.apply(encoder.snapshot())
+    assert_mirrored(mirror, state)